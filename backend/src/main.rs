@@ -5,6 +5,7 @@ use serde::{Deserialize, Serialize};
 use std::sync::{Arc, Mutex};
 use std::time::{SystemTime, UNIX_EPOCH};
 use std::io::{BufRead, BufReader, Write};
+use std::net::TcpStream;
 use std::thread;
 use std::time::Duration;
 use std::net::TcpListener;
@@ -13,12 +14,33 @@ use serialport::SerialPort;
 use influxdb2::Client;
 
 // ===== KONFIGURASI =====
-const ARDUINO_WIFI_ADDR: &str = "0.0.0.0:8081"; // Input Data (WiFi)
-const GUI_CMD_ADDR: &str = "0.0.0.0:8082";      // Input Command (Python)
-const GUI_DATA_ADDR: &str = "0.0.0.0:8083";     // Output Data (Python)
-const HTTP_PORT: u16 = 8080;                    // Web Server Status
+const ARDUINO_WIFI_PORT: u16 = 8081; // Input Data (WiFi)
+const GUI_CMD_PORT: u16 = 8082;      // Input Command (Python)
+const GUI_DATA_PORT: u16 = 8083;     // Output Data (Python)
+const HTTP_PORT: u16 = 8080;         // Web Server Status
+
+// Multi-device: beberapa bridge di satu PC. ENOSE_PORT_OFFSET menggeser semua
+// port (mis. 10 -> 8090..8093), ENOSE_DEVICE_ID menjadi tag "device" di InfluxDB.
+const DEFAULT_DEVICE_ID: &str = "arduino_uno_r4";
+
+fn port_offset() -> u16 {
+    std::env::var("ENOSE_PORT_OFFSET").ok().and_then(|v| v.parse().ok()).unwrap_or(0)
+}
+
+fn bind_addr(port: u16) -> String {
+    format!("0.0.0.0:{}", port + port_offset())
+}
+
+fn device_id() -> String {
+    std::env::var("ENOSE_DEVICE_ID").unwrap_or_else(|_| DEFAULT_DEVICE_ID.to_string())
+}
 const BAUD_RATE: u32 = 9600;
 
+// Framing Data Stream 8083 (default JSON-lines, opsional biner)
+const BINARY_MODE_REQUEST: &str = "MODE BINARY";
+const BINARY_RECORD_SIZE: usize = 38; // u64 ts + 7 x f32 + i8 state + i8 level
+const MODE_NEGOTIATION_TIMEOUT_MS: u64 = 500;
+
 // InfluxDB Config
 const INFLUXDB_URL: &str = "http://localhost:8086";
 const INFLUXDB_ORG: &str = "its_instrumentasi";
@@ -36,7 +58,7 @@ struct SensorData {
 }
 
 struct AppState {
-    gui_broadcast: Arc<Mutex<Vec<Sender<String>>>>,
+    gui_broadcast: Arc<Mutex<Vec<Sender<SensorData>>>>,
     serial_port: Arc<Mutex<Option<Box<dyn SerialPort>>>>, // Serial Dinamis
     influxdb_client: Arc<Client>,
 }
@@ -68,33 +90,34 @@ fn parse_sensor_line(line: &str) -> Option<SensorData> {
 // 1. RECEIVER ARDUINO (WIFI 8081)
 fn start_arduino_receiver(state: web::Data<AppState>) {
     thread::spawn(move || {
-        let listener = TcpListener::bind(ARDUINO_WIFI_ADDR).expect("Failed to bind Arduino port");
-        println!("📡 Listening for Arduino Data on {}", ARDUINO_WIFI_ADDR);
+        let addr = bind_addr(ARDUINO_WIFI_PORT);
+        let device = device_id();
+        let listener = TcpListener::bind(&addr).expect("Failed to bind Arduino port");
+        println!("📡 Listening for Arduino Data on {} (device={})", addr, device);
         
         for stream in listener.incoming() {
             if let Ok(stream) = stream {
                 let state = state.clone();
+                let device = device.clone();
                 thread::spawn(move || {
                     let reader = BufReader::new(stream);
                     for line in reader.lines() {
                         if let Ok(l) = line {
                             if let Some(data) = parse_sensor_line(&l) {
-                                // A. Broadcast ke GUI (JSON)
-                                if let Ok(json_str) = serde_json::to_string(&data) {
-                                    if let Ok(mut clients) = state.gui_broadcast.lock() {
-                                        // FIX: Clone json_str inside the closure
-                                        clients.retain(|tx| tx.send(json_str.clone()).is_ok());
-                                    }
+                                // A. Broadcast ke GUI (encoding per klien: JSON / biner)
+                                if let Ok(mut clients) = state.gui_broadcast.lock() {
+                                    clients.retain(|tx| tx.send(data.clone()).is_ok());
                                 }
                                 
                                 // B. Simpan ke InfluxDB
                                 let client = state.influxdb_client.clone();
                                 let d = data.clone();
+                                let device = device.clone();
                                 thread::spawn(move || {
                                     let rt = tokio::runtime::Runtime::new().unwrap();
                                     rt.block_on(async {
                                         let point = influxdb2::models::DataPoint::builder("sensor_reading")
-                                            .tag("device", "arduino_uno_r4").tag("state", &d.state_name)
+                                            .tag("device", device).tag("state", &d.state_name)
                                             .field("no2", d.no2).field("eth", d.eth).field("voc", d.voc).field("co", d.co)
                                             .field("co_mics", d.co_mics).field("eth_mics", d.eth_mics).field("voc_mics", d.voc_mics)
                                             .field("level", d.level as i64)
@@ -114,21 +137,28 @@ fn start_arduino_receiver(state: web::Data<AppState>) {
 // 2. GUI COMMAND RECEIVER (TCP 8082 -> SERIAL USB)
 fn start_gui_cmd_receiver(state: web::Data<AppState>) {
     thread::spawn(move || {
-        let listener = TcpListener::bind(GUI_CMD_ADDR).expect("Failed to bind CMD port");
-        println!("🎛️  GUI Command Receiver ready on {}", GUI_CMD_ADDR);
+        let addr = bind_addr(GUI_CMD_PORT);
+        let listener = TcpListener::bind(&addr).expect("Failed to bind CMD port");
+        println!("🎛️  GUI Command Receiver ready on {}", addr);
         
         for stream in listener.incoming() {
             if let Ok(stream) = stream {
                 let state = state.clone();
                 thread::spawn(move || {
+                    // Koneksi persisten: banyak perintah per koneksi, satu baris ack per perintah
+                    let mut writer = match stream.try_clone() {
+                        Ok(w) => w,
+                        Err(_) => return,
+                    };
                     let reader = BufReader::new(stream);
                     for line in reader.lines() {
                         if let Ok(cmd_raw) = line {
                             let cmd = cmd_raw.trim().to_string();
+                            if cmd.is_empty() { continue; }
                             println!("📥 CMD: {}", cmd);
 
                             // --- LOGIKA KONEKSI DINAMIS ---
-                            if cmd.starts_with("CONNECT_SERIAL") {
+                            let result: Result<(), String> = if cmd.starts_with("CONNECT_SERIAL") {
                                 // Format: "CONNECT_SERIAL COM3"
                                 let parts: Vec<&str> = cmd.split_whitespace().collect();
                                 if parts.len() >= 2 {
@@ -140,15 +170,22 @@ fn start_gui_cmd_receiver(state: web::Data<AppState>) {
                                             let mut port_guard = state.serial_port.lock().unwrap();
                                             *port_guard = Some(p);
                                             println!("✅ Serial Connected to {}", port_name);
+                                            Ok(())
                                         },
-                                        Err(e) => println!("❌ Failed to open {}: {}", port_name, e),
+                                        Err(e) => {
+                                            println!("❌ Failed to open {}: {}", port_name, e);
+                                            Err(format!("Failed to open {}: {}", port_name, e))
+                                        }
                                     }
+                                } else {
+                                    Err("Missing port name".to_string())
                                 }
                             }
                             else if cmd == "DISCONNECT_SERIAL" {
                                 let mut port_guard = state.serial_port.lock().unwrap();
                                 *port_guard = None;
                                 println!("🔌 Serial Disconnected");
+                                Ok(())
                             }
                             else {
                                 // Perintah biasa (START_SAMPLING / STOP_SAMPLING) diteruskan ke Arduino
@@ -157,13 +194,23 @@ fn start_gui_cmd_receiver(state: web::Data<AppState>) {
                                     let cmd_str = format!("{}\n", cmd);
                                     if let Err(e) = port.write_all(cmd_str.as_bytes()) {
                                         println!("❌ Serial Write Error: {}", e);
+                                        Err(format!("Serial write error: {}", e))
                                     } else {
                                         println!("➡️ Forwarded to Arduino: {}", cmd);
+                                        Ok(())
                                     }
                                 } else {
                                     println!("⚠️ Serial not connected! Cannot send: {}", cmd);
+                                    Err("Serial not connected".to_string())
                                 }
-                            }
+                            };
+
+                            // Ack ke GUI: "OK <CMD>" atau "ERR <CMD> <alasan>"
+                            let ack = match result {
+                                Ok(()) => format!("OK {}\n", cmd),
+                                Err(e) => format!("ERR {} {}\n", cmd, e),
+                            };
+                            if writer.write_all(ack.as_bytes()).is_err() { break; }
                         }
                     }
                 });
@@ -172,20 +219,61 @@ fn start_gui_cmd_receiver(state: web::Data<AppState>) {
     });
 }
 
+// Record biner little-endian (harus sama dengan SAMPLE_DTYPE di frontend)
+fn encode_binary(d: &SensorData) -> [u8; BINARY_RECORD_SIZE] {
+    let mut buf = [0u8; BINARY_RECORD_SIZE];
+    buf[0..8].copy_from_slice(&d.timestamp.to_le_bytes());
+    let vals = [d.no2, d.eth, d.voc, d.co, d.co_mics, d.eth_mics, d.voc_mics];
+    for (i, v) in vals.iter().enumerate() {
+        let o = 8 + i * 4;
+        buf[o..o + 4].copy_from_slice(&(*v as f32).to_le_bytes());
+    }
+    buf[36] = d.state as i8 as u8;
+    buf[37] = d.level as i8 as u8;
+    buf
+}
+
+// Klien baru boleh mengirim "MODE BINARY" segera setelah connect.
+// Klien lama tidak mengirim apa-apa -> timeout -> tetap JSON.
+fn negotiate_binary_mode(stream: &mut TcpStream) -> bool {
+    let mut binary = false;
+    if stream.set_read_timeout(Some(Duration::from_millis(MODE_NEGOTIATION_TIMEOUT_MS))).is_ok() {
+        if let Ok(clone) = stream.try_clone() {
+            let mut line = String::new();
+            if BufReader::new(clone).read_line(&mut line).is_ok() && line.trim() == BINARY_MODE_REQUEST {
+                binary = stream.write_all(b"OK BINARY\n").is_ok();
+            }
+        }
+    }
+    let _ = stream.set_read_timeout(None);
+    binary
+}
+
 // 3. GUI DATA BROADCASTER (TCP 8083 OUT)
 fn start_gui_broadcaster(state: web::Data<AppState>) {
     thread::spawn(move || {
-        let listener = TcpListener::bind(GUI_DATA_ADDR).expect("Failed to bind Data port");
-        println!("💻 GUI Data Output ready on {}", GUI_DATA_ADDR);
+        let addr = bind_addr(GUI_DATA_PORT);
+        let listener = TcpListener::bind(&addr).expect("Failed to bind Data port");
+        println!("💻 GUI Data Output ready on {}", addr);
         for stream in listener.incoming() {
             if let Ok(mut stream) = stream {
-                let (tx, rx) = channel();
+                let (tx, rx) = channel::<SensorData>();
                 if let Ok(mut clients) = state.gui_broadcast.lock() {
                      clients.push(tx);
                 }
                 thread::spawn(move || {
-                    while let Ok(msg) = rx.recv() {
-                        if stream.write_all(format!("{}\n", msg).as_bytes()).is_err() { break; }
+                    let binary = negotiate_binary_mode(&mut stream);
+                    println!("💻 GUI client connected ({})", if binary { "binary" } else { "json" });
+                    while let Ok(data) = rx.recv() {
+                        let result = if binary {
+                            stream.write_all(&encode_binary(&data))
+                        } else {
+                            match serde_json::to_string(&data) {
+                                Ok(json_str) => stream.write_all(format!("{}\n", json_str).as_bytes()),
+                                Err(_) => Ok(()),
+                            }
+                        };
+                        if result.is_err() { break; }
                     }
                 });
             }
@@ -211,7 +299,7 @@ async fn main() -> std::io::Result<()> {
     HttpServer::new(move || {
         App::new().app_data(state.clone()).route("/", web::get().to(|| async { "E-Nose Ready" }))
     })
-    .bind(("0.0.0.0", HTTP_PORT))?
+    .bind(("0.0.0.0", HTTP_PORT + port_offset()))?
     .run()
     .await
 }
\ No newline at end of file
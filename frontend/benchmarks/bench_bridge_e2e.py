@@ -0,0 +1,228 @@
+"""
+Benchmark end-to-end: bridge pengganti (utils.mock_bridge) -> NetworkWorker
+-> MainWindow (offscreen) -> frame plot.
+
+Per rate diukur:
+  - latensi sampel-ke-pixel: timestamp sampel (dibuat saat bridge mengirim)
+    sampai frame plot yang pertama kali memuat sampel itu selesai digambar
+  - sampel hilang: dikirim bridge selama sampling vs tersimpan di SessionBuffer
+  - utilisasi GUI thread: waktu on_batch_received + render per detik wall,
+    dan lag event loop (keterlambatan QTimer 10 ms)
+  - antrian GUI (utils.gui_queue): peak kedalaman & batch yang dibuang;
+    --stall-ms memblok GUI thread sekali per rate (meniru dialog modal)
+    untuk membandingkan --policy block / drop_oldest / coalesce
+
+Jalankan dari folder frontend (port 8082/8083 harus bebas):
+    python -m benchmarks.bench_bridge_e2e [--rates 4,100,1000,5000] [--seconds 5]
+                                          [--clients 0] [--jitter-ms 0] [--binary]
+                                          [--policy coalesce] [--stall-ms 0]
+"""
+
+import argparse
+import os
+import socket
+import sys
+import threading
+import time
+from functools import partial
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+import numpy as np
+from PySide6.QtCore import QTimer
+from PySide6.QtWidgets import QApplication
+
+from config.constants import STATE_DONE, STATE_IDLE
+from utils.gui_queue import POLICIES
+from utils.mock_bridge import MockBridge
+from utils.recordings import synthetic_recording
+from utils.stream_protocol import BINARY_MODE_REQUEST
+
+LAG_TIMER_MS = 10
+SETTLE_S = 1.0   # jeda setelah connect / STOP agar stream stabil / tuntas
+
+
+def dummy_client(host: str, port: int, binary: bool, stop: threading.Event):
+    """Klien data tambahan yang membaca lalu membuang stream (beban fan-out)"""
+    sock = socket.create_connection((host, port))
+    if binary:
+        sock.sendall(BINARY_MODE_REQUEST)
+    sock.settimeout(0.2)
+    while not stop.is_set():
+        try:
+            if not sock.recv(65536):
+                break
+        except socket.timeout:
+            continue
+        except OSError:
+            break
+    sock.close()
+
+
+class Probe:
+    """Instrumentasi MainWindow: hook handler batch, render dan timer lag"""
+
+    def __init__(self, window):
+        self.window = window
+        self.reset()
+
+        handler = window.on_batch_received
+        def on_batch(batch, first_arrival):
+            t0 = time.perf_counter()
+            before = len(window.session)
+            handler(batch, first_arrival)
+            stored = len(window.session) - before
+            if stored > 0:
+                self._ts.append(batch['timestamp'][:stored].astype(np.float64))
+            self.received += len(batch)
+            self.busy_s += time.perf_counter() - t0
+        # Atribut instance dipakai saat start_data_worker meng-connect signal
+        window.on_batch_received = on_batch
+
+        scheduler = window.page_dashboard.scheduler
+        render = scheduler.render_fn
+        def render_probe():
+            t0 = time.perf_counter()
+            render()
+            self.busy_s += time.perf_counter() - t0
+            self._on_frame()
+        scheduler.render_fn = render_probe
+
+        self._lag_timer = QTimer()
+        self._lag_timer.setInterval(LAG_TIMER_MS)
+        self._lag_timer.timeout.connect(self._on_lag_tick)
+        self._lag_timer.start()
+
+    def reset(self):
+        self.received = 0
+        self.busy_s = 0.0
+        self.latencies = []
+        self.lags = []
+        self.t_start = time.perf_counter()
+        self._ts = []
+        self._last_tick = time.perf_counter()
+
+    def _on_frame(self):
+        # Semua sampel yang sudah tersimpan kini tergambar
+        if self._ts:
+            now_ms = time.time() * 1000.0
+            self.latencies.append(now_ms - np.concatenate(self._ts))
+            self._ts = []
+
+    def _on_lag_tick(self):
+        now = time.perf_counter()
+        self.lags.append((now - self._last_tick) * 1000.0 - LAG_TIMER_MS)
+        self._last_tick = now
+
+    def report(self) -> dict:
+        wall = time.perf_counter() - self.t_start
+        lat = np.concatenate(self.latencies) if self.latencies else np.array([np.nan])
+        lags = np.asarray(self.lags) if self.lags else np.array([np.nan])
+        return {
+            "lat_p50": float(np.percentile(lat, 50)),
+            "lat_p99": float(np.percentile(lat, 99)),
+            "busy": self.busy_s / wall,
+            "lag_p99": float(np.percentile(lags, 99)),
+        }
+
+
+def run(args) -> list:
+    app = QApplication.instance() or QApplication(sys.argv)
+    from gui import main_window
+    from gui.main_window import MainWindow
+    main_window.NetworkWorker = partial(main_window.NetworkWorker, binary=args.binary,
+                                        queue_policy=args.policy)
+
+    # Tanpa DONE: auto-stop + QMessageBox akan memotong pengukuran
+    records = synthetic_recording()
+    records = records[records['state'] != STATE_DONE]
+    bridge = MockBridge(rate_hz=args.rates[0], jitter_ms=args.jitter_ms, records=records)
+    bridge.start()
+
+    window = MainWindow()
+    probe = Probe(window)
+    stop_clients = threading.Event()
+    results = []
+    steps = list(args.rates)
+
+    def connect():
+        window.commander.host = "127.0.0.1"
+        window._pending_host = "127.0.0.1"
+        window.commander.connect_serial("MOCK")
+        for _ in range(args.clients):
+            threading.Thread(target=dummy_client, daemon=True,
+                             args=("127.0.0.1", bridge.data_port, args.binary, stop_clients)).start()
+        QTimer.singleShot(int(SETTLE_S * 1000), next_rate)
+
+    def next_rate():
+        if not steps:
+            finish()
+            return
+        bridge.rate_hz = steps[0]
+        probe.reset()
+        window.on_start_request()   # START -> ack -> begin_sampling
+        if args.stall_ms > 0:
+            QTimer.singleShot(int(args.seconds * 500), lambda: time.sleep(args.stall_ms / 1000.0))
+        QTimer.singleShot(int(args.seconds * 1000), stop_rate)
+
+    def stop_rate():
+        # STOP langsung ke bridge (GUI tetap menyimpan sampel yang masih di jalan)
+        window.commander.stop_sampling()
+        QTimer.singleShot(int(SETTLE_S * 1000), collect)
+
+    def collect():
+        rate = steps.pop(0)
+        stored = int(np.count_nonzero(window.session.state != STATE_IDLE))
+        sent = bridge.stats["sampled"]
+        r = probe.report()
+        q = window.network_worker.channel.stats()
+        r.update(rate=rate, sent=sent, stored=stored, lost=sent - stored,
+                 bridge_dropped=bridge.stats["dropped"], q_peak=q["high_water"],
+                 q_dropped=q["dropped_samples"], q_merged=q["coalesced"])
+        results.append(r)
+        next_rate()
+
+    def finish():
+        stop_clients.set()
+        window.commander.disconnect_serial()
+        QTimer.singleShot(500, app.quit)
+
+    QTimer.singleShot(0, connect)
+    app.exec()
+    if window.network_worker:
+        window.network_worker.stop()
+        window.network_worker.wait(3000)
+    window.commander.close()
+    bridge.stop()
+    return results
+
+
+def main(argv):
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.bench_bridge_e2e")
+    parser.add_argument("--rates", default="4,100,1000,5000",
+                        type=lambda s: [float(x) for x in s.split(",")])
+    parser.add_argument("--seconds", type=float, default=5.0, help="durasi sampling per rate")
+    parser.add_argument("--clients", type=int, default=0, help="klien data tambahan di bridge")
+    parser.add_argument("--jitter-ms", type=float, default=0.0)
+    parser.add_argument("--binary", action="store_true", help="framing biner di port 8083")
+    parser.add_argument("--policy", default="coalesce", choices=POLICIES, help="policy antrian GUI")
+    parser.add_argument("--stall-ms", type=float, default=0.0,
+                        help="blok GUI thread sekali per rate (ms) di tengah sampling")
+    args = parser.parse_args(argv)
+
+    results = run(args)
+    print(f"\n{'rate/s':>8}{'sent':>9}{'stored':>9}{'lost':>7}{'p50 ms':>9}{'p99 ms':>9}"
+          f"{'GUI busy':>10}{'lag p99':>9}{'q peak':>8}{'q drop':>8}{'merged':>8}")
+    for r in results:
+        print(f"{r['rate']:>8g}{r['sent']:>9}{r['stored']:>9}{r['lost']:>7}{r['lat_p50']:>9.1f}"
+              f"{r['lat_p99']:>9.1f}{r['busy']:>10.1%}{r['lag_p99']:>9.1f}"
+              f"{r['q_peak']:>8}{r['q_dropped']:>8}{r['q_merged']:>8}")
+    if results:
+        print(f"\nbridge: {results[-1]['bridge_dropped']} sampel dibuang (antrian klien penuh)")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
+    # Lewati teardown PySide6/pyqtgraph saat finalisasi interpreter (kadang crash)
+    sys.stdout.flush()
+    os._exit(0)
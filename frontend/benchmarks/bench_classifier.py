@@ -0,0 +1,96 @@
+"""
+Benchmark: classifier aroma lokal (utils.classifier) pada rekaman data/.
+
+Fitur per siklus diekstrak dari semua CSV (utils.batch.process_file,
+paralel), lalu untuk setiap model diukur: waktu training, latensi
+inferensi satu siklus (seperti di pipeline live) dan throughput batch,
+serta akurasi resubstitusi & leave-one-file-out.
+
+Jalankan dari folder frontend:
+    python -m benchmarks.bench_classifier [folder] [--repeat N]
+"""
+
+import glob
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from utils.batch import process_file
+from utils.classifier import CLASSIFIER_FEATURES, MODELS, leave_one_group_out
+from utils.features import FEATURE_NAMES
+
+
+def load_cycles(folder):
+    """(X, label, file, cycles) dari semua CSV sesi di folder"""
+    paths = sorted(glob.glob(os.path.join(folder, "*.csv")))
+    rows = [FEATURE_NAMES.index(f) for f in CLASSIFIER_FEATURES]
+    X, y, groups, cycles = [], [], [], []
+    with ProcessPoolExecutor() as pool:
+        for path, result in zip(paths, pool.map(process_file, paths)):
+            if result["error"]:
+                continue
+            n_sensors = len(result["sensor_names"])
+            for c in result["cycles"]:
+                feats = np.asarray(c["values"]).reshape(len(FEATURE_NAMES), n_sensors)
+                X.append(feats[rows].ravel())
+                y.append(result["sample_type"])
+                groups.append(os.path.basename(path))
+                cycles.append({"level": c["level"], "features": feats})
+    return np.array(X), np.array(y), np.array(groups), cycles
+
+
+def bench(kind, X, y, groups, cycles, repeat):
+    fit_times = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        model = MODELS[kind]().fit(X, y)
+        fit_times.append(time.perf_counter() - t0)
+
+    # Latensi live: satu siklus per panggilan (predict_cycle)
+    latencies = []
+    for _ in range(repeat):
+        for cycle in cycles:
+            t0 = time.perf_counter()
+            model.predict_cycle(cycle)
+            latencies.append(time.perf_counter() - t0)
+
+    t0 = time.perf_counter()
+    for _ in range(repeat):
+        model.predict_proba(X)
+    batch_s = (time.perf_counter() - t0) / repeat
+
+    return {
+        "fit_ms": min(fit_times) * 1e3,
+        "lat_us": np.median(latencies) * 1e6,
+        "lat_max_us": np.max(latencies) * 1e6,
+        "batch_per_s": len(X) / batch_s,
+        "train_acc": float((model.predict(X) == y).mean()),
+        "lofo_acc": leave_one_group_out(MODELS[kind], X, y, groups),
+    }
+
+
+def main(argv):
+    repeat = 20
+    if "--repeat" in argv:
+        i = argv.index("--repeat")
+        repeat = int(argv[i + 1])
+        argv = argv[:i] + argv[i + 2:]
+    folder = argv[0] if argv else "data"
+
+    t0 = time.perf_counter()
+    X, y, groups, cycles = load_cycles(folder)
+    print(f"{len(X)} siklus dari {len(np.unique(groups))} file, {len(np.unique(y))} kelas, "
+          f"{X.shape[1]} fitur; ekstraksi {time.perf_counter() - t0:.2f} s\n")
+
+    print(f"{'model':<10}{'fit ms':>9}{'p50 us':>9}{'max us':>9}{'batch/s':>11}{'train':>8}{'LOFO':>8}")
+    for kind in sorted(MODELS):
+        r = bench(kind, X, y, groups, cycles, repeat)
+        print(f"{kind:<10}{r['fit_ms']:>9.2f}{r['lat_us']:>9.0f}{r['lat_max_us']:>9.0f}"
+              f"{r['batch_per_s']:>11.0f}{r['train_acc']:>8.0%}{r['lofo_acc']:>8.0%}")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,95 @@
+"""
+Benchmark: FileHandler.save_as_csv (vektor, per blok) vs implementasi lama
+(f-string per sel dalam loop Python).
+
+Jalankan dari folder frontend:
+    python -m benchmarks.bench_csv_export [file.csv ...] [--repeat N]
+"""
+
+import csv
+import glob
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+from utils.file_handler import FileHandler
+
+
+def legacy_save_as_csv(filename, data, sensor_data, times, sensor_names):
+    """Salinan implementasi sebelumnya (referensi)"""
+    with open(filename, 'w', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(["Electronic Nose Data Export"])
+        writer.writerow(["Sample Name", data.get('name', 'Unknown')])
+        writer.writerow(["Sample Type", data.get('type', 'Unknown')])
+        writer.writerow(["Export Date", datetime.now().isoformat()])
+        writer.writerow(["Mode", "Auto FSM"])
+        writer.writerow(["Number of Points", len(times)])
+        writer.writerow([])
+        writer.writerow(["Time (s)"] + [name for name in sensor_names])
+        for t_idx, t in enumerate(times):
+            row = [f"{t:.3f}"]
+            for s_idx in range(len(sensor_data)):
+                if t_idx < len(sensor_data[s_idx]):
+                    row.append(f"{sensor_data[s_idx][t_idx]:.2f}")
+                else:
+                    row.append("0")
+            writer.writerow(row)
+    return True
+
+
+def load_session(path):
+    """Baca CSV export jadi dict-of-lists (format MainWindow lama)"""
+    with open(path, newline='') as f:
+        rows = list(csv.reader(f))
+    start = next(i for i, r in enumerate(rows) if r and r[0].startswith("Time"))
+    names = rows[start][1:]
+    body = [r for r in rows[start + 1:] if len(r) > 1]
+    times = [float(r[0]) for r in body]
+    data = {s: [float(r[s + 1]) for r in body] for s in range(len(names))}
+    return names, times, data
+
+
+def _data_lines(path):
+    with open(path, newline='') as f:
+        return [l for l in f.read().splitlines() if not l.startswith("Export Date")]
+
+
+def bench(path, repeat):
+    names, times, data = load_session(path)
+    info = {'name': 'bench', 'type': 'bench'}
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        outputs = {}
+        for label, fn in (("legacy", legacy_save_as_csv), ("vector", FileHandler.save_as_csv)):
+            out = os.path.join(tmp, f"{label}.csv")
+            best = float("inf")
+            for _ in range(repeat):
+                t0 = time.perf_counter()
+                fn(out, info, data, times, names)
+                best = min(best, time.perf_counter() - t0)
+            results[label] = best
+            outputs[label] = _data_lines(out)
+        assert outputs["legacy"] == outputs["vector"], "Output CSV berbeda!"
+    return len(times), results
+
+
+def main(argv):
+    repeat = 5
+    if "--repeat" in argv:
+        i = argv.index("--repeat")
+        repeat = int(argv[i + 1])
+        argv = argv[:i] + argv[i + 2:]
+    files = argv or sorted(glob.glob("data/final30-*.csv"))
+
+    print(f"{'file':<48}{'rows':>7}{'legacy ms':>11}{'vector ms':>11}{'speedup':>9}")
+    for path in files:
+        n, r = bench(path, repeat)
+        print(f"{os.path.basename(path)[:47]:<48}{n:>7}{r['legacy'] * 1e3:>11.1f}"
+              f"{r['vector'] * 1e3:>11.1f}{r['legacy'] / r['vector']:>8.1f}x")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
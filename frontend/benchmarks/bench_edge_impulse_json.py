@@ -0,0 +1,97 @@
+"""
+Benchmark: save_edge_impulse_json (transpose vektor + writer compact/stream)
+vs implementasi lama (double loop + json.dump indent=2).
+
+Jalankan dari folder frontend:
+    python -m benchmarks.bench_edge_impulse_json [file.csv ...] [--repeat N]
+"""
+
+import glob
+import json
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+from utils.file_handler import FileHandler
+from utils.session_reader import SessionReader
+
+
+def legacy_save_edge_impulse_json(filename, sample_name, sensor_names, sensor_data, interval_ms):
+    """Salinan implementasi sebelumnya (referensi)"""
+    values = []
+    num_points = 0
+    if sensor_data and 0 in sensor_data:
+        num_points = len(sensor_data[0])
+    for i in range(num_points):
+        row = []
+        for j in range(len(sensor_names)):
+            val = sensor_data[j][i] if (j in sensor_data and i < len(sensor_data[j])) else 0.0
+            row.append(val)
+        values.append(row)
+    payload = {
+        "protected": {"ver": "v1", "alg": "none", "iat": int(datetime.now().timestamp())},
+        "signature": "0",
+        "payload": {
+            "device_name": "ENose-UnoR4",
+            "device_type": "ELECTRONIC_NOSE",
+            "interval_ms": interval_ms,
+            "sensors": [{"name": name, "units": "V"} for name in sensor_names],
+            "values": values
+        }
+    }
+    with open(filename, 'w') as f:
+        json.dump(payload, f, indent=2)
+    return True
+
+
+def _values(path):
+    with open(path) as f:
+        return json.load(f)["payload"]["values"]
+
+
+def bench(path, repeat):
+    reader = SessionReader(path)
+    data = reader.read()
+    names = reader.sensor_names
+    as_lists = {i: data[i + 1].tolist() for i in range(len(names))}
+
+    cases = {
+        "legacy": lambda out: legacy_save_edge_impulse_json(out, "b", names, as_lists, 250.0),
+        "pretty": lambda out: FileHandler.save_edge_impulse_json(out, "b", names, data[1:], 250.0, pretty=True),
+        "compact": lambda out: FileHandler.save_edge_impulse_json(out, "b", names, data[1:], 250.0),
+    }
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        for label, fn in cases.items():
+            out = os.path.join(tmp, f"{label}.json")
+            best = float("inf")
+            for _ in range(repeat):
+                t0 = time.perf_counter()
+                fn(out)
+                best = min(best, time.perf_counter() - t0)
+            results[label] = (best, os.path.getsize(out), _values(out))
+    reference = results["legacy"][2]
+    for label, (_, _, values) in results.items():
+        assert values == reference, f"{label}: values berbeda dari legacy"
+    return data.shape[1], results
+
+
+def main(argv):
+    repeat = 5
+    if "--repeat" in argv:
+        i = argv.index("--repeat")
+        repeat = int(argv[i + 1])
+        argv = argv[:i] + argv[i + 2:]
+    files = argv or sorted(glob.glob("data/EdgeImpulse/*.csv") + glob.glob("data/final30-*.csv"))
+
+    print(f"{'file':<44}{'rows':>7}  {'legacy':>16}  {'pretty':>16}  {'compact':>16}")
+    for path in files:
+        n, r = bench(path, repeat)
+        cells = "  ".join(f"{r[k][0] * 1e3:>7.1f}ms {r[k][1] / 1024:>5.0f}KB" for k in ("legacy", "pretty", "compact"))
+        print(f"{os.path.basename(path)[:43]:<44}{n:>7}  {cells}")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
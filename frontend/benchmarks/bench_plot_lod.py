@@ -0,0 +1,95 @@
+"""
+Benchmark: waktu frame SensorPlot (setData + paint) vs panjang buffer,
+dengan dan tanpa decimation min/max (level of detail).
+
+Jalankan dari folder frontend (tanpa layar: QT_QPA_PLATFORM=offscreen):
+    python -m benchmarks.bench_plot_lod [--sizes 1000,5000,20000,100000] [--repeat N]
+"""
+
+import os
+import sys
+import time
+
+import numpy as np
+from PySide6.QtWidgets import QApplication
+
+from config.constants import NUM_SENSORS
+from utils.decimation import minmax_envelope
+from utils.session_buffer import SessionBuffer
+
+
+def synthetic_session(n):
+    """Sinyal mirip siklus FSM (naik-tahan-purge) + noise + spike"""
+    rng = np.random.default_rng(0)
+    t = np.arange(n) * 0.25
+    phase = (t % 120.0) / 120.0
+    shape = np.where(phase < 0.5, 1 - np.exp(-phase * 10), np.exp(-(phase - 0.5) * 10))
+    sensors = (shape[None, :] * rng.uniform(50, 400, (NUM_SENSORS, 1))
+               + rng.normal(0, 3, (NUM_SENSORS, n)))
+    sensors[:, rng.integers(0, n, 20)] += 150  # spike sempit (harus tetap terlihat)
+    session = SessionBuffer(initial_capacity=n)
+    session.extend(t, sensors)
+    return session
+
+
+def frame_ms(plot, app, repeat):
+    times = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        plot.refresh_curves()
+        plot.grab()          # paint penuh ke pixmap (sinkron)
+        app.processEvents()
+        times.append((time.perf_counter() - t0) * 1000.0)
+    return float(np.median(times))
+
+
+def check_envelope(session, n_bins):
+    """Envelope harus mempertahankan min/max global setiap sensor"""
+    xs, ys = minmax_envelope(session.times, session.sensors, n_bins)
+    assert np.array_equal(ys.min(axis=1), session.sensors.min(axis=1))
+    assert np.array_equal(ys.max(axis=1), session.sensors.max(axis=1))
+    assert np.all(np.diff(xs, axis=1) >= 0), "urutan waktu envelope rusak"
+    return ys.shape[1]
+
+
+def main(argv):
+    sizes = [1000, 5000, 20000, 100000]
+    repeat = 10
+    if "--sizes" in argv:
+        sizes = [int(v) for v in argv[argv.index("--sizes") + 1].split(",")]
+    if "--repeat" in argv:
+        repeat = int(argv[argv.index("--repeat") + 1])
+
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    app = QApplication.instance() or QApplication([])
+    from gui.widgets import SensorPlot
+
+    plot = SensorPlot("bench")
+    plot.resize(1200, 600)
+    plot.show()
+    app.processEvents()
+    width_px = int(plot.getViewBox().width())
+
+    print(f"plot width {width_px}px, {NUM_SENSORS} kurva, pen width 3")
+    print(f"{'samples':>8}  {'points/curve':>12}  {'full (ms)':>10}  {'lod (ms)':>9}  {'speedup':>7}")
+    for n in sizes:
+        session = synthetic_session(n)
+        plot.max_points = n
+        plot.set_source(session)
+        drawn = check_envelope(session, width_px * plot.lod_factor // 2) \
+            if n > width_px * plot.lod_factor else n
+
+        plot.lod_enabled = False
+        full = frame_ms(plot, app, repeat)
+        plot.lod_enabled = True
+        lod = frame_ms(plot, app, repeat)
+        print(f"{n:>8}  {drawn:>12}  {full:>10.1f}  {lod:>9.1f}  {full / lod:>6.1f}x")
+
+    # Hapus widget sebelum interpreter shutdown (hindari crash teardown PySide)
+    plot.close()
+    plot.deleteLater()
+    app.processEvents()
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,96 @@
+"""
+Benchmark: throughput decode data stream 8083, JSON-lines vs record biner.
+
+Jalankan dari folder frontend:
+    python -m benchmarks.bench_stream_decode [jumlah_sampel]
+"""
+
+import json
+import socket
+import sys
+import threading
+import time
+import numpy as np
+
+from utils.sample_batch import SAMPLE_DTYPE, SENSOR_KEYS, SampleBatcher
+from utils.stream_protocol import BinaryRecordReader, encode_records
+
+
+def make_records(n: int) -> np.ndarray:
+    rng = np.random.default_rng(0)
+    rec = np.zeros(n, dtype=SAMPLE_DTYPE)
+    rec['timestamp'] = 1_700_000_000_000 + np.arange(n) * 250
+    rec['sensors'] = rng.uniform(0, 3.3, size=(n, len(SENSOR_KEYS)))
+    rec['state'] = 3
+    rec['level'] = 1
+    return rec
+
+
+def encode_json(records: np.ndarray) -> bytes:
+    lines = []
+    for r in records:
+        d = {'timestamp': int(r['timestamp'])}
+        d.update({k: round(float(v), 2) for k, v in zip(SENSOR_KEYS, r['sensors'])})
+        d.update({'state': int(r['state']), 'level': int(r['level']), 'state_name': 'HOLD'})
+        lines.append(json.dumps(d))
+    return ("\n".join(lines) + "\n").encode()
+
+
+def _send_all(sock: socket.socket, payload: bytes):
+    sock.sendall(payload)
+    sock.shutdown(socket.SHUT_WR)
+
+
+def decode_json(payload: bytes) -> int:
+    rx, tx = socket.socketpair()
+    threading.Thread(target=_send_all, args=(tx, payload), daemon=True).start()
+    batcher, total, pending = SampleBatcher(), 0, b""
+    while True:
+        chunk = rx.recv(65536)
+        if not chunk:
+            break
+        lines = (pending + chunk).split(b"\n")
+        pending = lines.pop()
+        for line in lines:
+            batcher.add_json(json.loads(line))
+            if batcher.is_full():
+                total += len(batcher.take())
+    total += len(batcher.take())
+    rx.close(); tx.close()
+    return total
+
+
+def decode_binary(payload: bytes) -> int:
+    rx, tx = socket.socketpair()
+    threading.Thread(target=_send_all, args=(tx, payload), daemon=True).start()
+    reader, batcher, total = BinaryRecordReader(rx), SampleBatcher(), 0
+    while True:
+        records = reader.read()
+        if records is None:
+            break
+        while len(records):
+            records = records[batcher.add_records(records):]
+            if batcher.is_full():
+                total += len(batcher.take())
+    total += len(batcher.take())
+    rx.close(); tx.close()
+    return total
+
+
+def run(n: int):
+    records = make_records(n)
+    payloads = {'json': encode_json(records), 'binary': encode_records(records)}
+    decoders = {'json': decode_json, 'binary': decode_binary}
+
+    print(f"{n} sampel")
+    print(f"{'format':<8}{'bytes':>12}{'waktu (s)':>12}{'sampel/s':>14}")
+    for name, payload in payloads.items():
+        t0 = time.perf_counter()
+        count = decoders[name](payload)
+        dt = time.perf_counter() - t0
+        assert count == n, f"{name}: {count} != {n}"
+        print(f"{name:<8}{len(payload):>12}{dt:>12.3f}{n / dt:>14,.0f}")
+
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 200_000)
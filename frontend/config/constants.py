@@ -1,5 +1,7 @@
 """Application constants and configuration - BRIDGE MODE"""
 
+import os
+
 # Application Info
 APP_NAME = "E-Nose Bridge Control | Kelompok 6 SPS"
 APP_VERSION = "2.0.0 (Bridge)"
@@ -10,11 +12,72 @@ WINDOW_HEIGHT = 900
 DEFAULT_HOST = "127.0.0.1" # Ganti ke IP PC jika akses remote
 CMD_PORT = 8082            # Port Perintah (Start/Stop/Connect)
 DATA_PORT = 8083           # Port Data Stream
+CMD_TIMEOUT_S = 2.0        # Timeout connect/ack perintah (di thread worker, bukan GUI)
+CMD_RECONNECT_MIN_S = 0.5  # Backoff reconnect port perintah: mulai dari...
+CMD_RECONNECT_MAX_S = 8.0  # ...dan maksimal (digandakan tiap gagal)
+DATA_RECONNECT_MIN_S = 0.5 # Backoff reconnect stream data (8083, juga per device)
+DATA_RECONNECT_MAX_S = 8.0
+RECONNECT_JITTER = 0.5     # Jeda backoff dikali acak [1 - jitter, 1] (utils/net_loop.py)
+GUI_QUEUE_MAX_BATCHES = 8  # Batch maksimal yang belum diproses GUI (utils/gui_queue.py)
+# Jika GUI tertinggal: "block" (socket berhenti dibaca), "drop_oldest", atau
+# "coalesce" (batch digabung; plot hanya frame terakhir, semua sampel tetap disimpan)
+GUI_QUEUE_POLICY = os.environ.get("ENOSE_GUI_QUEUE_POLICY", "coalesce")
 
 # Data Collection
 UPDATE_INTERVAL = 250      # ms (Sesuai refresh rate Arduino)
 NUM_SENSORS = 7
 MAX_PLOT_POINTS = 20000    # <--- INI YANG HILANG SEBELUMNYA
+CSV_CHUNK_ROWS = 4096      # Baris per blok saat export CSV (streaming ke disk)
+MAX_RENDER_FPS = 30        # Batas redraw grafik per detik (render scheduler)
+PLOT_LOD = True            # Decimation min/max untuk kurva panjang (level of detail)
+PLOT_LOD_FACTOR = 2        # Titik per piksel lebar plot sebelum decimation aktif
+TABLE_REFRESH_FPS = 4      # Batas refresh tabel statistik/info per detik
+BATCH_MAX_SAMPLES = 64     # Worker kirim batch ke GUI jika sudah 64 sampel...
+BATCH_WINDOW_MS = 50       # ...atau 50 ms sejak sampel pertama di batch
+STREAM_BINARY = False      # True = minta framing biner di port 8083 (fallback JSON)
+DEVICE_PLOT_POINTS = 2000  # Titik terakhir di plot ringkas per device (halaman Devices)
+# Kecepatan sumber Simulation / File (utils/replay.py); 0 = secepatnya
+REPLAY_SPEEDS = {"1x": 1.0, "10x": 10.0, "100x": 100.0, "Max": 0.0}
+
+# Edge Impulse Upload
+# URL ingestion bisa dioverride lewat environment (mis. server HTTP lokal untuk uji coba)
+EI_INGESTION_URL = os.environ.get("EI_INGESTION_URL", "https://ingestion.edgeimpulse.com/api/training/files")
+EI_UPLOAD_WORKERS = 4      # Upload paralel maksimal (thread pool & pool koneksi)
+EI_UPLOAD_TIMEOUT_S = 30.0 # Timeout connect/read per request
+EI_UPLOAD_RETRIES = 3      # Retry untuk timeout / error koneksi / HTTP 5xx / 429
+EI_RETRY_BACKOFF_S = 1.0   # Jeda retry pertama (digandakan tiap percobaan)
+
+# Data Library Thumbnails
+THUMB_WIDTH = 160          # Ukuran preview (px), sama dengan icon size tabel library
+THUMB_HEIGHT = 90
+THUMB_WORKERS = 2          # Thread render thumbnail di background
+THUMB_CACHE_DIR = "data/.thumbnails"
+
+# Filter Real-time (preset di dashboard, lihat utils/filters.py)
+FILTER_MA_WINDOW = 5        # Sampel (5 x 250 ms)
+FILTER_EMA_ALPHA = 0.3
+FILTER_HAMPEL_WINDOW = 7    # Sampel, jendela median untuk deteksi spike
+FILTER_HAMPEL_SIGMAS = 3.0
+FILTER_LOWPASS_HZ = 0.5     # Cutoff Butterworth (fs = 1000 / UPDATE_INTERVAL = 4 Hz)
+FILTER_BASELINE_WARMUP = 20 # Sampel awal (udara bersih) untuk baseline
+
+# Arduino FSM (kolom state/level di stream data & CSV)
+STATE_IDLE, STATE_PRE_COND, STATE_RAMP_UP, STATE_HOLD, STATE_PURGE, STATE_RECOVERY, STATE_DONE = range(7)
+STATE_NAMES = ["IDLE", "PRE_COND", "RAMP_UP", "HOLD", "PURGE", "RECOVERY", "DONE"]
+# Durasi nominal tiap state (main.ino), untuk merekonstruksi state file CSV lama
+FSM_NUM_LEVELS = 5
+FSM_T_PRECOND_S = 10.0
+FSM_T_RAMP_S = 2.0
+FSM_T_HOLD_S = 120.0
+FSM_T_PURGE_S = 240.0
+FSM_T_RECOVERY_S = 10.0
+
+# Ekstraksi Fitur per Siklus (HOLD -> PURGE, lihat utils/features.py)
+FEATURE_BASELINE_S = 5.0   # Rata-rata R0 dari 5 s terakhir sebelum HOLD
+FEATURE_SLOPE_S = 10.0     # Slope awal HOLD / PURGE (regresi linier 10 s pertama)
+
+# Classifier Aroma Lokal (python -m utils.classifier train ...)
+CLASSIFIER_MODEL_PATH = "models/odor_classifier.npz"
 
 # Sensor Names (Sesuai main.ino)
 SENSOR_NAMES = [
@@ -1,4 +1,5 @@
-import json
+import time
+import numpy as np
 from datetime import datetime
 from PySide6.QtWidgets import (
     QMainWindow, QWidget, QHBoxLayout, QListWidget, 
@@ -10,18 +11,26 @@ from PySide6.QtCore import Slot
 from config.constants import (
     APP_NAME, WINDOW_WIDTH, WINDOW_HEIGHT, 
     DATA_PORT, CMD_PORT, UPDATE_INTERVAL, 
-    NUM_SENSORS, SENSOR_NAMES, STATUS_COLORS
+    NUM_SENSORS, SENSOR_NAMES, STATUS_COLORS, STATE_DONE
 )
 from utils.network_comm import NetworkWorker, BridgeCommander
-from utils.file_handler import FileHandler
+from utils.replay import ReplayWorker
+from utils.recordings import load_recording, synthetic_recording
+from utils.export_worker import CsvExportWorker
+from utils.session_buffer import SessionBuffer
+from utils.features import FeatureExtractor
+from utils.classifier import InferenceStage
+from utils.running_stats import RollingStats
 # Import Styles
 from gui.styles import STYLESHEET
+from gui.resources import DataSource
 
 # Import Halaman
 from gui.pages.dashboard_page import DashboardPage
 from gui.pages.control_page import ControlPage
 from gui.pages.library_page import LibraryPage
 from gui.pages.stats_page import StatsPage
+from gui.pages.devices_page import DevicesPage
 
 class MainWindow(QMainWindow):
     def __init__(self):
@@ -34,13 +43,19 @@ class MainWindow(QMainWindow):
         
         # State Management
         self.is_sampling = False
-        self.sampling_data = {i: [] for i in range(NUM_SENSORS)}
-        self.sampling_times = []
+        self.session = SessionBuffer(NUM_SENSORS)
+        self.features = FeatureExtractor(self.session)  # Fitur per siklus HOLD -> PURGE
+        self.inference = InferenceStage.from_file()      # Classifier lokal (opsional)
         self.start_time = 0.0
+        self.batch_latency = RollingStats(1, window=100)  # ms, 100 batch terakhir
         
-        # Network Modules
+        # Network Modules (network_worker juga bisa ReplayWorker untuk Simulation/File)
+        self.source = DataSource.SERIAL
         self.network_worker = None
         self.commander = BridgeCommander(port=CMD_PORT) # Inisialisasi Commander
+        self.commander.command_finished.connect(self.on_command_finished)
+        self._pending_host = None
+        self.export_worker = None
 
         # --- UI SETUP ---
         central_widget = QWidget()
@@ -81,7 +96,8 @@ class MainWindow(QMainWindow):
             "📊  Dashboard", 
             "⚙️  Control Panel", 
             "📚  Data Library", 
-            "📈  Statistics"
+            "📈  Statistics",
+            "🛰️  Devices"
         ]
         self.sidebar.addItems(menu_items)
         self.sidebar.currentRowChanged.connect(self.switch_page)
@@ -94,20 +110,27 @@ class MainWindow(QMainWindow):
         self.page_control = ControlPage()
         self.page_library = LibraryPage()
         self.page_stats = StatsPage()
+        self.page_devices = DevicesPage()
         
         self.pages.addWidget(self.page_dashboard)
         self.pages.addWidget(self.page_control)
         self.pages.addWidget(self.page_library)
         self.pages.addWidget(self.page_stats)
+        self.pages.addWidget(self.page_devices)
         
         main_layout.addWidget(self.pages)
         
+        # Dashboard membaca langsung dari session store (tanpa duplikasi data)
+        self.page_dashboard.bind_session(self.session)
+        self.page_dashboard.set_model_status(self.inference.active, self.inference.disabled_reason)
+        
         # Connect Signals from Control Page
         self.page_control.request_connect.connect(self.on_connect_request)
         self.page_control.request_start.connect(self.on_start_request)
         self.page_control.request_stop.connect(self.on_stop_request)
         self.page_control.request_save.connect(self.on_save_request)
         self.page_control.request_clear.connect(self.on_clear_request)
+        self.page_devices.request_save.connect(self.on_devices_save_request)
         
         self.sidebar.setCurrentRow(0)
 
@@ -131,12 +154,11 @@ class MainWindow(QMainWindow):
         current_btn_text = self.page_control.conn_panel.connect_btn.text()
         
         if "Disconnect" in current_btn_text:
-            # ---> REQ DISCONNECT
-            if self.commander.disconnect_serial():
-                self.page_control.set_status("Disconnecting...", STATUS_COLORS['disconnected'])
-                # Stop worker data
-                if self.network_worker:
-                    self.network_worker.stop()
+            # ---> REQ DISCONNECT (worker data di-stop saat ack diterima)
+            if self.source == DataSource.SERIAL:
+                self.commander.disconnect_serial()
+            else:
+                self.stop_data_worker()
             
             # Reset UI segera (Optimistic update)
             self.page_control.conn_panel.connect_btn.setText("✨ Connect Bridge")
@@ -145,28 +167,80 @@ class MainWindow(QMainWindow):
 
         else:
             # ---> REQ CONNECT
+            self.source = settings['source']
+            if self.source != DataSource.SERIAL:
+                self.start_replay_worker(settings)
+                return
+
             if port_name == "No Ports":
                 QMessageBox.warning(self, "Warning", "Tidak ada Port Serial yang dipilih!")
                 return
 
             self.page_control.set_status("Connecting...", STATUS_COLORS['sampling'])
             
-            # 1. Kirim Perintah ke Rust
-            if self.commander.connect_serial(port_name):
+            # 1. Kirim Perintah ke Rust (non-blocking, lanjut di on_command_finished)
+            self._pending_host = host
+            self.commander.connect_serial(port_name)
+
+    def stop_data_worker(self):
+        """Hentikan worker data (NetworkWorker / ReplayWorker) dan tunggu sampai benar-benar selesai"""
+        if self.network_worker:
+            self.network_worker.stop()
+            # ReplayWorker adalah QThread: objeknya tidak boleh dilepas saat thread masih jalan
+            self.network_worker.wait(2000)
+            self.network_worker = None
+
+    def start_data_worker(self, host):
+        """Nyalakan Worker Penerima Data (Port 8083)"""
+        self.stop_data_worker()
+        self.network_worker = NetworkWorker(host=host, port=DATA_PORT)
+        self.network_worker.batch_received.connect(self.on_batch_received)
+        self.network_worker.connection_status.connect(self.on_connection_status)
+        self.network_worker.start()
+
+    def start_replay_worker(self, settings):
+        """Sumber Simulation / File: ReplayWorker menggantikan worker port 8083"""
+        try:
+            if self.source == DataSource.SIMULATION:
+                records = synthetic_recording()
+            else:
+                records = load_recording(settings['replay_file'])
+        except Exception as e:
+            QMessageBox.critical(self, "Error", f"Gagal memuat rekaman:\n{e}")
+            return
+
+        self.stop_data_worker()
+        self.network_worker = ReplayWorker(records, speed=settings['speed'])
+        self.network_worker.batch_received.connect(self.on_batch_received)
+        self.network_worker.connection_status.connect(self.on_connection_status)
+        self.network_worker.start()
+
+    @Slot(str, bool, str, float)
+    def on_command_finished(self, command, ok, reply, rtt_ms):
+        """Ack dari Rust (Port 8082) untuk perintah yang dikirim async"""
+        name = command.split()[0]
+        if ok:
+            print(f"✅ {command} ({rtt_ms:.1f} ms)")
+
+        if name == "CONNECT_SERIAL":
+            if ok:
                 # 2. Nyalakan Worker Penerima Data
-                if self.network_worker: 
-                    self.network_worker.stop()
-                    
-                self.network_worker = NetworkWorker(host=host, port=DATA_PORT)
-                self.network_worker.data_received.connect(self.on_data_received)
-                self.network_worker.connection_status.connect(self.on_connection_status)
-                self.network_worker.start()
-                
-                print(f"✅ Request Sent: Connect to {port_name}")
+                self.start_data_worker(self._pending_host)
             else:
-                QMessageBox.critical(self, "Error", "Gagal menghubungi Backend Rust (Port 8082).\nPastikan 'cargo run' sudah jalan!")
+                QMessageBox.critical(self, "Error", f"Gagal connect lewat Backend Rust (Port 8082):\n{reply}\n\nPastikan 'cargo run' sudah jalan!")
                 self.page_control.set_status("Bridge Error", STATUS_COLORS['disconnected'])
 
+        elif name == "DISCONNECT_SERIAL" and ok:
+            # Stop worker data (stop yang disengaja tidak memancarkan connection_status)
+            self.stop_data_worker()
+            self.on_connection_status(False)
+
+        elif name == "START_SAMPLING":
+            if ok:
+                self.begin_sampling()
+            else:
+                QMessageBox.warning(self, "Error", f"START ditolak backend:\n{reply}")
+
     def on_connection_status(self, connected):
         """Callback saat socket data (8083) terhubung/putus"""
         self.page_control.enable_controls(connected, self.is_sampling)
@@ -175,105 +249,176 @@ class MainWindow(QMainWindow):
             self.page_control.set_status("Bridge Connected", STATUS_COLORS['connected'])
             self.page_control.conn_panel.connect_btn.setText("🛑 Disconnect")
             self.page_control.conn_panel.port_selector.setEnabled(False)
+            self.page_control.conn_panel.source_selector.setEnabled(False)
         else:
             # Jika putus tiba-tiba
             self.page_control.set_status("Disconnected", STATUS_COLORS['disconnected'])
             self.page_control.conn_panel.connect_btn.setText("✨ Connect Bridge")
-            self.page_control.conn_panel.port_selector.setEnabled(True)
+            self.page_control.conn_panel.source_selector.setEnabled(True)
+            self.page_control.conn_panel.on_source_changed()
 
     # ================= LOGIC SAMPLING =================
     @Slot()
     def on_start_request(self):
-        # Kirim START ke Rust
-        if self.commander.start_sampling():
-            # Reset Data
-            self.sampling_data = {i: [] for i in range(NUM_SENSORS)}
-            self.sampling_times = []
-            self.start_time = 0.0
-            
-            # Clear UI
-            self.page_dashboard.clear_plot()
-            self.page_stats.clear_stats()
-            
-            # Update UI State
-            self.is_sampling = True
-            self.page_control.enable_controls(True, True)
-            self.page_control.set_status("Sampling...", STATUS_COLORS['sampling'])
-            
-            # Update Info
-            info = self.page_control.get_sample_info()
-            self.page_control.update_info(0, info['name'])
-            self.page_control.update_info(1, info['type'])
+        if self.source != DataSource.SERIAL and self.network_worker:
+            # Replay: putar dari awal rekaman
+            self.begin_sampling()
+            self.network_worker.play()
+            return
+        # Kirim START ke Rust (UI di-reset setelah ack OK)
+        self.commander.start_sampling()
+
+    def begin_sampling(self):
+        # Reset Data
+        self.session.clear()
+        self.features.reset()
+        self.start_time = 0.0
+        
+        # Clear UI
+        self.page_dashboard.clear_plot()
+        self.page_stats.clear_stats()
+        
+        # Update UI State
+        self.is_sampling = True
+        self.page_control.enable_controls(True, True)
+        self.page_control.set_status("Sampling...", STATUS_COLORS['sampling'])
+        
+        # Update Info
+        info = self.page_control.get_sample_info()
+        self.page_control.update_info(0, info['name'])
+        self.page_control.update_info(1, info['type'])
+        if self.network_worker:
+            # Peak / drop antrian GUI dihitung per sesi sampling
+            self.network_worker.channel.reset_stats()
 
     @Slot()
     def on_stop_request(self):
-        # Kirim STOP ke Rust
-        self.commander.stop_sampling()
+        # Kirim STOP ke Rust (replay cukup di-pause)
+        if self.source != DataSource.SERIAL and self.network_worker:
+            self.network_worker.pause()
+        else:
+            self.commander.stop_sampling()
         
+        # Siklus terakhir yang PURGE-nya terpotong STOP
+        for cycle in self.features.finish():
+            self.on_cycle_finished(cycle)
+
         # Update UI State
         self.is_sampling = False
         self.page_control.enable_controls(True, False)
         self.page_control.set_status("Bridge Connected", STATUS_COLORS['connected'])
 
-    def on_data_received(self, data):
-        """Menerima Data JSON dari Rust"""
+    def on_batch_received(self, batch, first_arrival: float):
+        """Menerima batch record (SAMPLE_DTYPE) yang sudah di-decode oleh worker"""
         try:
-            # Parse Data
-            vals = [
-                float(data.get('no2', 0)), float(data.get('eth', 0)),
-                float(data.get('voc', 0)), float(data.get('co', 0)),
-                float(data.get('co_mics', 0)), float(data.get('eth_mics', 0)),
-                float(data.get('voc_mics', 0))
-            ]
-            state_idx = int(data.get('state', 0))
-
-            if self.is_sampling:
-                # Timer
-                if not self.sampling_times: self.start_time = 0
-                else: self.start_time += UPDATE_INTERVAL / 1000.0
-                
-                # Simpan Data
-                self.sampling_times.append(self.start_time)
-                for i, v in enumerate(vals[:NUM_SENSORS]):
-                    self.sampling_data[i].append(v)
-
-                # Update Halaman
-                self.page_dashboard.update_plot(self.start_time, vals)
-                self.page_stats.update_statistics(self.sampling_data)
-                
-                # Update Info Panel
-                self.page_control.update_info(3, len(self.sampling_times))
-                self.page_control.update_info(4, f"{self.start_time:.2f} s")
-
-                # Auto Stop Check (Jika FSM Rust bilang DONE / state 6)
-                if state_idx == 6: 
-                    self.on_stop_request()
-                    QMessageBox.information(self, "Selesai", "Proses Sampling Selesai!")
+            # Latency batch: sampel pertama tiba di worker -> diproses GUI
+            self.batch_latency.update([(time.perf_counter() - first_arrival) * 1000.0])
+            if self.network_worker:
+                self.page_control.update_info(6, self.network_worker.channel.summary())
+
+            if not self.is_sampling or not len(batch):
+                return
+
+            # Auto Stop Check (Jika FSM Rust bilang DONE / state 6)
+            done = np.flatnonzero(batch['state'] == STATE_DONE)
+            if done.size:
+                batch = batch[:done[0] + 1]
+
+            # Timer (vektor waktu untuk seluruh batch)
+            dt = UPDATE_INTERVAL / 1000.0
+            t0 = self.start_time + dt if len(self.session) else 0.0
+            times = t0 + dt * np.arange(len(batch))
+            self.start_time = float(times[-1])
+
+            # Simpan Data
+            sensors = batch['sensors'].T
+            self.session.extend(times, sensors, batch['state'], batch['level'])
+
+            # Update Halaman
+            self.page_dashboard.add_batch(times, sensors)
+            self.page_stats.add_batch(sensors)
+            for cycle in self.features.update():
+                self.on_cycle_finished(cycle)
+
+            # Update Info Panel
+            self.page_control.update_info(3, len(self.session))
+            self.page_control.update_info(4, f"{self.start_time:.2f} s")
+            self.page_control.update_info(
+                5, f"{self.batch_latency.mean[0]:.1f} ms (max {self.batch_latency.max[0]:.1f})"
+            )
+
+            if done.size:
+                self.on_stop_request()
+                QMessageBox.information(self, "Selesai", "Proses Sampling Selesai!")
 
         except Exception as e:
             print(f"Data Error: {e}")
 
+    def on_cycle_finished(self, cycle):
+        """Satu siklus HOLD -> PURGE selesai: tabel fitur + inferensi classifier"""
+        self.page_stats.add_cycle(cycle)
+        result = self.inference.process(cycle)
+        if result is not None:
+            self.page_dashboard.set_prediction(result)
+
     # ================= LOGIC SAVE & CLEAR =================
     @Slot()
     def on_save_request(self):
-        if not self.sampling_times:
+        if not len(self.session):
             QMessageBox.warning(self, "Empty", "Belum ada data untuk disimpan!")
             return
             
+        if self.export_worker and self.export_worker.isRunning():
+            QMessageBox.warning(self, "Busy", "Penyimpanan sebelumnya masih berjalan!")
+            return
+            
         info = self.page_control.get_sample_info()
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         filename = f"data/{info['name'].replace(' ', '_')}_{timestamp}.csv"
         
-        try:
-            FileHandler.save_as_csv(
-                filename, info, self.sampling_data, 
-                self.sampling_times, SENSOR_NAMES
-            )
+        # Tulis CSV di background (view session tanpa salinan)
+        self.export_worker = CsvExportWorker(
+            filename, info, self.session.sensors,
+            self.session.times, SENSOR_NAMES,
+            states=self.session.state, levels=self.session.level, parent=self
+        )
+        self.export_worker.progress.connect(
+            lambda pct: self.page_control.set_status(f"Saving... {pct}%", STATUS_COLORS['sampling'])
+        )
+        self.export_worker.export_finished.connect(self.on_save_finished)
+        self.page_control.ctrl_panel.save_btn.setEnabled(False)
+        self.export_worker.start()
+
+    @Slot(bool, str)
+    def on_save_finished(self, ok, filename):
+        self.page_control.ctrl_panel.save_btn.setEnabled(True)
+        if self.is_sampling:
+            self.page_control.set_status("Sampling...", STATUS_COLORS['sampling'])
+        else:
+            self.page_control.set_status("Bridge Connected", STATUS_COLORS['connected'])
+
+        if ok:
             QMessageBox.information(self, "Success", f"Data tersimpan di:\n{filename}")
-            self.page_library.refresh_library()
-            
-        except Exception as e:
-            QMessageBox.critical(self, "Error", f"Gagal simpan: {e}")
+            self.page_library.add_file(filename)
+        else:
+            QMessageBox.critical(self, "Error", f"Gagal simpan: {filename}")
+
+    @Slot()
+    def on_devices_save_request(self):
+        """Save All di halaman Devices: satu CSV per device (info sampel dari Control Panel)"""
+        workers = self.page_devices.save_all(self.page_control.get_sample_info())
+        if not workers:
+            QMessageBox.warning(self, "Empty", "Belum ada data device untuk disimpan!")
+            return
+        for worker in workers:
+            worker.export_finished.connect(self.on_device_save_finished)
+
+    @Slot(bool, str)
+    def on_device_save_finished(self, ok, filename):
+        if ok:
+            self.page_library.add_file(filename)
+        else:
+            QMessageBox.critical(self, "Error", f"Gagal simpan: {filename}")
 
     @Slot()
     def on_clear_request(self):
@@ -282,8 +427,8 @@ class MainWindow(QMainWindow):
             return
 
         if QMessageBox.question(self, "Reset", "Hapus semua grafik?") == QMessageBox.Yes:
-            self.sampling_data = {i: [] for i in range(NUM_SENSORS)}
-            self.sampling_times = []
+            self.session.clear()
+            self.features.reset()
             self.start_time = 0.0
             
             self.page_dashboard.clear_plot()
@@ -292,9 +437,11 @@ class MainWindow(QMainWindow):
             self.page_control.update_info(4, "0 s")
 
     def closeEvent(self, event):
-        if self.network_worker: 
-            self.network_worker.stop()
+        self.stop_data_worker()
         try:
             self.commander.disconnect_serial()
+            self.commander.close()
         except: pass
+        self.page_library.shutdown_uploads()
+        self.page_devices.shutdown()
         event.accept()
\ No newline at end of file
@@ -2,6 +2,8 @@ from PySide6.QtWidgets import QWidget, QVBoxLayout, QLabel, QTableWidget, QTable
 from PySide6.QtGui import QFont
 from PySide6.QtCore import Signal
 from gui.widgets import ControlPanel, ConnectionPanel
+from gui.render_scheduler import RenderScheduler
+from config.constants import TABLE_REFRESH_FPS
 
 class ControlPage(QWidget):
     # Signals
@@ -30,22 +32,38 @@ class ControlPage(QWidget):
         
         # 3. Info Table
         self.layout.addWidget(QLabel("📈 Sampling Stats"))
-        self.info_table = QTableWidget(5, 2)
+        self.info_table = QTableWidget(7, 2)
         self.info_table.setHorizontalHeaderLabels(["Property", "Value"])
         self.info_table.horizontalHeader().setStretchLastSection(True)
         self.populate_initial()
         self.layout.addWidget(self.info_table)
         
+        # Nilai info ditampung dulu, ditulis ke tabel maksimal TABLE_REFRESH_FPS
+        self._pending_info = {}
+        self.info_scheduler = RenderScheduler(self.apply_info, max_fps=TABLE_REFRESH_FPS, parent=self)
+        
         self.layout.addStretch()
 
     def populate_initial(self):
-        defaults = {"Name": "-", "Type": "-", "Mode": "Auto", "Points": "0", "Time": "0s"}
+        defaults = {"Name": "-", "Type": "-", "Mode": "Auto", "Points": "0", "Time": "0s",
+                    "Batch Latency": "-", "GUI Queue": "-"}
         for r, (k, v) in enumerate(defaults.items()):
             self.info_table.setItem(r, 0, QTableWidgetItem(k))
             self.info_table.setItem(r, 1, QTableWidgetItem(v))
 
     def update_info(self, row, val):
-        self.info_table.setItem(row, 1, QTableWidgetItem(str(val)))
+        self._pending_info[row] = str(val)
+        self.info_scheduler.request_frame()
+
+    def apply_info(self):
+        """Tulis nilai tertunda, reuse item yang ada & skip jika teks sama"""
+        for row, text in self._pending_info.items():
+            item = self.info_table.item(row, 1)
+            if item is None:
+                self.info_table.setItem(row, 1, QTableWidgetItem(text))
+            elif item.text() != text:
+                item.setText(text)
+        self._pending_info.clear()
         
     def get_connection_settings(self):
         return self.conn_panel.get_connection_settings()
@@ -1,5 +1,9 @@
-from PySide6.QtWidgets import QWidget, QVBoxLayout
+import numpy as np
+from PySide6.QtWidgets import QWidget, QVBoxLayout, QHBoxLayout, QLabel, QComboBox
 from gui.widgets import SensorPlot
+from gui.render_scheduler import RenderScheduler
+from utils.filters import FILTER_PRESETS, build_filter_chain
+from utils.session_buffer import SessionBuffer
 
 class DashboardPage(QWidget):
     """
@@ -10,15 +14,94 @@ class DashboardPage(QWidget):
         super().__init__(parent)
         self.layout = QVBoxLayout(self)
         self.layout.setContentsMargins(10, 10, 10, 10)
-        
+
+        # Pilihan filter tampilan (data mentah tetap disimpan apa adanya)
+        filter_layout = QHBoxLayout()
+        # Hasil classifier lokal per siklus (utils.classifier.InferenceStage)
+        self.prediction_label = QLabel("Prediksi: -")
+        self._model_active = False
+        self._model_reason = "model belum dilatih"
+        filter_layout.addWidget(self.prediction_label)
+        filter_layout.addStretch()
+        filter_layout.addWidget(QLabel("Filter:"))
+        self.filter_combo = QComboBox()
+        self.filter_combo.addItems(list(FILTER_PRESETS))
+        self.filter_combo.currentTextChanged.connect(self.set_filter)
+        filter_layout.addWidget(self.filter_combo)
+        self.layout.addLayout(filter_layout)
+
+        # Sesi mentah (milik MainWindow) & salinan terfilter untuk grafik
+        self.session = None
+        self.filtered = SessionBuffer()
+        self.chain = None
+
         # Widget Grafik dari widgets.py
         self.plot_widget = SensorPlot("Real-Time Sensor Data")
         self.layout.addWidget(self.plot_widget)
-        
-    def update_plot(self, time: float, sensor_values: list):
+
+        # Redraw dibatasi FPS, bukan per paket
+        self.scheduler = RenderScheduler(self.plot_widget.refresh_curves, parent=self)
+        # Zoom/pan/resize -> hitung ulang level of detail di frame berikutnya
+        self.plot_widget.lod_invalidated.connect(self.scheduler.request_frame)
+
+    def bind_session(self, session):
+        """Grafik membaca langsung dari SessionBuffer milik MainWindow"""
+        self.session = session
+        self.set_filter(self.filter_combo.currentText())
+
+    def set_filter(self, preset: str):
+        """
+        Ganti filter tampilan. Data sesi yang sudah ada difilter ulang sekali
+        (batch), lalu chain yang sama melanjutkan secara streaming.
+        """
+        self.chain = build_filter_chain(preset)
+        self.filtered.clear()
+        if self.session is None:
+            return
+        if self.chain is None:
+            self.plot_widget.set_source(self.session)
+        else:
+            if len(self.session):
+                self.filtered.extend(self.session.times, self.chain.process(self.session.sensors))
+            self.plot_widget.set_source(self.filtered)
+        self.scheduler.request_frame()
+
+    def add_batch(self, times: np.ndarray, sensors: np.ndarray):
+        """Blok sampel baru (sudah masuk ke sesi mentah): filter lalu jadwalkan redraw"""
+        if self.chain is not None and self.session is not None:
+            self.filtered.extend(times, self.chain.process(sensors))
+        self.scheduler.request_frame(len(times))
+
+    def set_model_status(self, active: bool, reason: str = "model belum dilatih"):
+        self._model_active = active
+        self._model_reason = reason
+        self.prediction_label.setToolTip("")
+        self.prediction_label.setText("Prediksi: menunggu siklus..." if active
+                                      else f"Prediksi: {reason}")
+
+    def set_prediction(self, result: dict):
+        """Tampilkan probabilitas kelas (dict dari InferenceStage.process), terbesar dulu"""
+        order = np.argsort(result["proba"])[::-1]
+        level = "-" if result["level"] is None else result["level"] + 1
+        parts = [f"{result['classes'][i]} {result['proba'][i]:.0%}" for i in order]
+        acc = result.get("heldout_accuracy")
+        # Akurasi held-out selalu ditampilkan agar prediksi tidak dibaca sebagai pasti
+        acc_text = "akurasi uji ?" if acc is None else f"akurasi uji {acc:.0%}"
+        self.prediction_label.setText(f"Prediksi (Level {level}, {acc_text}): <b>{parts[0]}</b>  |  "
+                                      + "  |  ".join(parts[1:]))
+        self.prediction_label.setToolTip(f"Latensi inferensi: {result['latency_ms']:.2f} ms")
+
+    def update_plot(self, time: float = None, sensor_values: list = None, count: int = 1):
         """Dipanggil oleh MainWindow saat ada data masuk dari Rust"""
-        self.plot_widget.add_data_point(time, sensor_values)
-        
+        if self.plot_widget.source is None:
+            self.plot_widget.push_data_point(time, sensor_values)
+        self.scheduler.request_frame(count)
+
     def clear_plot(self):
         """Reset grafik saat tombol Clear ditekan atau Start baru"""
-        self.plot_widget.clear_data()
\ No newline at end of file
+        self.scheduler.cancel()
+        if self.chain is not None:
+            self.chain.reset()
+        self.filtered.clear()
+        self.plot_widget.clear_data()
+        self.set_model_status(self._model_active, self._model_reason)
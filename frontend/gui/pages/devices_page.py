@@ -0,0 +1,304 @@
+import time
+import numpy as np
+from datetime import datetime
+from PySide6.QtWidgets import (
+    QWidget, QVBoxLayout, QHBoxLayout, QGridLayout, QLabel, QLineEdit,
+    QPushButton, QTableView, QHeaderView, QScrollArea, QSplitter, QAbstractItemView
+)
+from PySide6.QtCore import Qt, Signal
+from PySide6.QtGui import QFont, QIntValidator
+
+from config.constants import (
+    DEFAULT_HOST, DATA_PORT, NUM_SENSORS, SENSOR_NAMES, UPDATE_INTERVAL,
+    TABLE_REFRESH_FPS, DEVICE_PLOT_POINTS, STATE_NAMES
+)
+from gui.widgets import SensorPlot
+from gui.table_models import DeviceTableModel, StatsTableModel
+from gui.render_scheduler import RenderScheduler
+from utils.device_manager import DeviceManager
+from utils.export_worker import CsvExportWorker
+from utils.running_stats import RunningStats
+from utils.session_buffer import SessionBuffer
+
+
+class DeviceView:
+    """Sesi, statistik & plot ringkas milik satu device"""
+
+    def __init__(self, name: str, address: str):
+        self.name = name
+        self.address = address
+        self.session = SessionBuffer(NUM_SENSORS)
+        self.running = RunningStats(NUM_SENSORS)
+        self.plot = SensorPlot(name)
+        self.plot.max_points = DEVICE_PLOT_POINTS
+        self.plot.setMinimumHeight(220)
+        self.plot.set_source(self.session)
+        self.connected = False
+        self._rate_mark = (time.perf_counter(), 0)
+
+    def extend(self, batch: np.ndarray):
+        """Tambah batch record SAMPLE_DTYPE (waktu = indeks x UPDATE_INTERVAL, seperti MainWindow)"""
+        dt = UPDATE_INTERVAL / 1000.0
+        n = len(self.session)
+        times = dt * np.arange(n, n + len(batch))
+        sensors = batch['sensors'].T
+        self.session.extend(times, sensors, batch['state'], batch['level'])
+        self.running.update_batch(sensors)
+
+    def clear(self):
+        self.session.clear()
+        self.running.reset()
+        self.plot.clear_data()
+        self._rate_mark = (time.perf_counter(), 0)
+
+    def rate(self) -> float:
+        """Sampel per detik sejak panggilan sebelumnya"""
+        now, n = time.perf_counter(), len(self.session)
+        t0, n0 = self._rate_mark
+        self._rate_mark = (now, n)
+        return (n - n0) / (now - t0) if now > t0 else 0.0
+
+
+class DevicesPage(QWidget):
+    """
+    Halaman 5: Devices
+    Beberapa E-Nose sekaligus. Semua stream dibaca oleh satu DeviceManager
+    (coroutine di event loop jaringan bersama); setiap device punya
+    SessionBuffer, statistik dan plot ringkas sendiri.
+
+    Batch yang masuk hanya menyimpan data & menandai device "dirty". Plot
+    digambar ulang oleh satu RenderScheduler (MAX_RENDER_FPS) dan hanya
+    untuk device dirty yang terlihat; tabel di-refresh TABLE_REFRESH_FPS.
+    """
+
+    request_save = Signal()
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.layout = QVBoxLayout(self)
+        self.layout.setContentsMargins(20, 20, 20, 20)
+        self.layout.setSpacing(10)
+
+        self.devices = {}
+        self._plot_dirty = set()
+        self._table_dirty = set()
+        self._plot_cols = 2
+        self.export_workers = []
+
+        title = QLabel("🛰️ Devices (Multi E-Nose)")
+        title.setFont(QFont("Segoe UI", 12, QFont.Bold))
+        self.layout.addWidget(title)
+
+        # Tambah device: nama + alamat bridge (port data 8083 + offset)
+        form = QHBoxLayout()
+        self.name_input = QLineEdit()
+        self.name_input.setPlaceholderText("Nama device (mis. nose-2)")
+        self.host_input = QLineEdit(DEFAULT_HOST)
+        self.port_input = QLineEdit(str(DATA_PORT))
+        self.port_input.setValidator(QIntValidator(1, 65535))
+        self.port_input.setFixedWidth(80)
+        self.add_btn = QPushButton("➕ Add")
+        self.remove_btn = QPushButton("🗑️ Remove")
+        self.clear_btn = QPushButton("🧹 Clear All")
+        self.save_btn = QPushButton("💾 Save All")
+        form.addWidget(QLabel("Name:"))
+        form.addWidget(self.name_input)
+        form.addWidget(QLabel("Host:"))
+        form.addWidget(self.host_input)
+        form.addWidget(QLabel("Data Port:"))
+        form.addWidget(self.port_input)
+        for btn in (self.add_btn, self.remove_btn, self.clear_btn, self.save_btn):
+            form.addWidget(btn)
+        self.layout.addLayout(form)
+
+        # Kedalaman / drop antrian DeviceManager -> GUI (utils.gui_queue)
+        self.queue_label = QLabel("GUI Queue: -")
+        self.queue_label.setStyleSheet("color: gray;")
+        self.layout.addWidget(self.queue_label)
+
+        self.add_btn.clicked.connect(self.on_add_clicked)
+        self.remove_btn.clicked.connect(self.on_remove_clicked)
+        self.clear_btn.clicked.connect(self.clear_all)
+        self.save_btn.clicked.connect(self.request_save.emit)
+
+        # Tabel device + statistik device terpilih
+        splitter = QSplitter(Qt.Vertical)
+        tables = QWidget()
+        tables_layout = QHBoxLayout(tables)
+        tables_layout.setContentsMargins(0, 0, 0, 0)
+        self.device_model = DeviceTableModel(parent=self)
+        self.device_table = QTableView()
+        self.device_table.setModel(self.device_model)
+        self.device_table.verticalHeader().setVisible(False)
+        self.device_table.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.device_table.setSelectionMode(QAbstractItemView.SingleSelection)
+        self.device_table.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
+        self.device_table.selectionModel().currentRowChanged.connect(self._on_selection_changed)
+        tables_layout.addWidget(self.device_table, 3)
+
+        names = [SENSOR_NAMES[i] if i < len(SENSOR_NAMES) else f"Sensor {i+1}" for i in range(NUM_SENSORS)]
+        self.stats_model = StatsTableModel(names, parent=self)
+        self.stats_table = QTableView()
+        self.stats_table.setModel(self.stats_model)
+        self.stats_table.verticalHeader().setVisible(False)
+        self.stats_table.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
+        tables_layout.addWidget(self.stats_table, 2)
+        splitter.addWidget(tables)
+
+        # Grid plot ringkas per device
+        self.plot_area = QWidget()
+        self.plot_grid = QGridLayout(self.plot_area)
+        scroll = QScrollArea()
+        scroll.setWidgetResizable(True)
+        scroll.setWidget(self.plot_area)
+        splitter.addWidget(scroll)
+        splitter.setSizes([250, 650])
+        self.layout.addWidget(splitter)
+
+        self.manager = DeviceManager(parent=self)
+        self.manager.batches_received.connect(self.on_batches_received)
+        self.manager.device_status.connect(self.on_device_status)
+
+        self.plot_scheduler = RenderScheduler(self.refresh_plots, parent=self)
+        self.table_scheduler = RenderScheduler(self.refresh_tables, max_fps=TABLE_REFRESH_FPS, parent=self)
+
+    # --- Manajemen device ---
+    def on_add_clicked(self):
+        name = self.name_input.text().strip() or f"nose-{len(self.devices) + 1}"
+        host = self.host_input.text().strip() or DEFAULT_HOST
+        port = int(self.port_input.text() or DATA_PORT)
+        if self.add_device(name, host, port):
+            self.name_input.clear()
+
+    def add_device(self, name: str, host: str, port: int) -> bool:
+        if name in self.devices:
+            return False
+        view = DeviceView(name, f"{host}:{port}")
+        self.devices[name] = view
+        self.device_model.add_device(name, view.address)
+        self._layout_plots()
+        if not self.manager.isRunning():
+            self.manager.start()
+        self.manager.add_device(name, host, port)
+        if self.device_table.currentIndex().row() < 0:
+            self.device_table.selectRow(0)
+        return True
+
+    def on_remove_clicked(self):
+        row = self.device_table.currentIndex().row()
+        if row >= 0:
+            self.remove_device(self.device_model.name_at(row))
+
+    def remove_device(self, name: str):
+        view = self.devices.pop(name, None)
+        if view is None:
+            return
+        self.manager.remove_device(name)
+        self.device_model.remove_device(name)
+        self._plot_dirty.discard(name)
+        self._table_dirty.discard(name)
+        self.plot_grid.removeWidget(view.plot)
+        view.plot.deleteLater()
+        self._layout_plots()
+
+    def _layout_plots(self):
+        for i, view in enumerate(self.devices.values()):
+            self.plot_grid.addWidget(view.plot, i // self._plot_cols, i % self._plot_cols)
+
+    def selected_device(self):
+        row = self.device_table.currentIndex().row()
+        return self.devices.get(self.device_model.name_at(row)) if row >= 0 else None
+
+    # --- Data masuk (satu signal per jendela batch untuk semua device) ---
+    def on_batches_received(self, batches: dict):
+        for name, batch in batches.items():
+            view = self.devices.get(name)
+            if view is None or not len(batch):
+                continue
+            view.extend(batch)
+            self._plot_dirty.add(name)
+            self._table_dirty.add(name)
+        self.plot_scheduler.request_frame()
+        self.table_scheduler.request_frame()
+
+    def on_device_status(self, name: str, connected: bool):
+        view = self.devices.get(name)
+        if view is None:
+            return
+        view.connected = connected
+        if connected:
+            self.device_model.set_row(name, status="Connected")
+        else:
+            self.device_model.set_row(name, status="Reconnecting...", rate="-")
+
+    # --- Render ---
+    def refresh_plots(self):
+        """Gambar ulang hanya plot device dirty yang sedang terlihat"""
+        for name in list(self._plot_dirty):
+            view = self.devices[name]
+            if view.plot.isVisible():
+                view.plot.refresh_curves()
+                self._plot_dirty.discard(name)
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        # Plot yang tertunda saat halaman tersembunyi
+        if self._plot_dirty:
+            self.plot_scheduler.request_frame()
+
+    def refresh_tables(self):
+        for name in self._table_dirty:
+            view = self.devices[name]
+            n = len(view.session)
+            state = int(view.session.state[-1])
+            self.device_model.set_row(
+                name, samples=str(n), rate=f"{view.rate():.1f}",
+                state=STATE_NAMES[state] if 0 <= state < len(STATE_NAMES) else str(state),
+                level=str(int(view.session.level[-1]) + 1),
+            )
+        self._table_dirty.clear()
+        self.queue_label.setText(f"GUI Queue: {self.manager.channel.summary()}")
+        self._refresh_stats()
+
+    def _refresh_stats(self):
+        view = self.selected_device()
+        if view is None or view.running.count == 0:
+            self.stats_model.clear_values()
+            return
+        r = view.running
+        self.stats_model.set_values(np.column_stack([r.min, r.max, r.mean, r.std]))
+
+    def _on_selection_changed(self, *_):
+        self._refresh_stats()
+
+    # --- Clear / Save ---
+    def clear_all(self):
+        for name, view in self.devices.items():
+            view.clear()
+            self.device_model.set_row(name, samples="0", rate="-", state="-", level="-")
+        self._plot_dirty.clear()
+        self._table_dirty.clear()
+        self.stats_model.clear_values()
+
+    def save_all(self, info: dict) -> list:
+        """Export sesi setiap device ke CSV (satu CsvExportWorker per device); return worker"""
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        self.export_workers = [w for w in self.export_workers if w.isRunning()]
+        started = []
+        for name, view in self.devices.items():
+            if not len(view.session):
+                continue
+            dev_info = dict(info, name=f"{info['name']} [{name}]")
+            filename = f"data/{info['name'].replace(' ', '_')}_{name.replace(' ', '_')}_{timestamp}.csv"
+            s = view.session
+            worker = CsvExportWorker(filename, dev_info, s.sensors, s.times, SENSOR_NAMES,
+                                     states=s.state, levels=s.level, parent=self)
+            worker.start()
+            started.append(worker)
+        self.export_workers += started
+        return started
+
+    def shutdown(self):
+        if self.manager.isRunning():
+            self.manager.stop()
+            self.manager.wait(2000)
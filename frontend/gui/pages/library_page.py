@@ -1,16 +1,21 @@
 import os
-import glob
 import subprocess
-from datetime import datetime
 from PySide6.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushButton, 
-    QTableWidget, QTableWidgetItem, QHeaderView, QAbstractItemView,
-    QLineEdit, QMessageBox, QMenu
+    QTableView, QHeaderView, QAbstractItemView,
+    QLineEdit, QMessageBox, QMenu, QProgressBar
 )
-from PySide6.QtGui import QFont, QIcon, QAction
+from PySide6.QtGui import QFont, QIcon, QAction, QPixmap
 from PySide6.QtCore import Qt, QSize
 
-from utils.file_handler import FileHandler
+from config.constants import THUMB_WIDTH, THUMB_HEIGHT
+from gui.render_scheduler import RenderScheduler
+from gui.table_models import (
+    LibraryTableModel, LibraryProxyModel, COL_PREVIEW, COL_FILE, COL_TYPE, COL_MODIFIED
+)
+from gui.thumbnails import ThumbnailService
+from utils.library_index import LibraryIndex
+from utils.upload_queue import UploadQueue
 
 class LibraryPage(QWidget):
     """
@@ -32,6 +37,13 @@ class LibraryPage(QWidget):
         
         toolbar_layout.addStretch()
         
+        # Search (nama file / sampel / tipe / tanggal)
+        self.search_input = QLineEdit()
+        self.search_input.setPlaceholderText("🔍 Cari nama, tipe, tanggal...")
+        self.search_input.setClearButtonEnabled(True)
+        self.search_input.setFixedWidth(220)
+        toolbar_layout.addWidget(self.search_input)
+        
         # API Key Input
         self.api_key_input = QLineEdit()
         self.api_key_input.setPlaceholderText("Edge Impulse API Key...")
@@ -48,86 +60,144 @@ class LibraryPage(QWidget):
         
         # Refresh Button
         self.refresh_btn = QPushButton("🔄 Refresh")
-        self.refresh_btn.clicked.connect(self.refresh_library)
+        self.refresh_btn.clicked.connect(lambda: self.refresh_library())
         toolbar_layout.addWidget(self.refresh_btn)
         
         self.layout.addLayout(toolbar_layout)
         
-        # --- TABLE WIDGET ---
-        self.lib_table = QTableWidget(0, 4)
-        self.lib_table.setHorizontalHeaderLabels(["Preview", "Filename", "Last Modified", "Size"])
-        self.lib_table.setIconSize(QSize(160, 90)) # Thumbnail size
+        # --- UPLOAD PROGRESS ---
+        upload_layout = QHBoxLayout()
+        self.upload_status = QLabel("")
+        upload_layout.addWidget(self.upload_status)
+        self.upload_progress = QProgressBar()
+        self.upload_progress.setVisible(False)
+        upload_layout.addWidget(self.upload_progress)
+        self.layout.addLayout(upload_layout)
+        
+        self.upload_queue = None
+        self._upload_names = {}   # path CSV -> nama file di tabel
+        self._upload_percent = {} # path CSV -> progress (%)
+        self._upload_errors = []
+        
+        # --- TABLE (model/view, tanpa objek per sel) ---
+        self.model = LibraryTableModel(self)
+        self.proxy = LibraryProxyModel(self)
+        self.proxy.setSourceModel(self.model)
+        self.search_input.textChanged.connect(self.proxy.set_search)
+        
+        self.lib_table = QTableView()
+        self.lib_table.setModel(self.proxy)
+        self.lib_table.setIconSize(QSize(THUMB_WIDTH, THUMB_HEIGHT)) # Thumbnail size
+        self.lib_table.verticalHeader().setVisible(False)
         
-        # Table Styling
+        # Tinggi baris seragam: view tidak perlu mengukur tiap baris
+        v_header = self.lib_table.verticalHeader()
+        v_header.setSectionResizeMode(QHeaderView.Fixed)
+        v_header.setDefaultSectionSize(100)
+        
+        # Table Styling (lebar kolom tetap/interaktif, tidak diukur dari semua baris)
         header = self.lib_table.horizontalHeader()
-        header.setSectionResizeMode(0, QHeaderView.Fixed)
-        self.lib_table.setColumnWidth(0, 180) # Lebar kolom preview
-        header.setSectionResizeMode(1, QHeaderView.Stretch)
-        header.setSectionResizeMode(2, QHeaderView.ResizeToContents)
-        header.setSectionResizeMode(3, QHeaderView.ResizeToContents)
+        header.setSectionResizeMode(QHeaderView.Interactive)
+        header.setSectionResizeMode(COL_PREVIEW, QHeaderView.Fixed)
+        self.lib_table.setColumnWidth(COL_PREVIEW, 180) # Lebar kolom preview
+        header.setSectionResizeMode(COL_FILE, QHeaderView.Stretch)
+        self.lib_table.setColumnWidth(COL_TYPE, 140)
+        self.lib_table.setColumnWidth(COL_MODIFIED, 140)
         
+        self.lib_table.setSortingEnabled(True)
+        self.lib_table.sortByColumn(COL_MODIFIED, Qt.DescendingOrder)
         self.lib_table.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.lib_table.setSelectionMode(QAbstractItemView.ExtendedSelection)
         self.lib_table.setEditTriggers(QAbstractItemView.NoEditTriggers)
-        self.lib_table.cellDoubleClicked.connect(self.on_double_click)
+        self.lib_table.doubleClicked.connect(self.on_double_click)
         
         self.layout.addWidget(self.lib_table)
         
+        # Index metadata (sidecar JSON di data/), file lama tidak di-parse ulang
+        os.makedirs("data", exist_ok=True) # Buat jika belum ada
+        self.index = LibraryIndex("data")
+        
+        # Thumbnail dirender di background, hanya untuk baris yang terlihat
+        self.thumbs = ThumbnailService(parent=self)
+        self.thumbs.thumbnail_ready.connect(self.on_thumbnail_ready)
+        self.thumb_scheduler = RenderScheduler(self.load_visible_thumbnails, max_fps=10, parent=self)
+        request_thumbs = lambda *_: self.thumb_scheduler.request_frame()
+        self.lib_table.verticalScrollBar().valueChanged.connect(request_thumbs)
+        self.proxy.layoutChanged.connect(request_thumbs)  # sort / filter
+        self.proxy.rowsInserted.connect(request_thumbs)   # filter dilonggarkan
+        self.proxy.rowsRemoved.connect(request_thumbs)
+        self.proxy.modelReset.connect(request_thumbs)
+        
         # Load data awal
-        self.refresh_library()
+        self.refresh_library(force=True)
+
+    def refresh_library(self, force=False):
+        """Sinkronkan index dengan folder data/ lalu update tabel (hanya jika ada perubahan)"""
+        os.makedirs("data", exist_ok=True)
+        added, updated, removed = self.index.refresh()
+        if force or added or updated or removed:
+            self.populate_table()
 
-    def refresh_library(self):
-        """Scan folder data/ dan update tabel"""
-        self.lib_table.setRowCount(0)
-        if not os.path.exists("data"):
-            os.makedirs("data") # Buat jika belum ada
+    def add_file(self, csv_path):
+        """Index satu file baru (mis. setelah Save) tanpa scan ulang folder"""
+        if os.path.dirname(os.path.abspath(csv_path)) == os.path.abspath(self.index.folder):
+            self.index.update_file(csv_path)
+            self.populate_table()
+        else:
+            self.refresh_library()
+
+    def populate_table(self):
+        """Ganti isi model dengan entry index (tanpa membaca file CSV)"""
+        self.thumbs.cancel_pending()
+        self.model.set_entries(self.index.sorted_entries("mtime"))
+
+    def load_visible_thumbnails(self):
+        """
+        Minta thumbnail hanya untuk baris yang sedang terlihat di viewport.
+        Job lama yang belum mulai dibuang, jadi scroll cepat melewati ribuan
+        baris tidak menumpuk antrian render.
+        """
+        n_rows = self.proxy.rowCount()
+        if not n_rows or not self.isVisible():
+            return
+        first = self.lib_table.rowAt(0)
+        last = self.lib_table.rowAt(self.lib_table.viewport().height() - 1)
+        if first < 0:
             return
-            
-        files = glob.glob("data/*.csv")
-        files.sort(key=os.path.getmtime, reverse=True)
-        
-        for file_path in files:
-            row = self.lib_table.rowCount()
-            self.lib_table.insertRow(row)
-            self.lib_table.setRowHeight(row, 100)
-            
-            filename = os.path.basename(file_path)
-            
-            # 1. Preview (Cari PNG)
-            preview_item = QTableWidgetItem()
-            png_path = file_path.replace(".csv", ".png")
-            if os.path.exists(png_path):
-                icon = QIcon(png_path)
-                preview_item.setIcon(icon)
-                preview_item.setText("")
-            else:
-                preview_item.setText("No Preview")
-                preview_item.setTextAlignment(Qt.AlignCenter)
-            self.lib_table.setItem(row, 0, preview_item)
-            
-            # 2. Filename
-            self.lib_table.setItem(row, 1, QTableWidgetItem(filename))
-            
-            # 3. Last Modified
-            timestamp = os.path.getmtime(file_path)
-            date_str = datetime.fromtimestamp(timestamp).strftime('%Y-%m-%d %H:%M:%S')
-            self.lib_table.setItem(row, 2, QTableWidgetItem(date_str))
-            
-            # 4. Size
-            size_kb = os.path.getsize(file_path) / 1024
-            self.lib_table.setItem(row, 3, QTableWidgetItem(f"{size_kb:.1f} KB"))
-
-    def on_double_click(self, row, col):
+        if last < 0:
+            last = n_rows - 1
+        self.thumbs.cancel_pending()
+        for row in range(first, last + 1):
+            src_row = self.proxy.mapToSource(self.proxy.index(row, COL_FILE)).row()
+            name = self.model.entry(src_row)["name"]
+            if not self.model.has_icon(name):
+                self.thumbs.request(self.index.path_of(name))
+
+    def on_thumbnail_ready(self, csv_path, image):
+        icon = None if image.isNull() else QIcon(QPixmap.fromImage(image))
+        self.model.set_icon(os.path.basename(csv_path), icon)
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        self.thumb_scheduler.request_frame()
+
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        self.thumb_scheduler.request_frame()
+
+    def selected_names(self):
+        """Nama file baris terpilih (urut tampilan)"""
+        rows = sorted(self.lib_table.selectionModel().selectedRows(COL_FILE), key=lambda i: i.row())
+        return [self.model.entry(self.proxy.mapToSource(i).row())["name"] for i in rows]
+
+    def on_double_click(self, index):
         """Buka plot interaktif Gnuplot saat double click"""
-        item = self.lib_table.item(row, 1)
-        if item:
-            filename = item.text()
+        if index.isValid():
+            filename = self.model.entry(self.proxy.mapToSource(index).row())["name"]
             full_path = os.path.join("data", filename)
             self.open_interactive_plot(full_path)
 
     def open_interactive_plot(self, csv_filename):
-        # Generate PNG dulu biar preview update
-        self.generate_png(csv_filename)
-        
         script_interactive = "plot_interactive.plt"
         # Cek lokasi script plt
         if not os.path.exists(script_interactive) and os.path.exists(f"data/{script_interactive}"):
@@ -138,55 +208,78 @@ class LibraryPage(QWidget):
             subprocess.Popen(["gnuplot", "-p", "-c", script_interactive, csv_filename])
         except Exception as e:
             QMessageBox.critical(self, "Error", f"Gagal membuka Gnuplot:\n{str(e)}")
-            
-        self.refresh_library() # Refresh biar preview muncul
 
-    def generate_png(self, csv_filename):
-        """Helper generate PNG di background"""
-        script_png = "plot_config.plt"
-        if not os.path.exists(script_png) and os.path.exists(f"data/{script_png}"):
-             script_png = f"data/{script_png}"
-        
-        png_filename = csv_filename.replace('.csv', '.png')
-        try:
-            subprocess.run(["gnuplot", "-c", script_png, csv_filename, png_filename], check=False)
-        except: pass
 
     def on_upload_click(self):
-        """Upload file terpilih ke Edge Impulse"""
+        """Upload semua file terpilih ke Edge Impulse (antrian di background)"""
         api_key = self.api_key_input.text().strip()
         if not api_key:
             QMessageBox.warning(self, "API Key Missing", "Isi API Key dulu di kolom atas!")
             self.api_key_input.setFocus()
             return
 
-        rows = self.lib_table.selectionModel().selectedRows()
-        if not rows:
+        if self.upload_queue and self.upload_queue.is_busy():
+            QMessageBox.information(self, "Upload", "Upload sebelumnya masih berjalan.")
+            return
+
+        names = self.selected_names()
+        if not names:
             QMessageBox.warning(self, "Warning", "Pilih file di tabel dulu!")
             return
         
-        row_idx = rows[0].row()
-        filename = self.lib_table.item(row_idx, 1).text()
-        csv_full_path = os.path.join("data", filename)
-        
-        # Convert ke JSON (Format EI)
-        json_filename = filename.replace('.csv', '.json')
-        json_full_path = os.path.join("data", json_filename)
-        
-        if not os.path.exists(json_full_path):
+        self.model.clear_upload_status()
+        self._upload_names = {}
+        for filename in names:
+            csv_full_path = os.path.join("data", filename)
             if os.path.exists(csv_full_path):
-                success = FileHandler.convert_csv_to_json(csv_full_path)
-                if not success:
-                    QMessageBox.warning(self, "Error", "Gagal convert CSV ke JSON.")
-                    return
-            else:
-                return
-
-        # Proses Upload
-        label = json_filename.split('_')[0].split('-')[0] # Ambil label dari nama file
-        is_uploaded, msg = FileHandler.upload_to_edge_impulse(json_full_path, api_key, label)
-        
-        if is_uploaded:
-            QMessageBox.information(self, "Success", f"Berhasil Upload!\nFile: {json_filename}\nResponse: {msg}")
+                self._upload_names[csv_full_path] = filename
+                self.model.set_upload_status(filename, "⏳ Antri")
+        if not self._upload_names:
+            return
+
+        if self.upload_queue is None or self.upload_queue.api_key != api_key:
+            if self.upload_queue:
+                self.upload_queue.close()
+            self.upload_queue = UploadQueue(api_key, parent=self)
+            self.upload_queue.file_progress.connect(self.on_upload_progress)
+            self.upload_queue.file_finished.connect(self.on_upload_file_finished)
+            self.upload_queue.all_finished.connect(self.on_upload_all_finished)
+
+        self._upload_percent = {path: 0 for path in self._upload_names}
+        self._upload_errors = []
+        self.upload_btn.setEnabled(False)
+        self.upload_progress.setRange(0, 100 * len(self._upload_names))
+        self.upload_progress.setValue(0)
+        self.upload_progress.setVisible(True)
+        self.upload_status.setText(f"Uploading {len(self._upload_names)} file...")
+        self.upload_queue.submit_all(list(self._upload_names))
+
+    def _set_upload_cell(self, csv_path, text):
+        self.model.set_upload_status(self._upload_names.get(csv_path, os.path.basename(csv_path)), text)
+
+    def on_upload_progress(self, csv_path, percent):
+        self._upload_percent[csv_path] = percent
+        self.upload_progress.setValue(sum(self._upload_percent.values()))
+        self._set_upload_cell(csv_path, f"⬆️ {percent}%")
+
+    def on_upload_file_finished(self, csv_path, ok, msg):
+        self._upload_percent[csv_path] = 100
+        self.upload_progress.setValue(sum(self._upload_percent.values()))
+        self._set_upload_cell(csv_path, "✅ OK" if ok else "❌ Gagal")
+        if not ok:
+            self._upload_errors.append(f"{os.path.basename(csv_path)}: {msg}")
+
+    def on_upload_all_finished(self, n_ok, n_failed):
+        self.upload_btn.setEnabled(True)
+        self.upload_progress.setVisible(False)
+        self.upload_status.setText(f"Upload selesai: {n_ok} berhasil, {n_failed} gagal")
+        if n_failed:
+            QMessageBox.critical(self, "Failed", "Gagal Upload:\n" + "\n".join(self._upload_errors))
         else:
-            QMessageBox.critical(self, "Failed", f"Gagal Upload:\n{msg}")
\ No newline at end of file
+            QMessageBox.information(self, "Success", f"Berhasil Upload {n_ok} file!")
+
+    def shutdown_uploads(self):
+        """Dipanggil saat aplikasi ditutup: batalkan antrian upload (tanpa menunggu) & render thumbnail"""
+        if self.upload_queue:
+            self.upload_queue.close()
+        self.thumbs.shutdown()
@@ -1,10 +1,13 @@
 import numpy as np
 from PySide6.QtWidgets import (
-    QWidget, QVBoxLayout, QLabel, QTableWidget, 
-    QTableWidgetItem, QHeaderView
+    QWidget, QVBoxLayout, QLabel, QTableView, QHeaderView
 )
 from PySide6.QtGui import QFont
-from config.constants import NUM_SENSORS, SENSOR_NAMES
+from config.constants import NUM_SENSORS, SENSOR_NAMES, TABLE_REFRESH_FPS
+from utils.running_stats import RunningStats
+from utils.features import FEATURE_NAMES
+from gui.table_models import StatsTableModel, CycleFeatureModel
+from gui.render_scheduler import RenderScheduler
 
 class StatsPage(QWidget):
     """
@@ -16,67 +19,87 @@ class StatsPage(QWidget):
         self.layout = QVBoxLayout(self)
         self.layout.setContentsMargins(20, 20, 20, 20)
         self.layout.setSpacing(10)
-        
+
+        # Akumulator O(1) per sampel (Welford)
+        self.running = RunningStats(NUM_SENSORS)
+
         # Header
         title = QLabel("📊 Data Statistics")
         title.setFont(QFont("Segoe UI", 12, QFont.Bold))
         self.layout.addWidget(title)
-        
-        # Table
-        self.stats_table = QTableWidget(NUM_SENSORS, 5)
-        self.stats_table.setHorizontalHeaderLabels(["Sensor", "Min", "Max", "Mean", "Std Dev"])
+
+        # Table (Model/View, hanya sel yang berubah yang di-repaint)
+        names = [SENSOR_NAMES[row] if row < len(SENSOR_NAMES) else f"Sensor {row+1}"
+                 for row in range(NUM_SENSORS)]
+        self.stats_model = StatsTableModel(names, parent=self)
+        self.stats_table = QTableView()
+        self.stats_table.setModel(self.stats_model)
         self.stats_table.verticalHeader().setVisible(False)
         self.stats_table.setAlternatingRowColors(True)
-        
+
         # Styling Table
         header = self.stats_table.horizontalHeader()
         header.setSectionResizeMode(0, QHeaderView.Stretch) # Sensor Name wider
         for i in range(1, 5):
             header.setSectionResizeMode(i, QHeaderView.Stretch)
-            
-        self.populate_rows()
+
         self.layout.addWidget(self.stats_table)
 
-    def populate_rows(self):
-        """Isi nama sensor awal"""
-        for row in range(NUM_SENSORS):
-            # Ambil nama sensor
-            name = SENSOR_NAMES[row] if row < len(SENSOR_NAMES) else f"Sensor {row+1}"
-            self.stats_table.setItem(row, 0, QTableWidgetItem(name))
-            
-            # Init values with 0
-            for col in range(1, 5):
-                self.stats_table.setItem(row, col, QTableWidgetItem("0.00"))
+        # Fitur per siklus (diisi saat PURGE tiap level selesai)
+        cycle_title = QLabel("🧪 Cycle Features (ΔR/R0 per level, hover untuk semua fitur)")
+        cycle_title.setFont(QFont("Segoe UI", 11, QFont.Bold))
+        self.layout.addWidget(cycle_title)
+        self.cycle_model = CycleFeatureModel(names, parent=self)
+        self.cycle_table = QTableView()
+        self.cycle_table.setModel(self.cycle_model)
+        self.cycle_table.verticalHeader().setVisible(False)
+        self.cycle_table.setAlternatingRowColors(True)
+        self.cycle_table.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
+        self.layout.addWidget(self.cycle_table)
+
+        # Refresh tabel dibatasi TABLE_REFRESH_FPS
+        self.scheduler = RenderScheduler(self.refresh_table, max_fps=TABLE_REFRESH_FPS, parent=self)
 
-    def update_statistics(self, sampling_data: dict):
+    def add_sample(self, sensor_vals: list):
+        """Update statistik secara inkremental dengan satu sampel baru (O(1))"""
+        self.running.update(sensor_vals[:NUM_SENSORS])
+        self.scheduler.request_frame()
+
+    def add_batch(self, sensor_block: np.ndarray):
+        """Update statistik dengan banyak sampel sekaligus, block (NUM_SENSORS, k)"""
+        self.running.update_batch(sensor_block[:NUM_SENSORS])
+        self.scheduler.request_frame(sensor_block.shape[1])
+
+    def add_cycle(self, cycle: dict):
+        """Tambah satu baris fitur siklus (dict dari utils.features)"""
+        self.cycle_model.add_cycle(cycle, FEATURE_NAMES)
+
+    def update_statistics(self, sensor_data):
         """
-        Hitung statistik dari data yang terkumpul dan update tabel.
-        sampling_data: dict {0: [val1, val2...], 1: [...]}
+        Hitung ulang statistik dari seluruh data (mis. setelah load file).
+        sensor_data: array (NUM_SENSORS, N) seperti SessionBuffer.sensors,
+        atau dict {0: [val1, val2...], 1: [...]}
         """
         # Cek apakah ada data di sensor pertama, jika kosong skip
-        if not sampling_data or not sampling_data[0]:
+        if sensor_data is None or not len(sensor_data) or not len(sensor_data[0]):
+            return
+
+        if not isinstance(sensor_data, np.ndarray):
+            sensor_data = np.array([sensor_data[i] for i in range(NUM_SENSORS)])
+        self.running.reset()
+        self.running.update_batch(sensor_data[:NUM_SENSORS])
+        self.scheduler.request_frame()
+
+    def refresh_table(self):
+        """Tulis nilai akumulator ke model (Kolom 1=Min, 2=Max, 3=Mean, 4=Std)"""
+        if self.running.count == 0:
             return
+        r = self.running
+        self.stats_model.set_values(np.column_stack([r.min, r.max, r.mean, r.std]))
 
-        for sensor_idx, values in sampling_data.items():
-            if not values:
-                continue
-            
-            # Convert ke numpy array biar cepat hitungnya
-            arr = np.array(values)
-            
-            v_min = np.min(arr)
-            v_max = np.max(arr)
-            v_mean = np.mean(arr)
-            v_std = np.std(arr)
-            
-            # Update Table (Kolom 1=Min, 2=Max, 3=Mean, 4=Std)
-            self.stats_table.setItem(sensor_idx, 1, QTableWidgetItem(f"{v_min:.2f}"))
-            self.stats_table.setItem(sensor_idx, 2, QTableWidgetItem(f"{v_max:.2f}"))
-            self.stats_table.setItem(sensor_idx, 3, QTableWidgetItem(f"{v_mean:.2f}"))
-            self.stats_table.setItem(sensor_idx, 4, QTableWidgetItem(f"{v_std:.2f}"))
-            
     def clear_stats(self):
         """Reset nilai ke 0"""
-        for row in range(NUM_SENSORS):
-            for col in range(1, 5):
-                self.stats_table.setItem(row, col, QTableWidgetItem("0.00"))
\ No newline at end of file
+        self.running.reset()
+        self.scheduler.cancel()
+        self.stats_model.clear_values()
+        self.cycle_model.clear()
@@ -0,0 +1,93 @@
+"""Frame-rate-capped render scheduler (coalesces data updates into frames)"""
+
+import time
+from typing import Callable
+from PySide6.QtCore import QObject, QTimer, Qt, Signal
+
+from config.constants import MAX_RENDER_FPS
+
+
+class RenderScheduler(QObject):
+    """
+    Memisahkan redraw dari kedatangan paket.
+
+    Setiap sampel baru cukup memanggil request_frame(); semua permintaan
+    sejak frame terakhir digabung (coalesced) dan render_fn dipanggil paling
+    banyak max_fps kali per detik oleh QTimer. Timer berhenti sendiri saat
+    tidak ada data sehingga tidak ada wakeup saat idle.
+    """
+
+    frame_rendered = Signal(int)  # jumlah update yang digabung dalam frame ini
+
+    def __init__(self, render_fn: Callable[[], None], max_fps: int = MAX_RENDER_FPS, parent=None):
+        super().__init__(parent)
+        self.render_fn = render_fn
+        self._timer = QTimer(self)
+        self._timer.setTimerType(Qt.PreciseTimer)
+        self._timer.timeout.connect(self._on_tick)
+        self.set_max_fps(max_fps)
+
+        self._pending = 0
+        self._last_tick = 0.0
+        self.reset_counters()
+
+    def set_max_fps(self, max_fps: int):
+        """Ubah batas FPS (berlaku segera)"""
+        self.max_fps = max(1, int(max_fps))
+        self.interval_ms = 1000.0 / self.max_fps
+        self._timer.setInterval(max(1, round(self.interval_ms)))
+
+    def reset_counters(self):
+        self.frames_rendered = 0   # frame yang benar-benar digambar
+        self.frames_coalesced = 0  # update yang digabung ke frame lain (redraw dihemat)
+        self.frames_dropped = 0    # deadline frame yang terlewat karena GUI thread sibuk
+        self.last_frame_ms = 0.0   # durasi render_fn terakhir
+
+    def request_frame(self, count: int = 1):
+        """Tandai ada `count` update baru; redraw terjadi di tick berikutnya"""
+        self._pending += count
+        if not self._timer.isActive():
+            self._last_tick = time.perf_counter()
+            self._timer.start()
+
+    def flush(self):
+        """Render segera semua update yang tertunda (mis. saat stop/clear)"""
+        if self._pending:
+            self._render()
+
+    def cancel(self):
+        """Buang update tertunda dan hentikan timer"""
+        self._pending = 0
+        self._timer.stop()
+
+    def _on_tick(self):
+        now = time.perf_counter()
+        elapsed_ms = (now - self._last_tick) * 1000.0
+        self._last_tick = now
+        missed = int(elapsed_ms // self.interval_ms) - 1
+        if missed > 0:
+            self.frames_dropped += missed
+
+        if self._pending:
+            self._render()
+        else:
+            self._timer.stop()
+
+    def _render(self):
+        count = self._pending
+        self._pending = 0
+        t0 = time.perf_counter()
+        self.render_fn()
+        self.last_frame_ms = (time.perf_counter() - t0) * 1000.0
+        self.frames_rendered += 1
+        self.frames_coalesced += count - 1
+        self.frame_rendered.emit(count)
+
+    def stats(self) -> dict:
+        return {
+            'max_fps': self.max_fps,
+            'rendered': self.frames_rendered,
+            'coalesced': self.frames_coalesced,
+            'dropped': self.frames_dropped,
+            'last_frame_ms': self.last_frame_ms,
+        }
@@ -0,0 +1,379 @@
+"""Qt item models (model/view) untuk tabel yang sering di-update"""
+
+import numpy as np
+from datetime import datetime
+from typing import Dict, List
+from PySide6.QtCore import QAbstractTableModel, QModelIndex, QSortFilterProxyModel, Qt
+
+# Kolom tabel Data Library
+COL_PREVIEW, COL_FILE, COL_TYPE, COL_POINTS, COL_DURATION, COL_MODIFIED, COL_SIZE, COL_UPLOAD = range(8)
+
+
+class StatsTableModel(QAbstractTableModel):
+    """
+    Tabel statistik sensor berbasis array NumPy (rows x [Min, Max, Mean, Std]).
+
+    set_values() hanya memformat & memancarkan dataChanged untuk sel yang
+    teks tampilannya benar-benar berubah, sehingga view tidak repaint
+    seluruh tabel dan tidak ada alokasi QTableWidgetItem per update.
+    """
+
+    HEADERS = ["Sensor", "Min", "Max", "Mean", "Std Dev"]
+
+    def __init__(self, row_names: List[str], decimals: int = 2, parent=None):
+        super().__init__(parent)
+        self.row_names = list(row_names)
+        self.decimals = decimals
+        n = len(self.row_names)
+        self._values = np.zeros((n, len(self.HEADERS) - 1))
+        self._text = [[self._fmt(0.0)] * (len(self.HEADERS) - 1) for _ in range(n)]
+
+    def _fmt(self, value: float) -> str:
+        return f"{value:.{self.decimals}f}"
+
+    # --- Qt model API ---
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.row_names)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.HEADERS)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid() or role != Qt.DisplayRole:
+            return None
+        if index.column() == 0:
+            return self.row_names[index.row()]
+        return self._text[index.row()][index.column() - 1]
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role == Qt.DisplayRole and orientation == Qt.Horizontal:
+            return self.HEADERS[section]
+        return None
+
+    # --- Update ---
+    def set_values(self, values: np.ndarray) -> int:
+        """
+        Ganti isi tabel dengan array (rows, 4).
+        Return jumlah sel yang berubah (dan di-emit dataChanged).
+        """
+        new = np.round(np.asarray(values, dtype=np.float64), self.decimals)
+        changed = np.argwhere(new != self._values)
+        self._values = new
+        for r, c in changed:
+            self._text[r][c] = self._fmt(new[r, c])
+            idx = self.index(int(r), int(c) + 1)
+            self.dataChanged.emit(idx, idx, [Qt.DisplayRole])
+        return len(changed)
+
+    def clear_values(self):
+        self.set_values(np.zeros_like(self._values))
+
+
+class CycleFeatureModel(QAbstractTableModel):
+    """
+    Tabel fitur per siklus (satu baris per level HOLD -> PURGE yang selesai):
+    Level, durasi, lalu ΔR/R0 per sensor. Baris hanya ditambahkan
+    (beginInsertRows), tabel lama tidak di-reset.
+    """
+
+    def __init__(self, sensor_names: List[str], parent=None):
+        super().__init__(parent)
+        self.headers = ["Level", "Durasi (s)"] + [f"ΔR/R0 {name.split(' ')[0]}" for name in sensor_names]
+        self._rows: List[List[str]] = []
+        self._tips: List[str] = []
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._rows)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.headers)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        if role == Qt.DisplayRole:
+            return self._rows[index.row()][index.column()]
+        if role == Qt.ToolTipRole:
+            return self._tips[index.row()]
+        return None
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role == Qt.DisplayRole and orientation == Qt.Horizontal:
+            return self.headers[section]
+        return None
+
+    def add_cycle(self, cycle: dict, feature_names: List[str]):
+        level = "-" if cycle["level"] is None else str(cycle["level"] + 1)
+        feats = cycle["features"]
+        row = [level, f"{cycle['end'] - cycle['start']:.1f}"]
+        row += ["-" if np.isnan(v) else f"{v:+.3f}" for v in feats[feature_names.index("delta_r")]]
+        tip = "\n".join(f"{name}: " + ", ".join(f"{v:.3g}" for v in feats[i])
+                         for i, name in enumerate(feature_names))
+        pos = len(self._rows)
+        self.beginInsertRows(QModelIndex(), pos, pos)
+        self._rows.append(row)
+        self._tips.append(tip)
+        self.endInsertRows()
+
+    def clear(self):
+        self.beginResetModel()
+        self._rows, self._tips = [], []
+        self.endResetModel()
+
+
+class DeviceTableModel(QAbstractTableModel):
+    """
+    Tabel ringkasan device (halaman Devices): satu baris per device.
+    set_row() hanya memancarkan dataChanged untuk sel yang teksnya berubah.
+    """
+
+    HEADERS = ["Device", "Address", "Status", "Samples", "Rate (Hz)", "State", "Level"]
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._names: List[str] = []
+        self._rows: List[List[str]] = []
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._rows)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.HEADERS)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid() or role != Qt.DisplayRole:
+            return None
+        return self._rows[index.row()][index.column()]
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role == Qt.DisplayRole and orientation == Qt.Horizontal:
+            return self.HEADERS[section]
+        return None
+
+    def add_device(self, name: str, address: str):
+        pos = len(self._rows)
+        self.beginInsertRows(QModelIndex(), pos, pos)
+        self._names.append(name)
+        self._rows.append([name, address, "Connecting...", "0", "-", "-", "-"])
+        self.endInsertRows()
+
+    def remove_device(self, name: str):
+        row = self.row_of(name)
+        if row < 0:
+            return
+        self.beginRemoveRows(QModelIndex(), row, row)
+        del self._names[row], self._rows[row]
+        self.endRemoveRows()
+
+    def row_of(self, name: str) -> int:
+        return self._names.index(name) if name in self._names else -1
+
+    def name_at(self, row: int) -> str:
+        return self._names[row]
+
+    def set_row(self, name: str, **values):
+        """Update kolom berdasarkan nama header lowercase, mis. set_row(n, status="OK")"""
+        row = self.row_of(name)
+        if row < 0:
+            return
+        for key, text in values.items():
+            col = self._column(key)
+            if self._rows[row][col] != text:
+                self._rows[row][col] = text
+                idx = self.index(row, col)
+                self.dataChanged.emit(idx, idx, [Qt.DisplayRole])
+
+    def _column(self, key: str) -> int:
+        return [h.split(" ")[0].lower() for h in self.HEADERS].index(key)
+
+
+class LibraryTableModel(QAbstractTableModel):
+    """
+    Tabel Data Library di atas entry LibraryIndex (satu dict per file).
+
+    Tidak ada objek per sel: teks diformat saat view meminta data() untuk
+    sel yang terlihat. Sorting dilakukan model sendiri dengan satu
+    list.sort (bukan lessThan per perbandingan di proxy), dan teks
+    pencarian (nama file, nama & tipe sampel, tanggal) dihitung sekali per
+    entry. Ikon preview disimpan per (nama file, mtime) dan diisi dari
+    luar lewat set_icon().
+    """
+
+    HEADERS = ["Preview", "Filename", "Sample Type", "Points", "Duration", "Last Modified", "Size", "Upload"]
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._entries: List[dict] = []
+        self._row_of: Dict[str, int] = {}
+        self._icons: Dict[str, tuple] = {}   # nama -> (mtime, QIcon / None jika gagal)
+        self._upload: Dict[str, str] = {}    # nama -> status upload
+        self._dates: Dict[str, str] = {}
+        self._search: Dict[str, str] = {}    # nama -> teks pencarian (lowercase)
+        self._sort = (COL_MODIFIED, Qt.DescendingOrder)
+
+    # --- Isi ---
+    def set_entries(self, entries: List[dict]):
+        """Ganti semua entry (urutan mengikuti sort aktif)"""
+        self.beginResetModel()
+        self._entries = list(entries)
+        self._dates = {e["name"]: self._date(e) for e in self._entries}
+        self._search = {e["name"]: " ".join((e["name"], e["sample_name"], e["sample_type"],
+                                              self._dates[e["name"]])).lower()
+                        for e in self._entries}
+        self._sort_entries(*self._sort)
+        self.endResetModel()
+
+    def _sort_entries(self, column: int, order):
+        self._entries.sort(key=lambda e: self._sort_key(e, column), reverse=(order == Qt.DescendingOrder))
+        self._row_of = {e["name"]: row for row, e in enumerate(self._entries)}
+
+    def sort(self, column: int, order=Qt.AscendingOrder):
+        if column < 0:
+            return
+        self._sort = (column, order)
+        self.layoutAboutToBeChanged.emit()
+        persistent = self.persistentIndexList()
+        names = [self._entries[i.row()]["name"] for i in persistent]
+        self._sort_entries(column, order)
+        self.changePersistentIndexList(
+            persistent, [self.index(self._row_of[n], i.column()) for n, i in zip(names, persistent)])
+        self.layoutChanged.emit()
+
+    def matches(self, row: int, needle: str) -> bool:
+        """needle harus lowercase"""
+        return not needle or needle in self._search[self._entries[row]["name"]]
+
+    def entry(self, row: int) -> dict:
+        return self._entries[row]
+
+    def row_of(self, name: str) -> int:
+        return self._row_of.get(name, -1)
+
+    def has_icon(self, name: str) -> bool:
+        row = self.row_of(name)
+        cached = self._icons.get(name)
+        return row >= 0 and cached is not None and cached[0] == self._entries[row]["mtime"]
+
+    def set_icon(self, name: str, icon):
+        """icon = None berarti preview gagal dibuat"""
+        row = self.row_of(name)
+        if row < 0:
+            return
+        self._icons[name] = (self._entries[row]["mtime"], icon)
+        idx = self.index(row, COL_PREVIEW)
+        self.dataChanged.emit(idx, idx, [Qt.DecorationRole, Qt.DisplayRole])
+
+    def set_upload_status(self, name: str, text: str):
+        self._upload[name] = text
+        row = self.row_of(name)
+        if row >= 0:
+            idx = self.index(row, COL_UPLOAD)
+            self.dataChanged.emit(idx, idx, [Qt.DisplayRole])
+
+    def clear_upload_status(self):
+        self._upload.clear()
+        if self._entries:
+            self.dataChanged.emit(self.index(0, COL_UPLOAD),
+                                  self.index(len(self._entries) - 1, COL_UPLOAD), [Qt.DisplayRole])
+
+    # --- Qt model API ---
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._entries)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.HEADERS)
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role == Qt.DisplayRole and orientation == Qt.Horizontal:
+            return self.HEADERS[section]
+        return None
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        entry = self._entries[index.row()]
+        col = index.column()
+
+        if role == Qt.DisplayRole:
+            return self._display(entry, col)
+        if role == Qt.DecorationRole and col == COL_PREVIEW:
+            cached = self._icons.get(entry["name"])
+            if cached and cached[0] == entry["mtime"]:
+                return cached[1]
+            return None
+        if role == Qt.TextAlignmentRole and col == COL_PREVIEW:
+            return Qt.AlignCenter
+        if role == Qt.ToolTipRole and col == COL_FILE:
+            return self.entry_tooltip(entry)
+        return None
+
+    @staticmethod
+    def _date(entry: dict) -> str:
+        return datetime.fromtimestamp(entry["mtime"] / 1e9).strftime('%Y-%m-%d %H:%M:%S')
+
+    def _display(self, entry: dict, col: int):
+        if col == COL_PREVIEW:
+            cached = self._icons.get(entry["name"])
+            if cached and cached[0] == entry["mtime"]:
+                return "" if cached[1] is not None else "No Preview"
+            return "Loading..."
+        if col == COL_FILE:
+            return entry["name"]
+        if col == COL_TYPE:
+            return entry["sample_type"]
+        if col == COL_POINTS:
+            return str(entry["points"])
+        if col == COL_DURATION:
+            return f"{entry['duration']:.1f} s"
+        if col == COL_MODIFIED:
+            return self._dates.get(entry["name"]) or self._date(entry)
+        if col == COL_SIZE:
+            return f"{entry['size'] / 1024:.1f} KB"
+        if col == COL_UPLOAD:
+            return self._upload.get(entry["name"], "")
+        return None
+
+    def _sort_key(self, entry: dict, col: int):
+        if col == COL_POINTS:
+            return entry["points"]
+        if col == COL_DURATION:
+            return entry["duration"]
+        if col in (COL_PREVIEW, COL_MODIFIED):
+            return entry["mtime"]
+        if col == COL_SIZE:
+            return entry["size"]
+        return self._display(entry, col)
+
+    @staticmethod
+    def entry_tooltip(entry: dict) -> str:
+        if entry.get("error"):
+            return f"Gagal dibaca: {entry['error']}"
+        lines = [f"Sample: {entry['sample_name']} ({entry['sample_type']})"]
+        stats = entry.get("stats")
+        if stats:
+            for i, name in enumerate(entry["sensor_names"]):
+                lines.append(f"{name}: mean {stats['mean'][i]:.2f}, "
+                             f"min {stats['min'][i]:.2f}, max {stats['max'][i]:.2f}")
+        return "\n".join(lines)
+
+
+class LibraryProxyModel(QSortFilterProxyModel):
+    """
+    Proxy pencarian untuk LibraryTableModel. Filter memakai teks pencarian
+    yang sudah dihitung model; sort diteruskan ke source model sehingga
+    proxy hanya memetakan baris yang lolos filter.
+    """
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._needle = ""
+
+    def set_search(self, text: str):
+        self._needle = text.strip().lower()
+        self.invalidateFilter()
+
+    def sort(self, column: int, order=Qt.AscendingOrder):
+        self.sourceModel().sort(column, order)
+
+    def filterAcceptsRow(self, source_row, source_parent):
+        return self.sourceModel().matches(source_row, self._needle)
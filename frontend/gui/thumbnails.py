@@ -0,0 +1,119 @@
+"""Background thumbnail service for the Data Library (QThreadPool + disk cache)"""
+
+import glob
+import hashlib
+import os
+import tempfile
+from PySide6.QtCore import QObject, QRunnable, QThreadPool, Signal
+from PySide6.QtGui import QImage
+
+from config.constants import THUMB_WIDTH, THUMB_HEIGHT, THUMB_WORKERS, THUMB_CACHE_DIR
+from utils.session_reader import SessionReader
+from utils.thumbnail_raster import render_thumbnail
+
+
+class _ThumbnailTask(QRunnable):
+    """Satu job: ambil dari cache disk atau render CSV -> PNG"""
+
+    def __init__(self, service, csv_path: str):
+        super().__init__()
+        # Dimiliki ThumbnailService._tasks (dibutuhkan pool.tryTake)
+        self.setAutoDelete(False)
+        self.service = service
+        self.csv_path = csv_path
+
+    def run(self):
+        image = QImage()
+        try:
+            image = self.service.load_or_render(self.csv_path)
+        except Exception as e:
+            print(f"Thumbnail gagal ({os.path.basename(self.csv_path)}): {e}")
+        self.service.thumbnail_ready.emit(self.csv_path, image)
+
+
+class ThumbnailService(QObject):
+    """
+    Membuat preview PNG dari data CSV tanpa gnuplot.
+
+    Render (rasterizer NumPy -> QImage) dan baca/tulis cache berjalan di
+    QThreadPool sendiri, bukan di GUI thread. Cache disimpan di
+    THUMB_CACHE_DIR dengan nama dari hash path + mtime + size, jadi file
+    yang berubah otomatis dirender ulang. Permintaan ganda untuk file yang
+    sedang diproses diabaikan.
+    """
+
+    thumbnail_ready = Signal(str, QImage)  # (path CSV, gambar; null jika gagal)
+
+    def __init__(self, cache_dir: str = THUMB_CACHE_DIR, width: int = THUMB_WIDTH,
+                 height: int = THUMB_HEIGHT, max_workers: int = THUMB_WORKERS, parent=None):
+        super().__init__(parent)
+        self.cache_dir = cache_dir
+        self.width = width
+        self.height = height
+        self.pool = QThreadPool(self)
+        self.pool.setMaxThreadCount(max_workers)
+        # path -> task yang antre / sedang jalan; hanya diubah di GUI thread
+        self._tasks = {}
+        # Terhubung pertama: entri sudah dibuang sebelum slot penerima lain jalan
+        self.thumbnail_ready.connect(self._on_ready)
+        os.makedirs(cache_dir, exist_ok=True)
+
+    # --- GUI thread ---
+    def request(self, csv_path: str):
+        """Minta thumbnail (non-blocking); hasil lewat signal thumbnail_ready"""
+        if csv_path in self._tasks:
+            return
+        task = _ThumbnailTask(self, csv_path)
+        self._tasks[csv_path] = task
+        self.pool.start(task)
+
+    def cancel_pending(self):
+        """Buang job yang belum mulai (mis. saat tabel di-refresh); job yang sedang jalan tetap tercatat"""
+        for path, task in list(self._tasks.items()):
+            if self.pool.tryTake(task):
+                del self._tasks[path]
+
+    def _on_ready(self, csv_path: str, _image):
+        self._tasks.pop(csv_path, None)
+
+    def shutdown(self):
+        self.pool.clear()
+        self.pool.waitForDone()
+
+    # --- Thread worker ---
+    def _file_prefix(self, csv_path: str) -> str:
+        return hashlib.sha1(os.path.abspath(csv_path).encode('utf-8')).hexdigest()[:16]
+
+    def cache_path(self, csv_path: str) -> str:
+        st = os.stat(csv_path)
+        version = hashlib.sha1(f"{st.st_mtime_ns}|{st.st_size}|{self.width}x{self.height}"
+                               .encode('utf-8')).hexdigest()[:12]
+        return os.path.join(self.cache_dir, f"{self._file_prefix(csv_path)}_{version}.png")
+
+    def load_or_render(self, csv_path: str) -> QImage:
+        cached = self.cache_path(csv_path)
+        if os.path.exists(cached):
+            image = QImage(cached)
+            if not image.isNull():
+                return image
+
+        times, sensors, _, _ = SessionReader(csv_path).read_arrays()
+        rgb = render_thumbnail(times, sensors, self.width, self.height)
+        h, w, _ = rgb.shape
+        # copy(): QImage tidak memiliki buffer NumPy
+        image = QImage(rgb.data, w, h, 3 * w, QImage.Format_RGB888).copy()
+
+        # Hapus versi lama file ini, lalu tulis atomic
+        for old in glob.glob(os.path.join(self.cache_dir, self._file_prefix(csv_path) + "_*.png")):
+            try: os.remove(old)
+            except OSError: pass
+        # Nama temp unik per penulis agar os.replace tidak saling balapan
+        fd, tmp = tempfile.mkstemp(dir=self.cache_dir, suffix=".png.tmp")
+        os.close(fd)
+        try:
+            if image.save(tmp, "PNG"):
+                os.replace(tmp, cached)
+        finally:
+            if os.path.exists(tmp):
+                os.remove(tmp)
+        return image
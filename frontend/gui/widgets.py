@@ -1,5 +1,6 @@
 """Custom widgets for the application (Floral Theme Compatible 🌸) - FIXED"""
 
+import os
 import serial.tools.list_ports
 import pyqtgraph as pg
 import numpy as np
@@ -14,8 +15,11 @@ from PySide6.QtGui import QColor, QFont, QPainter, QBrush, QPixmap
 
 from config.constants import (
     SAMPLE_TYPES, PLOT_COLORS, NUM_SENSORS, SENSOR_NAMES, MAX_PLOT_POINTS,
-    DEFAULT_HOST, CMD_PORT, STATUS_COLORS
+    DEFAULT_HOST, CMD_PORT, STATUS_COLORS, PLOT_LOD, PLOT_LOD_FACTOR, REPLAY_SPEEDS
 )
+from gui.resources import DataSource
+from utils.decimation import minmax_envelope, visible_slice
+from utils.ring_buffer import RingBuffer
 
 class StatusDot(QWidget):
     """Titik status berwarna"""
@@ -55,7 +59,17 @@ class StatusIndicator(QFrame):
         self.dot.set_color(QColor(color_hex))
 
 class SensorPlot(pg.PlotWidget):
-    """Widget Grafik dengan Buffer Data Internal"""
+    """
+    Widget Grafik dengan Buffer Data Internal.
+    Kurva yang lebih panjang dari ~PLOT_LOD_FACTOR x lebar plot (piksel)
+    digambar dari envelope min/max (utils.decimation); saat di-zoom, hanya
+    sampel di rentang X yang terlihat yang dipakai, dengan resolusi penuh
+    jika muat.
+    """
+
+    # Rentang X diubah user (zoom/pan) atau ukuran plot berubah -> perlu redraw
+    lod_invalidated = Signal()
+
     def __init__(self, title: str = "Sensor Data", parent=None):
         super().__init__(parent)
         self.setTitle(title, color='#5D4037', size='12pt')
@@ -71,8 +85,16 @@ class SensorPlot(pg.PlotWidget):
         self.max_points = MAX_PLOT_POINTS
         
         # --- INTERNAL DATA BUFFER ---
-        self.time_data = np.array([])
-        self.sensor_data = {i: np.array([]) for i in range(self.num_sensors)}
+        # Baris 0 = waktu, baris 1..N = sensor (satu array kontigu)
+        self.buffer = RingBuffer(self.num_sensors + 1, self.max_points)
+        self._row = np.zeros(self.num_sensors + 1)
+        # Sumber data eksternal (mis. SessionBuffer) -> buffer internal tidak dipakai
+        self.source = None
+        
+        # Level of detail
+        self.lod_enabled = PLOT_LOD
+        self.lod_factor = PLOT_LOD_FACTOR
+        self.getViewBox().sigXRangeChanged.connect(self._on_x_range_changed)
         
         self.plot_lines = {}
         self.addLegend()
@@ -83,30 +105,69 @@ class SensorPlot(pg.PlotWidget):
             name = SENSOR_NAMES[i] if i < len(SENSOR_NAMES) else f"S{i+1}"
             self.plot_lines[i] = self.plot([], [], pen=pen, name=name)
     
+    def set_source(self, source):
+        """Gambar langsung dari objek dengan tail(n) -> (times, sensors), tanpa salinan"""
+        self.source = source
+        self.buffer.clear()
+
     def add_data_point(self, time_val: float, sensor_vals: list):
         """Menerima satu titik data, menambahkannya ke buffer, lalu update plot"""
-        # 1. Append Data Baru
-        self.time_data = np.append(self.time_data, time_val)
-        
-        for i in range(self.num_sensors):
-            val = sensor_vals[i] if i < len(sensor_vals) else 0.0
-            self.sensor_data[i] = np.append(self.sensor_data[i], val)
-        
-        # 2. Rolling Buffer (Hapus data lama jika melebihi batas)
-        if len(self.time_data) > self.max_points:
-            self.time_data = self.time_data[-self.max_points:]
-            for i in range(self.num_sensors):
-                self.sensor_data[i] = self.sensor_data[i][-self.max_points:]
+        self.push_data_point(time_val, sensor_vals)
+        self.refresh_curves()
+
+    def push_data_point(self, time_val: float, sensor_vals: list):
+        """Append ke buffer saja (O(1)), redraw diserahkan ke render scheduler"""
+        vals = sensor_vals[:self.num_sensors]
+        self._row[:] = 0.0
+        self._row[0] = time_val
+        self._row[1:1 + len(vals)] = vals
+        self.buffer.append(self._row)
+
+    def current_view(self):
+        """(times, sensors) untuk maksimal max_points sampel terakhir"""
+        if self.source is not None:
+            return self.source.tail(self.max_points)
+        data = self.buffer.view()
+        return data[0], data[1:]
 
-        # 3. Update Grafik
+    def _on_x_range_changed(self, *_):
+        # Saat auto-range, perubahan rentang berasal dari data baru (sudah digambar)
+        if not self.getViewBox().state['autoRange'][0]:
+            self.lod_invalidated.emit()
+
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        self.lod_invalidated.emit()
+
+    def level_of_detail(self, times, sensors):
+        """
+        Pilih sampel yang digambar: potong ke rentang X yang terlihat (jika
+        user sedang zoom/pan) lalu decimation min/max ke lebar piksel plot.
+        Return (xs, ys); xs berbentuk (N,) atau (num_sensors, M).
+        """
+        vb = self.getViewBox()
+        if not vb.state['autoRange'][0] and len(times):
+            x_min, x_max = vb.viewRange()[0]
+            sl = visible_slice(times, x_min, x_max)
+            times, sensors = times[sl], sensors[:, sl]
+        width_px = max(int(vb.width()), 1)
+        if len(times) <= self.lod_factor * width_px:
+            return times, sensors
+        return minmax_envelope(times, sensors, width_px * self.lod_factor // 2)
+
+    def refresh_curves(self):
+        """Kirim view buffer (tanpa copy, atau envelope jika panjang) ke setiap kurva"""
+        times, sensors = self.current_view()
+        if self.lod_enabled:
+            times, sensors = self.level_of_detail(times, sensors)
         for i in range(self.num_sensors):
-            self.plot_lines[i].setData(self.time_data, self.sensor_data[i])
+            x = times if times.ndim == 1 else times[i]
+            self.plot_lines[i].setData(x, sensors[i])
     
     def clear_data(self):
-        """Reset grafik"""
-        self.time_data = np.array([])
+        """Reset grafik (data sumber eksternal dikosongkan oleh pemiliknya)"""
+        self.buffer.clear()
         for i in range(self.num_sensors):
-            self.sensor_data[i] = np.array([])
             self.plot_lines[i].setData([], [])
 
 class ControlPanel(QGroupBox):
@@ -175,14 +236,31 @@ class ConnectionPanel(QGroupBox):
     
     def init_ui(self):
         layout = QGridLayout()
+
+        # Sumber data: bridge Rust (Arduino), simulasi sintetis, atau replay CSV
+        layout.addWidget(QLabel("Source:"), 0, 0)
+        src_lay = QHBoxLayout()
+        self.source_selector = QComboBox()
+        for src in DataSource:
+            self.source_selector.addItem(src.value, src)
+        self.source_selector.currentIndexChanged.connect(self.on_source_changed)
+        src_lay.addWidget(self.source_selector)
+        self.replay_file = QComboBox()
+        self.replay_file.setToolTip("Rekaman di folder data/ yang diputar ulang")
+        src_lay.addWidget(self.replay_file, 1)
+        self.speed_selector = QComboBox()
+        for label, speed in REPLAY_SPEEDS.items():
+            self.speed_selector.addItem(label, speed)
+        src_lay.addWidget(self.speed_selector)
+        layout.addLayout(src_lay, 0, 1)
         
         # IP Input
-        layout.addWidget(QLabel("Backend IP:"), 0, 0)
+        layout.addWidget(QLabel("Backend IP:"), 1, 0)
         self.ip_input = QLineEdit(DEFAULT_HOST)
-        layout.addWidget(self.ip_input, 0, 1)
+        layout.addWidget(self.ip_input, 1, 1)
         
         # Port Selector (COM)
-        layout.addWidget(QLabel("Arduino Port:"), 1, 0)
+        layout.addWidget(QLabel("Arduino Port:"), 2, 0)
         h_lay = QHBoxLayout()
         self.port_selector = QComboBox()
         self.refresh_ports()
@@ -192,17 +270,42 @@ class ConnectionPanel(QGroupBox):
         ref_btn.setFixedWidth(30)
         ref_btn.clicked.connect(self.refresh_ports)
         h_lay.addWidget(ref_btn)
-        layout.addLayout(h_lay, 1, 1)
+        layout.addLayout(h_lay, 2, 1)
         
         # Status & Connect Button
         self.status_indicator = StatusIndicator()
-        layout.addWidget(self.status_indicator, 2, 0)
+        layout.addWidget(self.status_indicator, 3, 0)
         
         self.connect_btn = QPushButton("✨ Connect Bridge")
         self.connect_btn.clicked.connect(self.connect_clicked.emit)
-        layout.addWidget(self.connect_btn, 2, 1)
+        layout.addWidget(self.connect_btn, 3, 1)
         
         self.setLayout(layout)
+        self.on_source_changed()
+
+    def source(self) -> DataSource:
+        return self.source_selector.currentData()
+
+    def on_source_changed(self, *_):
+        """Tampilkan input yang relevan untuk sumber data terpilih"""
+        src = self.source()
+        self.ip_input.setEnabled(src == DataSource.SERIAL)
+        self.port_selector.setEnabled(src == DataSource.SERIAL)
+        self.replay_file.setVisible(src == DataSource.FILE)
+        self.speed_selector.setVisible(src != DataSource.SERIAL)
+        if src == DataSource.FILE:
+            self.refresh_replay_files()
+
+    def refresh_replay_files(self, folder: str = "data"):
+        current = self.replay_file.currentText()
+        self.replay_file.clear()
+        try:
+            names = sorted(n for n in os.listdir(folder) if n.endswith(".csv"))
+        except OSError:
+            names = []
+        self.replay_file.addItems(names)
+        if current in names:
+            self.replay_file.setCurrentText(current)
         
     def refresh_ports(self):
         self.port_selector.clear()
@@ -216,7 +319,10 @@ class ConnectionPanel(QGroupBox):
     def get_connection_settings(self):
         return {
             'host': self.ip_input.text(),
-            'serial_port': self.port_selector.currentText()
+            'serial_port': self.port_selector.currentText(),
+            'source': self.source(),
+            'replay_file': os.path.join("data", self.replay_file.currentText()),
+            'speed': self.speed_selector.currentData(),
         }
     
     def set_status(self, text, color):
@@ -0,0 +1,7 @@
+"""Pytest setup: jalankan dari folder frontend (python -m pytest), Qt tanpa layar"""
+
+import os
+import sys
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
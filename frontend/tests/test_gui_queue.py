@@ -0,0 +1,170 @@
+"""Akuntansi GuiChannel (utils.gui_queue) untuk policy block / drop_oldest / coalesce"""
+
+import threading
+import time
+
+import numpy as np
+import pytest
+from PySide6.QtCore import QCoreApplication
+
+from utils.gui_queue import GuiChannel, POLICY_BLOCK, POLICY_DROP_OLDEST, POLICY_COALESCE
+from utils.net_loop import NetworkLoop
+from utils.stream_protocol import SAMPLE_DTYPE
+
+
+@pytest.fixture(scope="module")
+def app():
+    return QCoreApplication.instance() or QCoreApplication([])
+
+
+def batch(start: int, n: int = 4) -> np.ndarray:
+    records = np.zeros(n, dtype=SAMPLE_DTYPE)
+    records['timestamp'] = np.arange(start, start + n)
+    return records
+
+
+def make_channel(policy, maxsize, net=None):
+    channel = GuiChannel(net, maxsize, policy)
+    got = []
+    channel.delivered.connect(lambda payload, extra: got.append((payload, extra)))
+    return channel, got
+
+
+def drain(app, channel, timeout=2.0):
+    """Jalankan event loop GUI sampai antrian kosong"""
+    deadline = time.perf_counter() + timeout
+    while channel.depth and time.perf_counter() < deadline:
+        app.processEvents()
+    app.processEvents()
+    assert channel.depth == 0
+
+
+def test_unknown_policy_rejected():
+    with pytest.raises(ValueError):
+        GuiChannel(None, 2, "newest")
+
+
+def test_block_refuses_when_full_and_resumes_after_drain(app):
+    channel, got = make_channel(POLICY_BLOCK, 2)
+    assert channel.offer(batch(0), 0)
+    assert channel.offer(batch(4), 1)
+    assert not channel.offer(batch(8), 2)
+    assert channel.depth == 2 and channel.high_water == 2
+
+    # Pengirim thread biasa menunggu sampai GUI mengambil item
+    done = []
+    producer = threading.Thread(target=lambda: done.append(channel.put_sync(batch(8), 2, timeout=5.0)))
+    producer.start()
+    time.sleep(0.05)
+    assert not done
+    deadline = time.perf_counter() + 5.0
+    while producer.is_alive() and time.perf_counter() < deadline:
+        app.processEvents()
+    producer.join(1.0)
+    drain(app, channel)
+
+    assert done == [True]
+    assert [extra for _, extra in got] == [0, 1, 2]
+    assert np.array_equal(np.concatenate([p['timestamp'] for p, _ in got]), np.arange(12))
+    stats = channel.stats()
+    assert stats["delivered"] == 3 and stats["dropped"] == 0 and stats["high_water"] == 2
+
+
+def test_block_put_sync_times_out_without_enqueueing(app):
+    channel, got = make_channel(POLICY_BLOCK, 1)
+    assert channel.put_sync(batch(0), 0, timeout=0.1)
+    assert not channel.put_sync(batch(4), 1, timeout=0.05)
+    drain(app, channel)
+    assert [extra for _, extra in got] == [0]
+
+
+def test_block_async_put_resumes_after_drain(app):
+    net = NetworkLoop.instance()
+    channel, got = make_channel(POLICY_BLOCK, 1, net)
+
+    async def produce():
+        for i in range(3):
+            await channel.put(batch(4 * i), i)
+
+    future = net.submit(produce())
+    time.sleep(0.05)
+    assert not future.done() and channel.depth == 1
+    deadline = time.perf_counter() + 5.0
+    while not future.done() and time.perf_counter() < deadline:
+        app.processEvents()
+    future.result(timeout=1.0)
+    drain(app, channel)
+    assert [extra for _, extra in got] == [0, 1, 2]
+    assert channel.high_water == 1
+
+
+def test_drop_oldest_counts_samples_and_keeps_in_flight_item(app):
+    channel, got = make_channel(POLICY_DROP_OLDEST, 2)
+    offered = [batch(0, 5)]
+
+    def on_first(payload, extra):
+        # Pengirim terus jalan selama GUI masih memproses item pertama
+        if extra == 0:
+            for i in range(1, 4):
+                offered.append(batch(10 * i, 3))
+                channel.offer(offered[-1], i)
+            assert channel.depth == 2  # 1 in-flight + 1 antre
+
+    channel.delivered.connect(on_first)
+    channel.offer(offered[0], 0)
+    drain(app, channel)
+
+    # Item in-flight (0) utuh, item antre tertua (1, 2) dibuang, terbaru (3) sampai
+    assert [extra for _, extra in got] == [0, 3]
+    assert np.array_equal(got[0][0], offered[0])
+    stats = channel.stats()
+    assert stats["dropped"] == 2 and stats["dropped_samples"] == 6
+    delivered_samples = sum(len(p) for p, _ in got)
+    assert delivered_samples + stats["dropped_samples"] == sum(len(b) for b in offered)
+
+
+def test_drop_oldest_never_drops_in_flight_item(app):
+    channel, got = make_channel(POLICY_DROP_OLDEST, 1)
+
+    def on_first(payload, extra):
+        if extra == 0:
+            channel.offer(batch(4), 1)  # penuh, tetapi yang antre hanya item in-flight
+
+    channel.delivered.connect(on_first)
+    channel.offer(batch(0), 0)
+    drain(app, channel)
+    assert [extra for _, extra in got] == [0, 1]
+    assert channel.dropped == 0 and channel.dropped_samples == 0
+
+
+def test_coalesce_delivers_every_sample(app):
+    channel, got = make_channel(POLICY_COALESCE, 4)
+    for i in range(10):
+        channel.offer(batch(4 * i), i)
+    assert channel.depth == 1
+    drain(app, channel)
+
+    assert len(got) == 1
+    payload, extra = got[0]
+    assert extra == 0  # extra item tertua (first_arrival)
+    assert np.array_equal(payload['timestamp'], np.arange(40))
+    assert channel.coalesced == 9 and channel.dropped == 0
+
+
+def test_coalesce_merges_device_dicts(app):
+    channel, got = make_channel(POLICY_COALESCE, 4)
+    sent = {"nose-1": [], "nose-2": []}
+    for i in range(6):
+        payload = {"nose-1": batch(4 * i)}
+        if i % 2:
+            payload["nose-2"] = batch(100 + 2 * i, 2)
+        for name, records in payload.items():
+            sent[name].append(records)
+        channel.offer(payload, i)
+    drain(app, channel)
+
+    assert len(got) == 1
+    merged = got[0][0]
+    assert set(merged) == {"nose-1", "nose-2"}
+    for name, parts in sent.items():
+        assert np.array_equal(merged[name], np.concatenate(parts))
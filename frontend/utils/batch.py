@@ -0,0 +1,202 @@
+"""
+Headless batch feature extraction over a folder of session CSVs.
+
+Jalankan dari folder frontend (tanpa Qt / PySide6):
+    python -m utils.batch [folder] [-o features.csv|.npz|.parquet] [-j N] [--force]
+
+Setiap file CSV di-parse (SessionReader) dan dipecah per siklus FSM
+(utils.features) di ProcessPoolExecutor. Hasil per file di-cache dalam
+sidecar JSON (<folder>/.feature_cache.json) dengan key nama + mtime + size,
+jadi run berikutnya hanya memproses file yang baru atau berubah. Output
+berupa satu tabel: satu baris per siklus.
+"""
+
+import argparse
+import csv
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+from utils.features import FEATURE_NAMES, extract_cycles, feature_columns, feature_vector
+from utils.session_reader import SessionReader
+
+CACHE_FILENAME = ".feature_cache.json"
+# Naikkan jika definisi fitur berubah agar cache lama diabaikan
+CACHE_VERSION = 2
+META_FIELDS = ["file", "sample_name", "sample_type", "level", "start", "end"]
+
+
+def process_file(path: str) -> dict:
+    """
+    Worker (proses terpisah): fitur semua siklus satu file.
+    Return dict kecil yang bisa di-pickle & disimpan ke JSON.
+    """
+    result = {"sensor_names": [], "sample_name": "Unknown", "sample_type": "Unknown",
+              "cycles": [], "error": None}
+    try:
+        reader = SessionReader(path)
+        times, sensors, states, levels = reader.read_arrays()
+        cycles = extract_cycles(times, sensors, states, levels)
+    except Exception as e:
+        result["error"] = str(e)
+        return result
+    result.update(
+        sensor_names=reader.sensor_names,
+        sample_name=reader.sample_name,
+        sample_type=reader.sample_type,
+        cycles=[{"level": c["level"], "start": c["start"], "end": c["end"],
+                 "values": feature_vector(c).tolist()} for c in cycles],
+    )
+    return result
+
+
+class FeatureCache:
+    """Hasil process_file per nama file, valid selama mtime & size sama"""
+
+    def __init__(self, folder: str):
+        self.path = os.path.join(folder, CACHE_FILENAME)
+        self.entries: Dict[str, dict] = {}
+        try:
+            with open(self.path, 'r') as f:
+                doc = json.load(f)
+            if doc.get("version") == CACHE_VERSION:
+                self.entries = doc.get("entries", {})
+        except (OSError, ValueError):
+            pass
+
+    def is_fresh(self, name: str, st: os.stat_result) -> bool:
+        cached = self.entries.get(name)
+        return bool(cached) and cached["mtime"] == st.st_mtime_ns and cached["size"] == st.st_size
+
+    def put(self, name: str, st: os.stat_result, result: dict):
+        self.entries[name] = dict(result, mtime=st.st_mtime_ns, size=st.st_size)
+
+    def prune(self, names) -> int:
+        removed = [n for n in self.entries if n not in names]
+        for n in removed:
+            del self.entries[n]
+        return len(removed)
+
+    def save(self):
+        tmp = self.path + ".tmp"
+        with open(tmp, 'w') as f:
+            json.dump({"version": CACHE_VERSION, "entries": self.entries}, f, separators=(',', ':'))
+        os.replace(tmp, self.path)
+
+
+def scan(folder: str, exclude=()) -> Dict[str, os.stat_result]:
+    """Nama file CSV -> stat, satu os.scandir (exclude: path yang dilewati, mis. output)"""
+    exclude = {os.path.abspath(p) for p in exclude}
+    files = {}
+    with os.scandir(folder) as it:
+        for entry in it:
+            if entry.name.endswith(".csv") and entry.is_file() and os.path.abspath(entry.path) not in exclude:
+                files[entry.name] = entry.stat()
+    return files
+
+
+def update_cache(folder: str, cache: FeatureCache, workers: int = None,
+                 force: bool = False, exclude=(), log=print) -> Tuple[int, int]:
+    """Proses file baru/berubah secara paralel. Return (diproses, dilewati)"""
+    files = scan(folder, exclude)
+    cache.prune(files)
+    todo = sorted(n for n, st in files.items() if force or not cache.is_fresh(n, st))
+    if todo:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = {pool.submit(process_file, os.path.join(folder, n)): n for n in todo}
+            for i, fut in enumerate(as_completed(futures), 1):
+                name = futures[fut]
+                result = fut.result()
+                cache.put(name, files[name], result)
+                status = f"ERROR: {result['error']}" if result["error"] else f"{len(result['cycles'])} siklus"
+                log(f"[{i}/{len(todo)}] {name}: {status}")
+    return len(todo), len(files) - len(todo)
+
+
+def build_table(cache: FeatureCache) -> Tuple[List[list], np.ndarray, List[str]]:
+    """
+    Gabungkan cache menjadi (meta rows, X (n_siklus, n_fitur), nama kolom fitur).
+    Kolom mengikuti sensor file pertama; file dengan sensor berbeda dilewati.
+    """
+    meta, rows, sensor_names = [], [], None
+    for name in sorted(cache.entries):
+        entry = cache.entries[name]
+        if entry["error"] or not entry["cycles"]:
+            continue
+        if sensor_names is None:
+            sensor_names = entry["sensor_names"]
+        elif entry["sensor_names"] != sensor_names:
+            print(f"Lewati {name}: kolom sensor berbeda", file=sys.stderr)
+            continue
+        for c in entry["cycles"]:
+            meta.append([name, entry["sample_name"], entry["sample_type"],
+                         -1 if c["level"] is None else c["level"], c["start"], c["end"]])
+            rows.append(c["values"])
+    columns = feature_columns(sensor_names or [], FEATURE_NAMES)
+    X = np.array(rows, dtype=np.float64).reshape(len(rows), len(columns))
+    return meta, X, columns
+
+
+def write_table(output: str, meta: List[list], X: np.ndarray, columns: List[str]):
+    """Tulis tabel fitur; format dari ekstensi (.csv, .npz, .parquet)"""
+    ext = os.path.splitext(output)[1].lower()
+    tmp = output + ".tmp" + ext
+    if ext == ".npz":
+        cols = list(zip(*meta)) if meta else [[]] * len(META_FIELDS)
+        np.savez_compressed(
+            tmp, X=X, columns=np.array(columns),
+            filename=np.array(cols[0], dtype=str), sample_name=np.array(cols[1], dtype=str),
+            sample_type=np.array(cols[2], dtype=str), level=np.array(cols[3], dtype=np.int64),
+            start=np.array(cols[4], dtype=np.float64), end=np.array(cols[5], dtype=np.float64),
+        )
+    elif ext == ".parquet":
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise SystemExit("Output .parquet butuh pyarrow (pip install pyarrow)")
+        table = {field: [m[i] for m in meta] for i, field in enumerate(META_FIELDS)}
+        table.update({col: X[:, j] for j, col in enumerate(columns)})
+        pq.write_table(pa.table(table), tmp)
+    else:
+        with open(tmp, 'w', newline='') as f:
+            writer = csv.writer(f)
+            writer.writerow(META_FIELDS + columns)
+            for m, x in zip(meta, X):
+                writer.writerow([m[0], m[1], m[2], m[3], f"{m[4]:.3f}", f"{m[5]:.3f}"]
+                                + ["" if np.isnan(v) else f"{v:.6g}" for v in x])
+    os.replace(tmp, output)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m utils.batch",
+                                     description="Ekstraksi fitur per siklus untuk semua CSV sesi (tanpa GUI)")
+    parser.add_argument("folder", nargs="?", default="data", help="folder CSV sesi (default: data)")
+    parser.add_argument("-o", "--output", default=None,
+                        help="file output .csv / .npz / .parquet (default: features.csv)")
+    parser.add_argument("-j", "--jobs", type=int, default=None, help="jumlah proses (default: jumlah CPU)")
+    parser.add_argument("--force", action="store_true", help="abaikan cache, proses ulang semua file")
+    args = parser.parse_args(argv)
+
+    if not os.path.isdir(args.folder):
+        parser.error(f"folder tidak ditemukan: {args.folder}")
+    output = args.output or "features.csv"
+
+    t0 = time.perf_counter()
+    cache = FeatureCache(args.folder)
+    done, skipped = update_cache(args.folder, cache, args.jobs, args.force, exclude=[output])
+    cache.save()
+    meta, X, columns = build_table(cache)
+    write_table(output, meta, X, columns)
+    print(f"{done} file diproses, {skipped} dari cache; {len(meta)} siklus -> {output} "
+          f"({time.perf_counter() - t0:.2f} s)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
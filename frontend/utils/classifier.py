@@ -0,0 +1,339 @@
+"""
+Lightweight odor classifiers (NumPy only) on per-cycle feature vectors.
+
+Latih dari tabel fitur hasil utils.batch, jalankan dari folder frontend:
+    python -m utils.batch data -o features.npz
+    python -m utils.classifier train features.npz [-m lda|knn|logistic] [-o models/odor_classifier.npz]
+    python -m utils.classifier eval features.npz   # akurasi leave-one-file-out
+
+Model disimpan sebagai .npz biasa (tanpa pickle) dan dipakai live oleh
+InferenceStage: satu prediksi per siklus FSM (HOLD -> PURGE) yang selesai.
+"""
+
+import argparse
+import csv
+import os
+import sys
+import time
+from typing import Dict, Optional, Sequence, Tuple
+
+import numpy as np
+
+from config.constants import CLASSIFIER_MODEL_PATH
+from utils.features import feature_vector
+
+# Fitur yang dipakai model (urutan sama dengan FEATURE_NAMES, seperti kolom
+# tabel utils.batch); baseline absolut
+# tidak dipakai karena ikut drift sensor antar sesi
+CLASSIFIER_FEATURES = ["peak", "delta_r", "rise_tau", "decay_tau", "auc", "slope_rise", "slope_decay"]
+
+
+def _softmax(scores: np.ndarray) -> np.ndarray:
+    scores = scores - scores.max(axis=1, keepdims=True)
+    e = np.exp(scores)
+    return e / e.sum(axis=1, keepdims=True)
+
+
+class Classifier:
+    """
+    Basis model: standarisasi (mean/std data latih, NaN diganti mean kolom)
+    lalu _fit/_proba milik subclass. Semua operasi vektor pada matriks
+    (n_sampel, n_fitur).
+    """
+
+    kind = ""
+
+    def __init__(self, features: Sequence[str] = CLASSIFIER_FEATURES):
+        self.features = list(features)
+        self.classes = np.array([], dtype=str)
+        self._fill = self._mu = self._sd = None
+        # Akurasi leave-one-file-out saat train (None = belum dievaluasi)
+        self.heldout_accuracy: Optional[float] = None
+
+    @property
+    def chance_level(self) -> float:
+        """Akurasi tebakan acak seragam (1 / jumlah kelas)"""
+        return 1.0 / len(self.classes) if len(self.classes) else 0.0
+
+    # --- Preprocessing ---
+    def _standardize(self, X: np.ndarray) -> np.ndarray:
+        X = np.asarray(X, dtype=np.float64)
+        X = np.where(np.isnan(X), self._fill, X)
+        return (X - self._mu) / self._sd
+
+    def fit(self, X: np.ndarray, y: Sequence[str]) -> "Classifier":
+        X = np.asarray(X, dtype=np.float64)
+        self.classes, yi = np.unique(np.asarray(y, dtype=str), return_inverse=True)
+        counts = (~np.isnan(X)).sum(axis=0)
+        self._fill = np.where(counts > 0, np.nansum(X, axis=0) / np.maximum(counts, 1), 0.0)
+        filled = np.where(np.isnan(X), self._fill, X)
+        self._mu = filled.mean(axis=0)
+        sd = filled.std(axis=0)
+        self._sd = np.where(sd > 0, sd, 1.0)
+        self._fit((filled - self._mu) / self._sd, yi)
+        return self
+
+    def predict_proba(self, X: np.ndarray) -> np.ndarray:
+        """Probabilitas (n_sampel, n_kelas), urutan kolom = self.classes"""
+        X = np.atleast_2d(np.asarray(X, dtype=np.float64))
+        return self._proba(self._standardize(X))
+
+    def predict(self, X: np.ndarray) -> np.ndarray:
+        return self.classes[self.predict_proba(X).argmax(axis=1)]
+
+    def predict_cycle(self, cycle: dict) -> np.ndarray:
+        """Probabilitas satu siklus dari utils.features (vektor n_kelas)"""
+        return self.predict_proba(feature_vector(cycle, self.features)[None, :])[0]
+
+    # --- Subclass ---
+    def _fit(self, Z: np.ndarray, yi: np.ndarray):
+        raise NotImplementedError
+
+    def _proba(self, Z: np.ndarray) -> np.ndarray:
+        raise NotImplementedError
+
+    def _params(self) -> Dict[str, np.ndarray]:
+        raise NotImplementedError
+
+    def _set_params(self, params: Dict[str, np.ndarray]):
+        raise NotImplementedError
+
+    # --- Persistensi (.npz tanpa pickle) ---
+    def save(self, path: str):
+        folder = os.path.dirname(path)
+        if folder:
+            os.makedirs(folder, exist_ok=True)
+        np.savez(path, kind=self.kind, classes=self.classes, features=np.array(self.features),
+                 fill=self._fill, mu=self._mu, sd=self._sd,
+                 heldout=np.array(np.nan if self.heldout_accuracy is None else self.heldout_accuracy),
+                 **{f"p_{k}": v for k, v in self._params().items()})
+
+
+class KNNClassifier(Classifier):
+    """k tetangga terdekat (jarak Euclid terstandar), vote berbobot 1/jarak"""
+
+    kind = "knn"
+
+    def __init__(self, features: Sequence[str] = CLASSIFIER_FEATURES, k: int = 5):
+        super().__init__(features)
+        self.k = k
+
+    def _fit(self, Z, yi):
+        self._Z, self._y = Z, yi
+
+    def _proba(self, Z):
+        # ||a - b||^2 = |a|^2 + |b|^2 - 2ab untuk semua pasangan sekaligus
+        d2 = (Z * Z).sum(axis=1)[:, None] + (self._Z * self._Z).sum(axis=1)[None, :] - 2.0 * Z @ self._Z.T
+        d = np.sqrt(np.maximum(d2, 0.0))
+        k = min(self.k, d.shape[1])
+        nn = np.argpartition(d, k - 1, axis=1)[:, :k]
+        w = 1.0 / (np.take_along_axis(d, nn, axis=1) + 1e-9)
+        proba = np.zeros((Z.shape[0], len(self.classes)))
+        np.add.at(proba, (np.arange(Z.shape[0])[:, None], self._y[nn]), w)
+        return proba / proba.sum(axis=1, keepdims=True)
+
+    def _params(self):
+        return {"Z": self._Z, "y": self._y, "k": np.array(self.k)}
+
+    def _set_params(self, p):
+        self._Z, self._y, self.k = p["Z"], p["y"], int(p["k"])
+
+
+class LDAClassifier(Classifier):
+    """
+    Linear Discriminant Analysis dengan kovarians gabungan yang di-shrink
+    ke diagonal (stabil untuk sampel sedikit vs fitur banyak).
+    """
+
+    kind = "lda"
+
+    def __init__(self, features: Sequence[str] = CLASSIFIER_FEATURES, shrinkage: float = 0.5):
+        super().__init__(features)
+        self.shrinkage = shrinkage
+
+    def _fit(self, Z, yi):
+        n_classes = len(self.classes)
+        counts = np.bincount(yi, minlength=n_classes)
+        means = np.zeros((n_classes, Z.shape[1]))
+        np.add.at(means, yi, Z)
+        means /= counts[:, None]
+        centered = Z - means[yi]
+        cov = centered.T @ centered / max(len(Z) - n_classes, 1)
+        p = cov.shape[0]
+        cov = (1.0 - self.shrinkage) * cov + self.shrinkage * np.trace(cov) / p * np.eye(p)
+        self._W = np.linalg.solve(cov, means.T)                      # (F, C)
+        self._b = -0.5 * (means * self._W.T).sum(axis=1) + np.log(counts / counts.sum())
+
+    def _proba(self, Z):
+        return _softmax(Z @ self._W + self._b)
+
+    def _params(self):
+        return {"W": self._W, "b": self._b}
+
+    def _set_params(self, p):
+        self._W, self._b = p["W"], p["b"]
+
+
+class LogisticClassifier(Classifier):
+    """Regresi logistik multinomial (softmax), gradient descent full-batch + L2"""
+
+    kind = "logistic"
+
+    def __init__(self, features: Sequence[str] = CLASSIFIER_FEATURES, l2: float = 1e-2,
+                 lr: float = 0.5, epochs: int = 500):
+        super().__init__(features)
+        self.l2, self.lr, self.epochs = l2, lr, epochs
+
+    def _fit(self, Z, yi):
+        n, f = Z.shape
+        Y = np.eye(len(self.classes))[yi]
+        W = np.zeros((f, len(self.classes)))
+        b = np.zeros(len(self.classes))
+        for _ in range(self.epochs):
+            G = (_softmax(Z @ W + b) - Y) / n
+            W -= self.lr * (Z.T @ G + self.l2 * W)
+            b -= self.lr * G.sum(axis=0)
+        self._W, self._b = W, b
+
+    def _proba(self, Z):
+        return _softmax(Z @ self._W + self._b)
+
+    def _params(self):
+        return {"W": self._W, "b": self._b}
+
+    def _set_params(self, p):
+        self._W, self._b = p["W"], p["b"]
+
+
+MODELS = {cls.kind: cls for cls in (KNNClassifier, LDAClassifier, LogisticClassifier)}
+
+
+def load_model(path: str) -> Classifier:
+    with np.load(path, allow_pickle=False) as doc:
+        model = MODELS[str(doc["kind"])](list(doc["features"]))
+        model.classes = doc["classes"]
+        model._fill, model._mu, model._sd = doc["fill"], doc["mu"], doc["sd"]
+        model._set_params({k[2:]: doc[k] for k in doc.files if k.startswith("p_")})
+        if "heldout" in doc.files and not np.isnan(doc["heldout"]):
+            model.heldout_accuracy = float(doc["heldout"])
+    return model
+
+
+class InferenceStage:
+    """
+    Tahap inferensi live: menerima siklus dari FeatureExtractor dan
+    mengembalikan probabilitas kelas. Model dimuat sekali; tanpa file
+    model stage tidak aktif (process() -> None). Satu prediksi = satu
+    perkalian matriks kecil, jadi latensi terbatas dan dicatat per siklus.
+
+    Model yang akurasi held-out-nya tidak di atas tebakan acak tidak
+    diaktifkan (disabled_reason menjelaskan alasannya ke GUI).
+    """
+
+    def __init__(self, model: Optional[Classifier] = None, disabled_reason: str = ""):
+        self.model = model
+        self.disabled_reason = disabled_reason
+
+    @classmethod
+    def from_file(cls, path: str = CLASSIFIER_MODEL_PATH) -> "InferenceStage":
+        try:
+            model = load_model(path)
+        except (OSError, KeyError, ValueError):
+            return cls(None, "model belum dilatih")
+        acc = model.heldout_accuracy
+        if acc is not None and acc <= model.chance_level:
+            return cls(None, f"nonaktif, akurasi uji {acc:.0%} <= tebakan acak {model.chance_level:.0%}")
+        return cls(model)
+
+    @property
+    def active(self) -> bool:
+        return self.model is not None
+
+    def process(self, cycle: dict) -> Optional[dict]:
+        if self.model is None:
+            return None
+        t0 = time.perf_counter()
+        proba = self.model.predict_cycle(cycle)
+        return {
+            "level": cycle["level"],
+            "classes": list(self.model.classes),
+            "proba": proba,
+            "heldout_accuracy": self.model.heldout_accuracy,
+            "latency_ms": (time.perf_counter() - t0) * 1000.0,
+        }
+
+
+# --- Tabel fitur (output utils.batch) ---
+def load_feature_table(path: str, features: Sequence[str] = CLASSIFIER_FEATURES
+                       ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Baca tabel fitur .npz / .csv dari utils.batch.
+    Return (X (n, len(features) * S), label sample_type, grup = nama file).
+    """
+    if path.endswith(".npz"):
+        with np.load(path, allow_pickle=False) as doc:
+            X, columns = doc["X"], list(doc["columns"])
+            labels, groups = doc["sample_type"], doc["filename"]
+    else:
+        with open(path, newline='') as f:
+            rows = list(csv.reader(f))
+        header, body = rows[0], rows[1:]
+        columns = header[6:]
+        X = np.array([[float(v) if v else np.nan for v in r[6:]] for r in body]).reshape(len(body), len(columns))
+        labels = np.array([r[2] for r in body])
+        groups = np.array([r[0] for r in body])
+    keep = [i for i, c in enumerate(columns) if c.split("[", 1)[0] in features]
+    return X[:, keep], labels, groups
+
+
+def leave_one_group_out(model_factory, X: np.ndarray, y: np.ndarray, groups: np.ndarray) -> float:
+    """
+    Akurasi leave-one-file-out: siklus dari file yang sama tidak pernah di
+    train & test sekaligus. Grup yang data latihnya < 2 kelas dilewati dan
+    tidak ikut penyebut; NaN jika tidak ada yang bisa dievaluasi.
+    """
+    correct = evaluated = 0
+    for g in np.unique(groups):
+        test = groups == g
+        if len(np.unique(y[~test])) < 2:
+            continue
+        model = model_factory().fit(X[~test], y[~test])
+        correct += int((model.predict(X[test]) == y[test]).sum())
+        evaluated += int(test.sum())
+    return correct / evaluated if evaluated else float("nan")
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m utils.classifier",
+                                     description="Latih / evaluasi classifier aroma dari tabel fitur")
+    parser.add_argument("command", choices=["train", "eval"])
+    parser.add_argument("table", help="tabel fitur .npz / .csv (python -m utils.batch)")
+    parser.add_argument("-m", "--model", choices=sorted(MODELS), default="lda")
+    parser.add_argument("-o", "--output", default=CLASSIFIER_MODEL_PATH)
+    args = parser.parse_args(argv)
+
+    X, y, groups = load_feature_table(args.table)
+    if not len(y):
+        parser.error("tabel fitur kosong")
+    if args.command == "eval":
+        for kind in sorted(MODELS):
+            acc = leave_one_group_out(MODELS[kind], X, y, groups)
+            print(f"{kind:<10} leave-one-file-out accuracy: {acc:.1%} ({len(y)} siklus, "
+                  f"tebakan acak {1.0 / len(np.unique(y)):.1%})")
+        return 0
+
+    t0 = time.perf_counter()
+    model = MODELS[args.model]().fit(X, y)
+    acc = leave_one_group_out(MODELS[args.model], X, y, groups)
+    model.heldout_accuracy = None if np.isnan(acc) else acc
+    model.save(args.output)
+    print(f"{args.model}: {len(y)} siklus, {len(model.classes)} kelas, "
+          f"{(time.perf_counter() - t0) * 1000:.1f} ms -> {args.output}")
+    print(f"leave-one-file-out accuracy: {acc:.1%} (tebakan acak {model.chance_level:.1%})")
+    if model.heldout_accuracy is not None and acc <= model.chance_level:
+        print("Peringatan: tidak di atas tebakan acak, GUI tidak akan mengaktifkan model ini")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
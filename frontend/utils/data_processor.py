@@ -3,23 +3,31 @@
 import numpy as np
 from typing import List
 
+from utils.filters import MovingAverage, build_filter_chain
+from utils.running_stats import RunningStats
+
 class DataProcessor:
-    """Process and filter sensor data"""
+    """
+    Process and filter sensor data (batch / file offline).
+    Untuk data live per blok gunakan filter streaming di utils.filters;
+    hasilnya identik dengan versi batch di sini.
+    """
     
     @staticmethod
     def moving_average(data: List[float], window_size: int = 5) -> List[float]:
-        """Apply moving average filter"""
+        """Apply moving average filter (trailing; awal data = rata-rata sampel yang ada)"""
         if len(data) < window_size:
             return data
         
-        data_array = np.array(data)
-        filtered = np.convolve(data_array, 
-                              np.ones(window_size) / window_size, 
-                              mode='valid')
-        
-        # Pad beginning
-        padding = [data] * (len(data) - len(filtered))
-        return list(padding + filtered.tolist())
+        data_array = np.asarray(data, dtype=np.float64)
+        return MovingAverage(1, window_size).apply(data_array[None, :])[0].tolist()
+
+    @staticmethod
+    def apply_filter(sensor_data: np.ndarray, preset: str) -> np.ndarray:
+        """Terapkan preset filter (utils.filters.FILTER_PRESETS) ke array (num_sensors, N)"""
+        sensor_data = np.asarray(sensor_data, dtype=np.float64)
+        chain = build_filter_chain(preset, sensor_data.shape[0])
+        return sensor_data.copy() if chain is None else chain.apply(sensor_data)
     
     @staticmethod
     def normalize(data: List[float]) -> List[float]:
@@ -53,12 +61,9 @@ class DataProcessor:
         if not data:
             return {}
         
-        data_array = np.array(data)
-        return {
-            'min': float(data_array.min()),
-            'max': float(data_array.max()),
-            'mean': float(data_array.mean()),
-            'median': float(np.median(data_array)),
-            'std': float(data_array.std()),
-            'variance': float(data_array.var()),
-        }
+        data_array = np.asarray(data, dtype=np.float64)
+        stats = RunningStats(1)
+        stats.update_batch(data_array[None, :])
+        result = stats.as_dict()
+        result['median'] = float(np.median(data_array))
+        return result
@@ -0,0 +1,55 @@
+"""Min/max envelope decimation for drawing long recordings (level of detail)"""
+
+import numpy as np
+from typing import Tuple
+
+
+def visible_slice(x: np.ndarray, x_min: float, x_max: float) -> slice:
+    """
+    Slice sampel yang jatuh di [x_min, x_max] (x terurut naik), ditambah
+    satu sampel di kiri & kanan agar garis tetap menyentuh tepi plot.
+    """
+    start = max(int(np.searchsorted(x, x_min, side='left')) - 1, 0)
+    stop = min(int(np.searchsorted(x, x_max, side='right')) + 1, len(x))
+    return slice(start, stop)
+
+
+def minmax_envelope(x: np.ndarray, ys: np.ndarray, n_bins: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Turunkan resolusi semua channel sekaligus ke ~2 * n_bins titik.
+
+    Sampel dibagi ke n_bins kelompok berukuran sama; dari setiap kelompok
+    diambil titik minimum dan maksimum (urutan waktunya dipertahankan),
+    sehingga puncak/lembah sempit tetap terlihat persis seperti data asli
+    pada lebar piksel tersebut. Sisa sampel di ujung (< satu kelompok)
+    dipakai apa adanya.
+
+    x: (N,), ys: (C, N). Return (xs, ys_out) berbentuk (C, M): setiap
+    channel punya posisi x sendiri karena min/max jatuh di sampel berbeda.
+    Jika N <= 2 * n_bins data dikembalikan tanpa decimation (xs di-broadcast).
+    """
+    ys = np.asarray(ys)
+    n_channels, n = ys.shape
+    n_bins = max(1, int(n_bins))
+    if n <= 2 * n_bins:
+        return np.broadcast_to(x, ys.shape), ys
+
+    k = -(-n // n_bins)            # sampel per kelompok (ceil)
+    m = n // k                     # jumlah kelompok penuh
+    full = m * k
+    seg = ys[:, :full].reshape(n_channels, m, k)
+    i_min = seg.argmin(axis=2)
+    i_max = seg.argmax(axis=2)
+
+    # Dua indeks per kelompok, urut waktu, lalu offset ke indeks global
+    idx = np.empty((n_channels, m, 2), dtype=np.intp)
+    idx[:, :, 0] = np.minimum(i_min, i_max)
+    idx[:, :, 1] = np.maximum(i_min, i_max)
+    idx += (np.arange(m) * k)[None, :, None]
+    idx = idx.reshape(n_channels, 2 * m)
+
+    if full < n:
+        tail = np.broadcast_to(np.arange(full, n), (n_channels, n - full))
+        idx = np.concatenate([idx, tail], axis=1)
+
+    return x[idx], np.take_along_axis(ys, idx, axis=1)
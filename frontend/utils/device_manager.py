@@ -0,0 +1,140 @@
+"""
+Multi-device data receiver: N bridge streams (port 8083) on the shared network loop.
+
+Setiap E-Nose menjalankan bridge Rust sendiri (ENOSE_DEVICE_ID /
+ENOSE_PORT_OFFSET di backend). DeviceManager menjalankan satu coroutine
+per device di event loop jaringan bersama (utils.net_loop), jadi jumlah
+thread tetap walau jumlah device bertambah.
+
+Sampel di-decode ke SampleBatcher per device. Batch yang jatuh tempo dari
+SEMUA device dikumpulkan dan dikirim dengan satu signal per jendela batch
+({nama: record array}), sehingga GUI thread menerima paling banyak satu
+event per BATCH_WINDOW_MS, bukan satu per paket per device.
+"""
+
+import asyncio
+from typing import Dict
+
+from PySide6.QtCore import Signal
+
+from config.constants import (
+    BATCH_MAX_SAMPLES, BATCH_WINDOW_MS, STREAM_BINARY, GUI_QUEUE_MAX_BATCHES, GUI_QUEUE_POLICY,
+    CMD_TIMEOUT_S, DATA_RECONNECT_MIN_S, DATA_RECONNECT_MAX_S
+)
+from utils.gui_queue import GuiChannel
+from utils.net_loop import Backoff
+from utils.network_comm import LoopWorker
+from utils.sample_batch import SampleBatcher
+from utils.stream_protocol import negotiate_binary, StreamDecoder
+
+
+class DeviceManager(LoopWorker):
+    """
+    Penerima stream untuk banyak device. add_device()/remove_device() aman
+    dipanggil dari GUI thread (dijadwalkan ke thread loop).
+
+    batches_received: dict {nama device: record SAMPLE_DTYPE}, hanya berisi
+    device yang punya data baru. device_status: (nama, terhubung).
+    """
+
+    batches_received = Signal(object)
+    device_status = Signal(str, bool)
+
+    def __init__(self, batch_size: int = BATCH_MAX_SAMPLES, batch_window_ms: float = BATCH_WINDOW_MS,
+                 queue_size: int = GUI_QUEUE_MAX_BATCHES, queue_policy: str = GUI_QUEUE_POLICY,
+                 parent=None):
+        super().__init__(parent)
+        self.batch_size = batch_size
+        self.batch_window_ms = batch_window_ms
+        self.channel = GuiChannel(self._net, queue_size, queue_policy, parent=self)
+        self.channel.delivered.connect(self._on_delivered)
+        # Hanya disentuh di thread loop
+        self._tasks: Dict[str, asyncio.Task] = {}
+        self._batchers: Dict[str, SampleBatcher] = {}
+        self._wake = asyncio.Event()
+
+    # --- API (GUI thread) ---
+    def add_device(self, name: str, host: str, port: int, binary: bool = STREAM_BINARY):
+        self._net.call(self._add, name, host, port, binary)
+
+    def remove_device(self, name: str):
+        self._net.call(self._remove, name)
+
+    def _on_delivered(self, batches, _):
+        self.batches_received.emit(batches)
+
+    # --- Thread loop ---
+    def _add(self, name: str, host: str, port: int, binary: bool):
+        self._remove(name)
+        self._batchers[name] = SampleBatcher(self.batch_size, self.batch_window_ms)
+        self._tasks[name] = asyncio.ensure_future(self._device_loop(name, host, port, binary))
+
+    def _remove(self, name: str):
+        task = self._tasks.pop(name, None)
+        if task:
+            task.cancel()
+        self._batchers.pop(name, None)
+
+    async def run(self):
+        """Flusher: kirim batch yang jatuh tempo dari semua device sebagai satu dict"""
+        try:
+            while self.is_running:
+                lefts = [b.time_left() for b in self._batchers.values() if len(b)]
+                if lefts:
+                    await asyncio.sleep(min(lefts))
+                else:
+                    self._wake.clear()
+                    await self._wake.wait()
+                ready = {name: b.take() for name, b in self._batchers.items() if b.is_due()}
+                if ready:
+                    await self.channel.put(ready)
+        finally:
+            for name in list(self._tasks):
+                self._remove(name)
+
+    async def _device_loop(self, name: str, host: str, port: int, binary: bool):
+        backoff = Backoff(DATA_RECONNECT_MIN_S, DATA_RECONNECT_MAX_S)
+        while True:
+            try:
+                reader, writer = await asyncio.wait_for(asyncio.open_connection(host, port), CMD_TIMEOUT_S)
+            except (OSError, asyncio.TimeoutError):
+                await asyncio.sleep(backoff.next())
+                continue
+
+            backoff.reset()
+            self.device_status.emit(name, True)
+            try:
+                await self._read_device(name, reader, writer, binary)
+            except (OSError, ConnectionError):
+                pass
+            finally:
+                writer.close()
+                # Dibatalkan (remove/stop) juga dilaporkan agar tabel device konsisten
+                self.device_status.emit(name, False)
+            await asyncio.sleep(backoff.next())
+
+    async def _read_device(self, name, reader, writer, binary):
+        leftover = b""
+        if binary:
+            binary, leftover = await negotiate_binary(reader, writer)
+        decoder = StreamDecoder(binary)
+        batcher = self._batchers[name]
+        chunk = leftover
+        while True:
+            records = decoder.feed(chunk)
+            while len(records):
+                if not len(batcher):
+                    # Batch baru: flusher mulai menghitung jendela batch. Dicek
+                    # tiap iterasi karena put() di bawah bisa yield (policy block)
+                    # dan flusher sempat tidur saat semua batcher kosong.
+                    self._wake.set()
+                taken = batcher.add_records(records)
+                records = records[taken:]
+                if batcher.is_full():
+                    # Batch penuh: kirim segera tanpa menunggu device lain
+                    await self.channel.put({name: batcher.take()})
+            chunk = await reader.read(65536)
+            if not chunk:  # Server putus
+                if len(batcher):
+                    await self.channel.put({name: batcher.take()})
+                return
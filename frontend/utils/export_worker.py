@@ -0,0 +1,32 @@
+"""Background workers untuk export file (agar GUI tidak freeze saat Save)"""
+
+from PySide6.QtCore import QThread, Signal
+
+from utils.file_handler import FileHandler
+
+
+class CsvExportWorker(QThread):
+    """Menjalankan FileHandler.save_as_csv di thread terpisah dengan progress"""
+
+    progress = Signal(int)               # 0..100 (%)
+    export_finished = Signal(bool, str)  # (berhasil, nama file)
+
+    def __init__(self, filename: str, info: dict, sensor_data, times, sensor_names,
+                 states=None, levels=None, parent=None):
+        super().__init__(parent)
+        self.filename = filename
+        self.info = info
+        # View read-only SessionBuffer: tetap valid walau sesi di-clear/tumbuh
+        self.sensor_data = sensor_data
+        self.times = times
+        self.sensor_names = sensor_names
+        self.states = states
+        self.levels = levels
+
+    def run(self):
+        ok = FileHandler.save_as_csv(
+            self.filename, self.info, self.sensor_data, self.times, self.sensor_names,
+            progress=lambda frac: self.progress.emit(int(frac * 100)),
+            states=self.states, levels=self.levels
+        )
+        self.export_finished.emit(ok, self.filename)
@@ -0,0 +1,272 @@
+"""Per-cycle feature extraction keyed on the Arduino FSM state stream"""
+
+import numpy as np
+from typing import List, Optional, Sequence, Tuple
+
+from config.constants import (
+    STATE_PRE_COND, STATE_RAMP_UP, STATE_HOLD, STATE_PURGE, STATE_RECOVERY, STATE_DONE,
+    FSM_NUM_LEVELS, FSM_T_PRECOND_S, FSM_T_RAMP_S, FSM_T_HOLD_S, FSM_T_PURGE_S, FSM_T_RECOVERY_S,
+    FEATURE_BASELINE_S, FEATURE_SLOPE_S
+)
+from utils.session_reader import SessionReader
+
+# Urutan baris array fitur (F, num_sensors) per siklus
+FEATURE_NAMES = [
+    "baseline",     # R0: rata-rata sebelum HOLD
+    "peak",         # Respon bertanda terbesar selama HOLD (x - R0)
+    "delta_r",      # peak / R0 (ΔR/R0)
+    "rise_tau",     # Detik sejak awal HOLD sampai 63.2% peak
+    "decay_tau",    # Detik sejak awal PURGE sampai respon turun ke 36.8%
+    "auc",          # Luas (trapesium) respon selama HOLD
+    "slope_rise",   # Slope regresi linier FEATURE_SLOPE_S pertama HOLD
+    "slope_decay",  # Slope regresi linier FEATURE_SLOPE_S pertama PURGE
+]
+TAU_RISE = 1.0 - np.exp(-1.0)   # 0.632
+TAU_DECAY = np.exp(-1.0)        # 0.368
+
+# Batas siklus: (awal HOLD, awal PURGE, akhir PURGE) sebagai indeks sampel
+Bounds = Tuple[int, int, int]
+
+
+class CycleScanner:
+    """
+    Mencari siklus HOLD -> PURGE dari stream state secara inkremental.
+    Hanya titik transisi state yang diperiksa (np.flatnonzero pada blok
+    baru), jadi biaya per blok O(k) tanpa loop per sampel. Siklus baru
+    dilaporkan setelah PURGE-nya selesai (state berganti).
+    """
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self._count = 0
+        self._last = None
+        self._hold = None
+        self._purge = None
+
+    def feed(self, states: np.ndarray) -> List[Bounds]:
+        """Proses blok state berikutnya; return batas siklus yang selesai"""
+        states = np.asarray(states)
+        k = len(states)
+        if k == 0:
+            return []
+        prev = np.empty(k, dtype=np.int64)
+        prev[0] = -1 if self._last is None else self._last
+        prev[1:] = states[:-1]
+        done = []
+        for i in np.flatnonzero(states != prev):
+            pos, cur, old = self._count + int(i), int(states[i]), int(prev[i])
+            if old == STATE_PURGE and self._purge is not None:
+                done.append((self._hold, self._purge, pos))
+                self._hold = self._purge = None
+            if cur == STATE_HOLD:
+                self._hold, self._purge = pos, None
+            elif cur == STATE_PURGE and old == STATE_HOLD and self._hold is not None:
+                self._purge = pos
+        self._count += k
+        self._last = int(states[-1])
+        return done
+
+    def finish(self) -> List[Bounds]:
+        """Akhir rekaman: PURGE yang masih berjalan dianggap selesai"""
+        if self._purge is None:
+            return []
+        done = [(self._hold, self._purge, self._count)]
+        self._hold = self._purge = None
+        return done
+
+
+def _first_index(mask: np.ndarray) -> np.ndarray:
+    """Indeks True pertama per baris, -1 jika tidak ada"""
+    first = mask.argmax(axis=1)
+    return np.where(mask.any(axis=1), first, -1)
+
+
+def _slope(t: np.ndarray, x: np.ndarray, span_s: float) -> np.ndarray:
+    """Slope regresi linier x(t) untuk span_s detik pertama, semua sensor sekaligus"""
+    n = int(np.searchsorted(t, t[0] + span_s, side='right')) if len(t) else 0
+    if n < 2:
+        return np.full(x.shape[0], np.nan)
+    tt = t[:n] - t[:n].mean()
+    denom = float(tt @ tt)
+    if denom == 0:
+        return np.full(x.shape[0], np.nan)
+    return (x[:, :n] - x[:, :n].mean(axis=1, keepdims=True)) @ tt / denom
+
+
+def cycle_features(times: np.ndarray, sensors: np.ndarray, hold: slice,
+                   purge: Optional[slice] = None, baseline: Optional[slice] = None) -> np.ndarray:
+    """
+    Hitung fitur satu siklus untuk semua sensor, return array (F, S).
+    hold/purge/baseline adalah slice sampel; tanpa purge, fitur decay NaN.
+    Tanpa baseline (atau kosong) R0 diambil dari sampel pertama HOLD.
+    """
+    times = np.asarray(times, dtype=np.float64)
+    sensors = np.asarray(sensors, dtype=np.float64)
+    n_sensors = sensors.shape[0]
+    out = np.full((len(FEATURE_NAMES), n_sensors), np.nan)
+
+    t_hold = times[hold]
+    x_hold = sensors[:, hold]
+    if len(t_hold) == 0:
+        return out
+    base = sensors[:, baseline] if baseline is not None else x_hold[:, :0]
+    r0 = base.mean(axis=1) if base.shape[1] else x_hold[:, 0].copy()
+
+    # Respon HOLD relatif baseline
+    x = x_hold - r0[:, None]
+    rows = np.arange(n_sensors)
+    peak = x[rows, np.abs(x).argmax(axis=1)]
+    with np.errstate(invalid='ignore', divide='ignore'):
+        delta_r = np.where(r0 != 0, peak / r0, np.nan)
+    rise = _first_index(np.abs(x) >= TAU_RISE * np.abs(peak)[:, None])
+    rise_tau = np.where((rise >= 0) & (peak != 0), t_hold[np.maximum(rise, 0)] - t_hold[0], np.nan)
+    if len(t_hold) > 1:
+        auc = ((x[:, 1:] + x[:, :-1]) * np.diff(t_hold)).sum(axis=1) / 2.0
+    else:
+        auc = np.zeros(n_sensors)
+
+    out[0], out[1], out[2], out[3], out[5] = r0, peak, delta_r, rise_tau, auc
+    out[6] = _slope(t_hold, x, FEATURE_SLOPE_S)
+
+    # Decay selama PURGE: dari respon di awal PURGE menuju baseline
+    if purge is not None:
+        t_purge = times[purge]
+        y = sensors[:, purge] - r0[:, None]
+        if len(t_purge):
+            y0 = y[:, 0]
+            sign = np.where(y0 < 0, -1.0, 1.0)
+            decay = _first_index(y * sign[:, None] <= TAU_DECAY * np.abs(y0)[:, None])
+            out[4] = np.where((decay >= 0) & (y0 != 0), t_purge[np.maximum(decay, 0)] - t_purge[0], np.nan)
+            out[7] = _slope(t_purge, y, FEATURE_SLOPE_S)
+    return out
+
+
+def schedule_states(times: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Rekonstruksi (state, level) dari durasi nominal FSM Arduino untuk file
+    lama tanpa kolom State/Level: PRE_COND lalu 5 x (RAMP_UP, HOLD, PURGE,
+    RECOVERY), waktu dihitung dari sampel pertama. Setelah jadwal habis = DONE.
+    """
+    seg_states = [STATE_PRE_COND]
+    seg_levels = [0]
+    durations = [FSM_T_PRECOND_S]
+    for level in range(FSM_NUM_LEVELS):
+        seg_states += [STATE_RAMP_UP, STATE_HOLD, STATE_PURGE, STATE_RECOVERY]
+        seg_levels += [level] * 4
+        durations += [FSM_T_RAMP_S, FSM_T_HOLD_S, FSM_T_PURGE_S, FSM_T_RECOVERY_S]
+    seg_states.append(STATE_DONE)
+    seg_levels.append(FSM_NUM_LEVELS - 1)
+    edges = np.concatenate(([0.0], np.cumsum(durations)))
+
+    t = np.asarray(times, dtype=np.float64)
+    seg = np.searchsorted(edges, t - t[0], side='right') - 1 if len(t) else np.empty(0, dtype=np.intp)
+    return (np.asarray(seg_states, dtype=np.int8)[seg],
+            np.asarray(seg_levels, dtype=np.int8)[seg])
+
+
+def _baseline_slice(times: np.ndarray, hold_start: int) -> slice:
+    start = int(np.searchsorted(times[:hold_start], times[hold_start] - FEATURE_BASELINE_S, side='left'))
+    return slice(start, hold_start)
+
+
+def _make_cycle(times, sensors, levels, bounds: Bounds) -> dict:
+    h0, p0, p1 = bounds
+    return {
+        "level": int(levels[h0]) if levels is not None else None,
+        "start": float(times[h0]),
+        "end": float(times[p1 - 1]),
+        "features": cycle_features(times, sensors, slice(h0, p0), slice(p0, p1),
+                                   _baseline_slice(times, h0)),
+    }
+
+
+def extract_cycles(times: np.ndarray, sensors: np.ndarray,
+                   states: Optional[np.ndarray] = None, levels: Optional[np.ndarray] = None) -> List[dict]:
+    """
+    Fitur semua siklus dari rekaman lengkap (offline). Hasil sama dengan
+    FeatureExtractor yang membaca data yang sama secara bertahap.
+
+    Setiap siklus: {"level", "start", "end" (detik), "features": (F, S)}.
+    File lama tanpa kolom state memakai jadwal nominal FSM (schedule_states).
+    Jika tetap tidak ada siklus (rekaman sangat pendek), seluruh rekaman
+    diperlakukan sebagai satu HOLD: R0 dari FEATURE_BASELINE_S pertama,
+    fitur decay NaN, level None.
+    """
+    times = np.asarray(times, dtype=np.float64)
+    if len(times) == 0:
+        return []
+    if states is None:
+        states, levels = schedule_states(times)
+    scanner = CycleScanner()
+    bounds = scanner.feed(states) + scanner.finish()
+    if bounds:
+        return [_make_cycle(times, sensors, levels, b) for b in bounds]
+
+    # Fallback tanpa siklus HOLD -> PURGE
+    n_base = int(np.searchsorted(times, times[0] + FEATURE_BASELINE_S, side='left'))
+    return [{
+        "level": None,
+        "start": float(times[0]),
+        "end": float(times[-1]),
+        "features": cycle_features(times, sensors, slice(0, len(times)), None,
+                                   slice(0, max(n_base, 1))),
+    }]
+
+
+def extract_from_csv(path: str) -> List[dict]:
+    """extract_cycles() untuk file CSV sesi (dengan / tanpa kolom State & Level)"""
+    times, sensors, states, levels = SessionReader(path).read_arrays()
+    return extract_cycles(times, sensors, states, levels)
+
+
+def feature_vector(cycle: dict, names: Sequence[str] = FEATURE_NAMES) -> np.ndarray:
+    """Vektor datar (len(names) * S,) dari satu siklus, urut fitur lalu sensor"""
+    rows = [FEATURE_NAMES.index(n) for n in names]
+    return cycle["features"][rows].ravel()
+
+
+def feature_columns(sensor_names: Sequence[str], names: Sequence[str] = FEATURE_NAMES) -> List[str]:
+    """Nama kolom yang sesuai dengan feature_vector(), mis. 'delta_r[GM-CO]'"""
+    return [f"{f}[{s}]" for f in names for s in sensor_names]
+
+
+class FeatureExtractor:
+    """
+    Ekstraksi fitur live dari SessionBuffer.
+
+    update() hanya memindai sampel yang belum pernah dilihat; fitur sebuah
+    siklus dihitung sekali ketika PURGE-nya selesai, memakai view array
+    session (tanpa salinan). Panggil reset() bersamaan dengan session.clear().
+    """
+
+    def __init__(self, session):
+        self.session = session
+        self.scanner = CycleScanner()
+        self.cycles: List[dict] = []
+        self._seen = 0
+
+    def reset(self):
+        self.scanner.reset()
+        self.cycles = []
+        self._seen = 0
+
+    def update(self) -> List[dict]:
+        """Return siklus yang baru selesai sejak panggilan sebelumnya"""
+        n = len(self.session)
+        if n <= self._seen:
+            return []
+        bounds = self.scanner.feed(self.session.state[self._seen:n])
+        self._seen = n
+        return self._emit(bounds)
+
+    def finish(self) -> List[dict]:
+        """Sampling berhenti: hitung siklus yang PURGE-nya terpotong"""
+        return self._emit(self.scanner.finish())
+
+    def _emit(self, bounds: List[Bounds]) -> List[dict]:
+        s = self.session
+        new = [_make_cycle(s.times, s.sensors, s.level, b) for b in bounds]
+        self.cycles.extend(new)
+        return new
@@ -1,20 +1,54 @@
 """File handling utilities (Fixed: Invalid Signature Error)"""
 
 import csv
+import io
 import json
 import requests
 import os
 from pathlib import Path
 from datetime import datetime
-from typing import Dict, List, Tuple
+import numpy as np
+from typing import IO, Callable, Dict, List, Sequence, Tuple, Union
+
+from config.constants import CSV_CHUNK_ROWS, EI_INGESTION_URL, EI_UPLOAD_TIMEOUT_S
+from utils.session_reader import META_COLUMNS, SessionReader
 
 class FileHandler:
     """Handle file operations"""
     
     @staticmethod
-    def save_as_csv(filename: str, data: Dict, sensor_data: Dict[int, List[float]], 
-                   times: List[float], sensor_names: List[str]) -> bool:
-        """Save data as CSV (Standard Format)"""
+    def column_block(sensor_data: Union[Dict[int, List[float]], np.ndarray],
+                     times: Sequence[float] = None) -> np.ndarray:
+        """
+        Susun data sensor jadi array kolom (N, [time,] S) float64.
+        Sensor yang datanya lebih pendek dari `times` diisi 0.
+        """
+        n_sensors = len(sensor_data)
+        n = len(times) if times is not None else (len(sensor_data[0]) if n_sensors else 0)
+        offset = 0 if times is None else 1
+        block = np.zeros((n, n_sensors + offset), dtype=np.float64)
+        if times is not None:
+            block[:, 0] = times
+        for s_idx in range(n_sensors):
+            col = np.asarray(sensor_data[s_idx], dtype=np.float64)[:n]
+            block[:len(col), s_idx + offset] = col
+        return block
+
+    @staticmethod
+    def save_as_csv(filename: str, data: Dict, sensor_data: Union[Dict[int, List[float]], np.ndarray],
+                   times: Sequence[float], sensor_names: List[str],
+                   progress: Callable[[float], None] = None, chunk_rows: int = CSV_CHUNK_ROWS,
+                   states: Sequence[int] = None, levels: Sequence[int] = None) -> bool:
+        """
+        Save data as CSV (Standard Format).
+        sensor_data boleh dict-of-lists atau array (num_sensors, N) seperti
+        SessionBuffer.sensors (dibaca langsung, tanpa konversi ke list).
+        Jika states & levels diberikan, kolom "State" dan "Level" (FSM
+        Arduino) ditambahkan di akhir untuk ekstraksi fitur per siklus.
+        Baris data diformat per blok `chunk_rows` dengan satu operasi format
+        string per blok lalu ditulis bertahap; progress(fraction) dipanggil
+        setiap blok selesai.
+        """
         try:
             Path("data").mkdir(exist_ok=True)
             
@@ -31,72 +65,158 @@ class FileHandler:
                 writer.writerow([]) # Empty line
                 
                 # Headers
+                with_state = states is not None and levels is not None
                 headers = ["Time (s)"] + [name for name in sensor_names]
+                if with_state:
+                    headers += list(META_COLUMNS)
                 writer.writerow(headers)
                 
-                # Data Rows
-                for t_idx, t in enumerate(times):
-                    row = [f"{t:.3f}"]
-                    for s_idx in range(len(sensor_data)):
-                        if t_idx < len(sensor_data[s_idx]):
-                            row.append(f"{sensor_data[s_idx][t_idx]:.2f}")
-                        else:
-                            row.append("0")
-                    writer.writerow(row)
+                # Data Rows (per blok, format vektor)
+                block = FileHandler.column_block(sensor_data, times)
+                n_rows, n_cols = block.shape
+                fmts = ["%.3f"] + ["%.2f"] * (n_cols - 1)
+                if with_state:
+                    block = np.column_stack([block, np.asarray(states)[:n_rows], np.asarray(levels)[:n_rows]])
+                    fmts += ["%d", "%d"]
+                row_fmt = ",".join(fmts) + writer.dialect.lineterminator
+                chunk_rows = max(1, chunk_rows)
+                for start in range(0, n_rows, chunk_rows):
+                    chunk = block[start:start + chunk_rows]
+                    f.write((row_fmt * len(chunk)) % tuple(chunk.ravel().tolist()))
+                    if progress:
+                        progress(min(start + chunk_rows, n_rows) / n_rows)
             return True
         except Exception as e:
             print(f"Error saving CSV: {str(e)}")
             return False
 
+    @staticmethod
+    def edge_impulse_values(sensor_data: Union[Dict[int, List[float]], np.ndarray],
+                            num_sensors: int) -> np.ndarray:
+        """
+        Transpose data sensor (kolom) ke matriks baris (N, num_sensors) untuk
+        field "values". Panjang mengikuti sensor 0; sensor yang tidak ada /
+        lebih pendek diisi 0.0.
+        """
+        num_points = len(sensor_data[0]) if len(sensor_data) else 0
+        values = np.zeros((num_points, num_sensors), dtype=np.float64)
+        block = FileHandler.column_block(sensor_data)
+        cols = min(block.shape[1], num_sensors)
+        values[:, :cols] = block[:num_points, :cols]
+        return values
+
+    @staticmethod
+    def write_edge_impulse_json(f: IO[str], payload: Dict, values: np.ndarray,
+                                pretty: bool = False, chunk_rows: int = CSV_CHUNK_ROWS):
+        """
+        Tulis dokumen Edge Impulse ke file handle.
+        Mode compact: matriks "values" di-stream per blok tanpa membangun
+        nested list penuh di memori. Mode pretty: json.dump(indent=2) seperti
+        format lama (lebih besar & lambat, untuk dibaca manusia).
+
+        NaN/inf bukan JSON valid -> ValueError sebelum apa pun ditulis.
+        """
+        if not np.isfinite(values).all():
+            bad = int(np.count_nonzero(~np.isfinite(values)))
+            raise ValueError(f"{bad} nilai sensor bukan angka hingga (NaN/inf), tidak bisa ditulis ke JSON")
+        if pretty:
+            doc = dict(payload, payload=dict(payload["payload"], values=values.tolist()))
+            json.dump(doc, f, indent=2)
+            return
+
+        # Header tanpa "values" (payload["payload"] adalah field terakhir),
+        # buang "}}" penutup lalu sisipkan "values" sebagai field terakhir
+        head = json.dumps(payload, separators=(',', ':'))
+        f.write(head[:-2])
+        f.write(',"values":[')
+
+        n_rows, n_cols = values.shape
+        row_fmt = "[" + ",".join(["%r"] * n_cols) + "],"
+        chunk_rows = max(1, chunk_rows)
+        for start in range(0, n_rows, chunk_rows):
+            chunk = values[start:start + chunk_rows]
+            text = (row_fmt * len(chunk)) % tuple(chunk.ravel().tolist())
+            if start + len(chunk) >= n_rows:
+                text = text[:-1]  # tanpa koma setelah baris terakhir
+            f.write(text)
+        f.write("]}}")
+
+    @staticmethod
+    def edge_impulse_payload(sensor_names: List[str], interval_ms: float) -> Dict:
+        """Header dokumen Edge Impulse (tanpa "values")"""
+        # PERBAIKAN DI SINI:
+        # Menggunakan "alg": "none" agar server tidak menagih signature panjang
+        return {
+            "protected": {
+                "ver": "v1", 
+                "alg": "none", # <--- UPDATE PENTING (Sebelumnya HS256)
+                "iat": int(datetime.now().timestamp())
+            },
+            "signature": "0", 
+            "payload": {
+                "device_name": "ENose-UnoR4",
+                "device_type": "ELECTRONIC_NOSE",
+                "interval_ms": interval_ms,
+                "sensors": [{"name": name, "units": "V"} for name in sensor_names],
+            }
+        }
+
     @staticmethod
     def save_edge_impulse_json(filename: str, sample_name: str, sensor_names: List[str], 
-                             sensor_data: Dict[int, List[float]], interval_ms: float) -> bool:
+                             sensor_data: Union[Dict[int, List[float]], np.ndarray],
+                             interval_ms: float, pretty: bool = False) -> bool:
         """Save data in Edge Impulse Data Acquisition Format (JSON)"""
         try:
             Path("data").mkdir(exist_ok=True)
             
-            # Transpose data (Column to Row based)
-            values = []
-            num_points = 0
-            if sensor_data and 0 in sensor_data:
-                num_points = len(sensor_data[0])
-            
-            for i in range(num_points):
-                row = []
-                for j in range(len(sensor_names)):
-                    val = sensor_data[j][i] if (j in sensor_data and i < len(sensor_data[j])) else 0.0
-                    row.append(val)
-                values.append(row)
+            # Transpose data (Column to Row based), vektor
+            values = FileHandler.edge_impulse_values(sensor_data, len(sensor_names))
             
-            # PERBAIKAN DI SINI:
-            # Menggunakan "alg": "none" agar server tidak menagih signature panjang
-            payload = {
-                "protected": {
-                    "ver": "v1", 
-                    "alg": "none", # <--- UPDATE PENTING (Sebelumnya HS256)
-                    "iat": int(datetime.now().timestamp())
-                },
-                "signature": "0", 
-                "payload": {
-                    "device_name": "ENose-UnoR4",
-                    "device_type": "ELECTRONIC_NOSE",
-                    "interval_ms": interval_ms,
-                    "sensors": [{"name": name, "units": "V"} for name in sensor_names],
-                    "values": values
-                }
-            }
+            payload = FileHandler.edge_impulse_payload(sensor_names, interval_ms)
             
             if not filename.endswith('.json'):
                 filename = filename.replace('.csv', '.json')
                 
-            with open(filename, 'w') as f:
-                json.dump(payload, f, indent=2)
-                
+            tmp_filename = filename + ".tmp"
+            try:
+                with open(tmp_filename, 'w') as f:
+                    FileHandler.write_edge_impulse_json(f, payload, values, pretty=pretty)
+                os.replace(tmp_filename, filename)
+            finally:
+                if os.path.exists(tmp_filename):
+                    os.remove(tmp_filename)
             return True
         except Exception as e:
             print(f"Error saving Edge Impulse JSON: {str(e)}")
             return False
 
+    @staticmethod
+    def write_csv_as_edge_impulse(csv_filename: str, f: IO[str]) -> bool:
+        """
+        Baca file CSV format 'Electronic Nose Data Export' dan tulis dokumen
+        JSON Edge Impulse-nya ke file handle f (file di disk atau io.StringIO).
+        """
+        # 1. Parsing Metadata (sekali) + 2. Data Values (satu pass vektor)
+        try:
+            reader = SessionReader(csv_filename)
+        except ValueError:
+            print("Format CSV tidak dikenali")
+            return False
+
+        times, sensors, _, _ = reader.read_arrays()
+        if not len(times):
+            return False
+
+        # 3. Hitung Interval (ms) dari rata-rata 5 selisih pertama
+        interval_ms = 100.0 
+        if len(times) > 1:
+            interval_ms = float(np.mean(np.diff(times[:6]))) * 1000.0
+
+        values = FileHandler.edge_impulse_values(sensors, len(reader.sensor_names))
+        payload = FileHandler.edge_impulse_payload(reader.sensor_names, interval_ms)
+        FileHandler.write_edge_impulse_json(f, payload, values)
+        return True
+
     @staticmethod
     def convert_csv_to_json(csv_filename: str) -> bool:
         """
@@ -107,70 +227,45 @@ class FileHandler:
             if not os.path.exists(csv_filename):
                 return False
 
-            with open(csv_filename, 'r') as f:
-                reader = csv.reader(f)
-                lines = list(reader)
-
-            # 1. Parsing Metadata
-            sample_name = "Unknown"
-            start_row_data = 0
-            
-            for i, line in enumerate(lines[:15]):
-                if len(line) >= 2 and line[0] == "Sample Name":
-                    sample_name = line[1]
-                if len(line) > 0 and line[0].startswith("Time"):
-                    start_row_data = i
-                    break
-            
-            if start_row_data == 0 and sample_name == "Unknown":
-                print("Format CSV tidak dikenali")
-                return False
-
-            header_row = lines[start_row_data]
-            sensor_names = header_row[1:] 
-            
-            # 2. Parsing Data Values
-            parsed_sensor_data = {i: [] for i in range(len(sensor_names))}
-            times = []
-            
-            for row in lines[start_row_data + 1:]:
-                if len(row) < 2: continue
-                try:
-                    t = float(row[0])
-                    times.append(t)
-                    for s_idx in range(len(sensor_names)):
-                        val = float(row[s_idx + 1])
-                        parsed_sensor_data[s_idx].append(val)
-                except ValueError:
-                    continue
-
-            if not times:
-                return False
-
-            # 3. Hitung Interval (ms)
-            interval_ms = 100.0 
-            if len(times) > 1:
-                diffs = []
-                for k in range(min(5, len(times)-1)):
-                    diffs.append(times[k+1] - times[k])
-                avg_diff_sec = sum(diffs) / len(diffs)
-                interval_ms = avg_diff_sec * 1000.0
-
-            # 4. Save as JSON (Panggil fungsi yang sudah diperbaiki)
+            # Tulis ke file .tmp dulu; .json hanya muncul jika konversi berhasil
             json_filename = csv_filename.replace(".csv", ".json")
-            return FileHandler.save_edge_impulse_json(
-                json_filename, sample_name, sensor_names, parsed_sensor_data, interval_ms
-            )
+            tmp_filename = json_filename + ".tmp"
+            try:
+                with open(tmp_filename, 'w') as f:
+                    ok = FileHandler.write_csv_as_edge_impulse(csv_filename, f)
+                if ok:
+                    os.replace(tmp_filename, json_filename)
+                return ok
+            finally:
+                if os.path.exists(tmp_filename):
+                    os.remove(tmp_filename)
 
         except Exception as e:
             print(f"Error converting CSV to JSON: {str(e)}")
             return False
 
     @staticmethod
-    def upload_to_edge_impulse(filename: str, api_key: str, label: str = None) -> Tuple[bool, str]:
-        """Upload JSON file directly to Edge Impulse Ingestion API."""
-        url = "https://ingestion.edgeimpulse.com/api/training/files"
-        
+    def edge_impulse_json_bytes(csv_filename: str) -> bytes:
+        """Konversi CSV -> JSON Edge Impulse di memori (tanpa file .json di disk)"""
+        buf = io.StringIO()
+        if not FileHandler.write_csv_as_edge_impulse(csv_filename, buf):
+            raise ValueError(f"Gagal convert {os.path.basename(csv_filename)} ke JSON")
+        return buf.getvalue().encode('utf-8')
+
+    @staticmethod
+    def label_from_filename(filename: str) -> str:
+        """Ambil label dari nama file (bagian sebelum '_' / '-' pertama)"""
+        return os.path.basename(filename).split('_')[0].split('-')[0]
+
+    @staticmethod
+    def upload_to_edge_impulse(filename: str, api_key: str, label: str = None,
+                               session: requests.Session = None, url: str = EI_INGESTION_URL,
+                               timeout: float = EI_UPLOAD_TIMEOUT_S) -> Tuple[bool, str]:
+        """
+        Upload JSON file directly to Edge Impulse Ingestion API.
+        Untuk banyak file sekaligus (koneksi dipakai ulang, retry, progress)
+        gunakan utils.upload_queue.UploadQueue.
+        """
         headers = {
             "x-api-key": api_key,
             "x-disallow-duplicates": "1",
@@ -183,7 +278,7 @@ class FileHandler:
 
             with open(filename, 'rb') as f:
                 files = {'data': (os.path.basename(filename), f, 'application/json')}
-                response = requests.post(url, headers=headers, files=files)
+                response = (session or requests).post(url, headers=headers, files=files, timeout=timeout)
             
             if response.status_code == 200:
                 return True, f"Success: {response.text}"
@@ -191,4 +286,4 @@ class FileHandler:
                 return False, f"Failed ({response.status_code}): {response.text}"
                 
         except Exception as e:
-            return False, f"Connection Error: {str(e)}"
\ No newline at end of file
+            return False, f"Connection Error: {str(e)}"
@@ -0,0 +1,296 @@
+"""Stateful streaming filters for multi-channel sensor data"""
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+from scipy import signal
+from typing import List, Sequence
+
+from config.constants import (
+    NUM_SENSORS, UPDATE_INTERVAL, FILTER_MA_WINDOW, FILTER_EMA_ALPHA,
+    FILTER_HAMPEL_WINDOW, FILTER_HAMPEL_SIGMAS, FILTER_LOWPASS_HZ,
+    FILTER_BASELINE_WARMUP
+)
+
+# Skala MAD -> standar deviasi untuk noise Gaussian
+MAD_SCALE = 1.4826
+
+
+class StreamFilter:
+    """
+    Basis filter streaming. Data selalu berbentuk blok (num_channels, k);
+    state per channel dibawa antar blok sehingga memproses data dalam
+    potongan berapa pun memberi hasil yang sama dengan satu kali apply()
+    pada seluruh data (ekuivalen batch untuk file offline).
+    """
+
+    def __init__(self, num_channels: int = NUM_SENSORS):
+        self.num_channels = num_channels
+        self.reset()
+
+    def reset(self):
+        """Lupakan semua state (mis. saat sesi baru)"""
+
+    def process(self, block: np.ndarray) -> np.ndarray:
+        raise NotImplementedError
+
+    def _check(self, block: np.ndarray) -> np.ndarray:
+        block = np.asarray(block, dtype=np.float64)
+        if block.ndim == 1:
+            block = block[:, None]
+        if block.shape[0] != self.num_channels:
+            raise ValueError(f"block harus berbentuk ({self.num_channels}, k)")
+        return block
+
+    def apply(self, data: np.ndarray) -> np.ndarray:
+        """Versi batch: filter seluruh data (C, N) dari state awal"""
+        self.reset()
+        return self.process(data)
+
+
+class _WindowFilter(StreamFilter):
+    """Filter yang butuh `window - 1` sampel terakhir dari blok sebelumnya"""
+
+    def __init__(self, num_channels: int = NUM_SENSORS, window: int = 5):
+        self.window = max(1, int(window))
+        super().__init__(num_channels)
+
+    def reset(self):
+        self._history = np.empty((self.num_channels, 0))
+
+    def _extend(self, block: np.ndarray) -> np.ndarray:
+        ext = np.concatenate([self._history, block], axis=1)
+        self._history = ext[:, ext.shape[1] - min(self.window - 1, ext.shape[1]):]
+        return ext
+
+
+class MovingAverage(_WindowFilter):
+    """
+    Rata-rata bergerak (trailing) per channel. Sebelum `window` sampel
+    terkumpul, output adalah rata-rata semua sampel yang ada (tanpa padding).
+    """
+
+    def process(self, block):
+        block = self._check(block)
+        k = block.shape[1]
+        if k == 0:
+            return block
+        n_hist = self._history.shape[1]
+        ext = self._extend(block)
+        csum = np.zeros((self.num_channels, ext.shape[1] + 1))
+        np.cumsum(ext, axis=1, out=csum[:, 1:])
+        end = np.arange(n_hist, n_hist + k) + 1
+        start = np.maximum(end - self.window, 0)
+        return (csum[:, end] - csum[:, start]) / (end - start)
+
+
+class ExponentialMovingAverage(StreamFilter):
+    """EMA: y[n] = alpha * x[n] + (1 - alpha) * y[n-1], dimulai dari sampel pertama"""
+
+    def __init__(self, num_channels: int = NUM_SENSORS, alpha: float = FILTER_EMA_ALPHA):
+        self.alpha = float(alpha)
+        self._b = np.array([self.alpha])
+        self._a = np.array([1.0, self.alpha - 1.0])
+        super().__init__(num_channels)
+
+    def reset(self):
+        self._zi = None
+
+    def process(self, block):
+        block = self._check(block)
+        if block.shape[1] == 0:
+            return block
+        if self._zi is None:
+            self._zi = (1.0 - self.alpha) * block[:, :1]
+        out, self._zi = signal.lfilter(self._b, self._a, block, axis=1, zi=self._zi)
+        return out
+
+
+class HampelFilter(_WindowFilter):
+    """
+    Penghapus spike: sampel yang menyimpang lebih dari n_sigmas x MAD dari
+    median `window` sampel terakhir (termasuk dirinya) diganti median itu.
+    Jendela trailing (kausal) agar tidak menambah delay pada data live.
+    """
+
+    def __init__(self, num_channels: int = NUM_SENSORS, window: int = FILTER_HAMPEL_WINDOW,
+                 n_sigmas: float = FILTER_HAMPEL_SIGMAS):
+        self.n_sigmas = float(n_sigmas)
+        super().__init__(num_channels, window)
+
+    def process(self, block):
+        block = self._check(block)
+        k = block.shape[1]
+        if k == 0:
+            return block
+        ext = self._extend(block)
+        pad = self.window - 1 - (ext.shape[1] - k)
+        if pad > 0:
+            # Awal data: ulangi sampel pertama agar jendela penuh
+            ext = np.concatenate([np.repeat(ext[:, :1], pad, axis=1), ext], axis=1)
+        windows = sliding_window_view(ext, self.window, axis=1)[:, -k:]
+        med = np.median(windows, axis=2)
+        mad = MAD_SCALE * np.median(np.abs(windows - med[:, :, None]), axis=2)
+        outlier = np.abs(block - med) > self.n_sigmas * mad
+        return np.where(outlier & (mad > 0), med, block)
+
+
+class LowPassIIR(StreamFilter):
+    """Low-pass Butterworth (scipy.signal.lfilter) dengan state zi per channel"""
+
+    def __init__(self, num_channels: int = NUM_SENSORS, cutoff_hz: float = FILTER_LOWPASS_HZ,
+                 fs: float = 1000.0 / UPDATE_INTERVAL, order: int = 2):
+        self.cutoff_hz = cutoff_hz
+        self.fs = fs
+        self._b, self._a = signal.butter(order, cutoff_hz / (fs / 2.0))
+        self._zi_unit = signal.lfilter_zi(self._b, self._a)
+        super().__init__(num_channels)
+
+    def reset(self):
+        self._zi = None
+
+    def process(self, block):
+        block = self._check(block)
+        if block.shape[1] == 0:
+            return block
+        if self._zi is None:
+            # Mulai dari kondisi tunak di sampel pertama (tanpa transien dari 0)
+            self._zi = self._zi_unit[None, :] * block[:, :1]
+        out, self._zi = signal.lfilter(self._b, self._a, block, axis=1, zi=self._zi)
+        return out
+
+
+class BaselineCorrection(StreamFilter):
+    """
+    Koreksi baseline: output = x - baseline. Baseline = rata-rata `warmup`
+    sampel pertama (udara bersih sebelum sampel masuk); selama warmup
+    dipakai rata-rata sampel yang sudah ada. Jika drift_alpha > 0, baseline
+    setelah warmup terus mengikuti EMA sangat lambat untuk mengoreksi drift.
+    """
+
+    def __init__(self, num_channels: int = NUM_SENSORS, warmup: int = FILTER_BASELINE_WARMUP,
+                 drift_alpha: float = 0.0):
+        self.warmup = max(1, int(warmup))
+        self.drift_alpha = float(drift_alpha)
+        super().__init__(num_channels)
+
+    def reset(self):
+        self._count = 0
+        self._sum = np.zeros((self.num_channels, 1))
+        self._zi = None
+
+    def process(self, block):
+        block = self._check(block)
+        k = block.shape[1]
+        if k == 0:
+            return block
+        baseline = np.empty_like(block)
+
+        # Bagian warmup: rata-rata kumulatif
+        n_warm = min(max(self.warmup - self._count, 0), k)
+        if n_warm:
+            csum = self._sum + np.cumsum(block[:, :n_warm], axis=1)
+            baseline[:, :n_warm] = csum / (self._count + np.arange(1, n_warm + 1))
+            self._sum = csum[:, -1:]
+        self._count += n_warm
+
+        # Setelah warmup: baseline tetap, atau EMA lambat (drift)
+        rest = block[:, n_warm:]
+        if rest.shape[1]:
+            base0 = self._sum / self.warmup
+            if self.drift_alpha > 0:
+                if self._zi is None:
+                    self._zi = (1.0 - self.drift_alpha) * base0
+                baseline[:, n_warm:], self._zi = signal.lfilter(
+                    [self.drift_alpha], [1.0, self.drift_alpha - 1.0], rest, axis=1, zi=self._zi)
+            else:
+                baseline[:, n_warm:] = base0
+        return block - baseline
+
+
+class RunningZScore(StreamFilter):
+    """
+    Z-score terhadap mean/std semua sampel sejauh ini (termasuk sampel
+    saat ini). Jumlah disimpan relatif terhadap sampel pertama agar stabil.
+    """
+
+    def reset(self):
+        self._ref = None
+        self._count = 0
+        self._s1 = np.zeros((self.num_channels, 1))
+        self._s2 = np.zeros((self.num_channels, 1))
+
+    def process(self, block):
+        block = self._check(block)
+        k = block.shape[1]
+        if k == 0:
+            return block
+        if self._ref is None:
+            self._ref = block[:, :1].copy()
+        d = block - self._ref
+        s1 = self._s1 + np.cumsum(d, axis=1)
+        s2 = self._s2 + np.cumsum(d * d, axis=1)
+        n = self._count + np.arange(1, k + 1)
+        self._s1, self._s2, self._count = s1[:, -1:], s2[:, -1:], self._count + k
+        mean = s1 / n
+        std = np.sqrt(np.maximum(s2 / n - mean * mean, 0.0))
+        with np.errstate(invalid='ignore', divide='ignore'):
+            z = (d - mean) / std
+        return np.where(std > 0, z, 0.0)
+
+
+class RunningMinMax(StreamFilter):
+    """Normalisasi 0..1 terhadap min/max semua sampel sejauh ini (0.5 jika datar)"""
+
+    def reset(self):
+        self._min = np.full((self.num_channels, 1), np.inf)
+        self._max = np.full((self.num_channels, 1), -np.inf)
+
+    def process(self, block):
+        block = self._check(block)
+        if block.shape[1] == 0:
+            return block
+        lo = np.minimum.accumulate(np.concatenate([self._min, block], axis=1), axis=1)[:, 1:]
+        hi = np.maximum.accumulate(np.concatenate([self._max, block], axis=1), axis=1)[:, 1:]
+        self._min, self._max = lo[:, -1:], hi[:, -1:]
+        span = hi - lo
+        with np.errstate(invalid='ignore', divide='ignore'):
+            norm = (block - lo) / span
+        return np.where(span > 0, norm, 0.5)
+
+
+class FilterChain(StreamFilter):
+    """Rangkaian filter; output satu filter menjadi input filter berikutnya"""
+
+    def __init__(self, filters: Sequence[StreamFilter], num_channels: int = NUM_SENSORS):
+        self.filters: List[StreamFilter] = list(filters)
+        super().__init__(num_channels)
+
+    def reset(self):
+        for f in self.filters:
+            f.reset()
+
+    def process(self, block):
+        out = self._check(block)
+        for f in self.filters:
+            out = f.process(out)
+        return out
+
+
+# Preset untuk GUI (nama -> pembuat chain)
+FILTER_PRESETS = {
+    "None": lambda n: None,
+    "Moving Average": lambda n: FilterChain([MovingAverage(n, FILTER_MA_WINDOW)], n),
+    "EMA": lambda n: FilterChain([ExponentialMovingAverage(n)], n),
+    "Hampel (Spike)": lambda n: FilterChain([HampelFilter(n)], n),
+    "Low-pass IIR": lambda n: FilterChain([LowPassIIR(n)], n),
+    "Hampel + Low-pass": lambda n: FilterChain([HampelFilter(n), LowPassIIR(n)], n),
+    "Baseline Corrected": lambda n: FilterChain([HampelFilter(n), BaselineCorrection(n)], n),
+    "Normalized 0-1": lambda n: FilterChain([HampelFilter(n), RunningMinMax(n)], n),
+    "Z-Score": lambda n: FilterChain([HampelFilter(n), RunningZScore(n)], n),
+}
+
+
+def build_filter_chain(name: str, num_channels: int = NUM_SENSORS):
+    """Buat chain dari nama preset (None untuk 'None' / nama tidak dikenal)"""
+    factory = FILTER_PRESETS.get(name)
+    return factory(num_channels) if factory else None
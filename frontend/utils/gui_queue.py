@@ -0,0 +1,177 @@
+"""
+Bounded hand-off queue from data sources (network loop / replay thread) to the GUI thread.
+
+Tanpa antrian ini setiap batch menjadi satu event signal Qt; jika GUI
+thread macet (QMessageBox modal, gnuplot, save besar) event menumpuk tanpa
+batas di antrian event Qt. GuiChannel menyimpan item di deque berbatas dan
+hanya menaruh SATU event Qt per channel; GUI mengambil satu item per event
+sehingga timer/paint tetap bisa menyela.
+
+Policy saat GUI tertinggal:
+  block        - antrian penuh -> pengirim menunggu (NetworkWorker berhenti membaca socket,
+                 TCP menahan bridge); tidak ada sampel hilang
+  drop_oldest  - antrian penuh -> item tertua dibuang (dicatat di dropped / dropped_samples)
+  coalesce     - item baru digabung ke item yang masih antre (maksimal
+                 satu antre + satu diproses); GUI menerima
+                 satu batch gabungan (render hanya frame terakhir) tetapi
+                 setiap sampel tetap sampai ke session store
+"""
+
+import asyncio
+import threading
+from collections import deque
+
+import numpy as np
+from PySide6.QtCore import QObject, Qt, Signal
+
+from config.constants import GUI_QUEUE_MAX_BATCHES, GUI_QUEUE_POLICY
+
+POLICY_BLOCK = "block"
+POLICY_DROP_OLDEST = "drop_oldest"
+POLICY_COALESCE = "coalesce"
+POLICIES = (POLICY_BLOCK, POLICY_DROP_OLDEST, POLICY_COALESCE)
+
+
+def _count(payload) -> int:
+    """Jumlah sampel di payload (record array atau dict {device: record array})"""
+    if isinstance(payload, dict):
+        return sum(len(v) for v in payload.values())
+    return len(payload)
+
+
+def _combine(parts: list):
+    """Gabungkan potongan payload hasil coalesce menjadi satu payload"""
+    if len(parts) == 1:
+        return parts[0]
+    if isinstance(parts[0], dict):
+        merged = {}
+        for part in parts:
+            for name, batch in part.items():
+                merged.setdefault(name, []).append(batch)
+        return {name: np.concatenate(b) if len(b) > 1 else b[0] for name, b in merged.items()}
+    return np.concatenate(parts)
+
+
+class GuiChannel(QObject):
+    """
+    Antrian berbatas ke GUI thread. Item = (payload, extra); payload berupa
+    record array SAMPLE_DTYPE atau dict {device: record array}, extra
+    diteruskan apa adanya (untuk coalesce: extra item tertua, mis.
+    first_arrival agar latency tetap jujur).
+
+    put() adalah coroutine untuk loop jaringan (butuh `net`), put_sync()
+    untuk thread biasa (ReplayWorker). Item diteruskan lewat signal
+    `delivered` di GUI thread. depth, high_water, dropped, dropped_samples
+    dan coalesced bisa dibaca kapan saja (stats()).
+    """
+
+    delivered = Signal(object, object)
+    _posted = Signal()
+
+    def __init__(self, net=None, maxsize: int = GUI_QUEUE_MAX_BATCHES,
+                 policy: str = GUI_QUEUE_POLICY, parent=None):
+        super().__init__(parent)
+        if policy not in POLICIES:
+            raise ValueError(f"Unknown GUI queue policy '{policy}' (pilih: {', '.join(POLICIES)})")
+        self.net = net
+        self.maxsize = max(1, int(maxsize))
+        self.policy = policy
+        self._items = deque()       # [daftar potongan payload, extra]
+        self._in_flight = 0         # item yang sedang diproses slot GUI
+        self._posted_pending = False
+        self._cond = threading.Condition()
+        self._space = asyncio.Event() if net is not None else None
+
+        # Metrik (dibaca dari thread mana saja)
+        self.high_water = 0
+        self.delivered_count = 0
+        self.dropped = 0
+        self.dropped_samples = 0
+        self.coalesced = 0
+
+        # Queued: _drain selalu berjalan sebagai event terpisah di GUI thread
+        self._posted.connect(self._drain, Qt.QueuedConnection)
+
+    @property
+    def depth(self) -> int:
+        """Item yang antre + sedang diproses GUI"""
+        return len(self._items) + self._in_flight
+
+    def stats(self) -> dict:
+        with self._cond:
+            return {
+                "policy": self.policy, "depth": self.depth, "high_water": self.high_water,
+                "delivered": self.delivered_count, "dropped": self.dropped,
+                "dropped_samples": self.dropped_samples, "coalesced": self.coalesced,
+            }
+
+    def summary(self) -> str:
+        """Ringkasan satu baris untuk panel info"""
+        s = self.stats()
+        return (f"{s['depth']}/{self.maxsize} (peak {s['high_water']}), "
+                f"drop {s['dropped']}, merged {s['coalesced']} [{s['policy']}]")
+
+    def reset_stats(self):
+        with self._cond:
+            self.high_water = self.depth
+            self.delivered_count = self.dropped = self.dropped_samples = self.coalesced = 0
+
+    # --- Sisi pengirim ---
+    def offer(self, payload, extra=None) -> bool:
+        """Masukkan item tanpa menunggu; False hanya jika penuh dengan policy block"""
+        with self._cond:
+            if self.policy == POLICY_COALESCE and self._items:
+                self._items[-1][0].append(payload)
+                self.coalesced += 1
+            else:
+                if self.depth >= self.maxsize:
+                    if self.policy == POLICY_BLOCK:
+                        return False
+                    if self._items:
+                        # drop_oldest (item yang sedang di GUI tidak bisa dibuang)
+                        parts, _ = self._items.popleft()
+                        self.dropped += 1
+                        self.dropped_samples += sum(_count(p) for p in parts)
+                self._items.append([[payload], extra])
+                self.high_water = max(self.high_water, self.depth)
+            post = not self._posted_pending
+            self._posted_pending = True
+        if post:
+            self._posted.emit()
+        return True
+
+    async def put(self, payload, extra=None):
+        """Coroutine (thread loop): dengan policy block menunggu sampai GUI mengambil item"""
+        while not self.offer(payload, extra):
+            self._space.clear()
+            if self.offer(payload, extra):
+                return
+            await self._space.wait()
+
+    def put_sync(self, payload, extra=None, timeout: float = None) -> bool:
+        """Versi blocking untuk thread biasa; False jika timeout (item tidak masuk)"""
+        with self._cond:
+            return self._cond.wait_for(lambda: self.offer(payload, extra), timeout)
+
+    # --- Sisi GUI thread ---
+    def _drain(self):
+        with self._cond:
+            if not self._items:
+                self._posted_pending = False
+                return
+            parts, extra = self._items.popleft()
+            self._in_flight += 1
+        try:
+            self.delivered.emit(_combine(parts), extra)
+        finally:
+            with self._cond:
+                self._in_flight -= 1
+                self.delivered_count += 1
+                more = bool(self._items)
+                self._posted_pending = more
+                self._cond.notify_all()
+            if self._space is not None:
+                self.net.call(self._space.set)
+            if more:
+                # Sisanya di event berikutnya agar timer/paint sempat berjalan
+                self._posted.emit()
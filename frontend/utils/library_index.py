@@ -0,0 +1,142 @@
+"""Persistent metadata index for the CSV sessions in data/ (Data Library)"""
+
+import json
+import os
+from typing import Dict, List, Tuple
+
+from utils.running_stats import RunningStats
+from utils.session_reader import SessionReader
+
+INDEX_FILENAME = ".library_index.json"
+INDEX_VERSION = 1
+
+
+class LibraryIndex:
+    """
+    Cache metadata file CSV di folder data dalam sidecar JSON
+    (data/.library_index.json), dengan key nama file + mtime + size.
+
+    refresh() hanya memanggil os.scandir (satu stat per file) dan mem-parse
+    ulang file yang baru atau berubah; file lain diambil dari cache. Setiap
+    entry berisi nama/tipe sampel, jumlah titik, durasi, dan statistik
+    ringkas per sensor (min, max, mean, std).
+    """
+
+    def __init__(self, folder: str = "data", index_path: str = None):
+        self.folder = folder
+        self.index_path = index_path or os.path.join(folder, INDEX_FILENAME)
+        self.entries: Dict[str, dict] = {}
+        self._dirty = False
+        self.load()
+
+    # --- Persistensi ---
+    def load(self):
+        try:
+            with open(self.index_path, 'r') as f:
+                doc = json.load(f)
+            if doc.get("version") == INDEX_VERSION:
+                self.entries = doc.get("entries", {})
+        except (OSError, ValueError):
+            self.entries = {}
+
+    def save(self):
+        """Tulis index (atomic: file sementara lalu os.replace) jika ada perubahan"""
+        if not self._dirty:
+            return
+        os.makedirs(self.folder, exist_ok=True)
+        tmp = self.index_path + ".tmp"
+        with open(tmp, 'w') as f:
+            json.dump({"version": INDEX_VERSION, "entries": self.entries}, f, separators=(',', ':'))
+        os.replace(tmp, self.index_path)
+        self._dirty = False
+
+    # --- Scan ---
+    def refresh(self) -> Tuple[List[str], List[str], List[str]]:
+        """
+        Sinkronkan index dengan isi folder.
+        Return (baru, berubah, terhapus) berupa list nama file.
+        """
+        added, updated = [], []
+        seen = set()
+        if os.path.isdir(self.folder):
+            with os.scandir(self.folder) as it:
+                for entry in it:
+                    if not entry.name.endswith(".csv") or not entry.is_file():
+                        continue
+                    seen.add(entry.name)
+                    st = entry.stat()
+                    cached = self.entries.get(entry.name)
+                    if cached and cached["mtime"] == st.st_mtime_ns and cached["size"] == st.st_size:
+                        continue
+                    self.entries[entry.name] = self.summarize(entry.path, st)
+                    (updated if cached else added).append(entry.name)
+
+        removed = [name for name in self.entries if name not in seen]
+        for name in removed:
+            del self.entries[name]
+
+        if added or updated or removed:
+            self._dirty = True
+            self.save()
+        return added, updated, removed
+
+    def update_file(self, path: str) -> dict:
+        """Index ulang satu file (mis. tepat setelah save) tanpa scan folder"""
+        entry = self.summarize(path, os.stat(path))
+        self.entries[os.path.basename(path)] = entry
+        self._dirty = True
+        self.save()
+        return entry
+
+    @staticmethod
+    def summarize(path: str, st: os.stat_result) -> dict:
+        """Parse satu file CSV dan ringkas metadata + statistik per sensor"""
+        entry = {
+            "name": os.path.basename(path),
+            "mtime": st.st_mtime_ns,
+            "size": st.st_size,
+            "sample_name": "Unknown",
+            "sample_type": "Unknown",
+            "points": 0,
+            "duration": 0.0,
+            "sensor_names": [],
+            "stats": None,
+            "error": None,
+        }
+        try:
+            reader = SessionReader(path)
+            times, sensors, _, _ = reader.read_arrays()
+            entry.update(
+                sample_name=reader.sample_name,
+                sample_type=reader.sample_type,
+                sensor_names=reader.sensor_names,
+                points=int(len(times)),
+            )
+            if len(times):
+                entry["duration"] = float(times[-1] - times[0])
+            if len(times) and sensors.shape[0]:
+                stats = RunningStats(sensors.shape[0])
+                stats.update_batch(sensors)
+                entry["stats"] = {
+                    "min": stats.min.tolist(),
+                    "max": stats.max.tolist(),
+                    "mean": stats.mean.tolist(),
+                    "std": stats.std.tolist(),
+                }
+        except Exception as e:
+            # Disimpan agar file rusak tidak di-parse ulang setiap refresh
+            entry["error"] = str(e)
+        return entry
+
+    # --- Query ---
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def get(self, name: str) -> dict:
+        return self.entries.get(os.path.basename(name))
+
+    def path_of(self, name: str) -> str:
+        return os.path.join(self.folder, name)
+
+    def sorted_entries(self, key: str = "mtime", reverse: bool = True) -> List[dict]:
+        return sorted(self.entries.values(), key=lambda e: e[key], reverse=reverse)
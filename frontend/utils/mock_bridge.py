@@ -0,0 +1,311 @@
+"""
+Pure-Python asyncio stand-in for the Rust bridge (ports 8082 + 8083).
+
+Jalankan dari folder frontend (tanpa Rust, InfluxDB, maupun Arduino):
+    python -m utils.mock_bridge [--rate 4] [--jitter-ms 0] [--disconnect-every 0]
+
+Port 8082: protokol perintah yang sama dengan backend (satu baris perintah,
+satu baris ack "OK <CMD>" / "ERR <CMD> <alasan>"). CONNECT_SERIAL <port>
+membuka "serial" virtual; START_SAMPLING / STOP_SAMPLING hanya diterima
+jika serial terhubung.
+
+Port 8083: stream JSON-lines SensorData ke semua klien, atau record biner
+SAMPLE_DTYPE jika klien mengirim "MODE BINARY" saat connect. Selama serial
+terhubung sampel dikirim pada `rate` Hz (IDLE saat tidak sampling, siklus
+FSM sintetis saat sampling). Jitter dan pemutusan koneksi berkala bisa
+diatur untuk uji beban / reconnect.
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import sys
+import threading
+import time
+from typing import List, Optional, Set
+
+import numpy as np
+
+from config.constants import CMD_PORT, DATA_PORT, STATE_IDLE, STATE_NAMES, UPDATE_INTERVAL
+from utils.recordings import synthetic_recording
+from utils.sample_batch import SAMPLE_DTYPE, SENSOR_KEYS
+from utils.stream_protocol import BINARY_MODE_REQUEST, encode_records
+
+# Sama dengan MODE_NEGOTIATION_TIMEOUT_MS di backend/src/main.rs
+MODE_NEGOTIATION_TIMEOUT_S = 0.5
+# Antrian per klien data; klien yang tertinggal lebih dari ini diputus
+CLIENT_QUEUE_MAX = 10000
+
+
+def encode_json_lines(records: np.ndarray) -> bytes:
+    """Record SAMPLE_DTYPE -> JSON-lines seperti serde_json SensorData di backend"""
+    lines = []
+    for r in records:
+        state = int(r['state'])
+        d = {'timestamp': int(r['timestamp'])}
+        d.update({k: round(float(v), 2) for k, v in zip(SENSOR_KEYS, r['sensors'])})
+        d.update({'state': state, 'level': int(r['level']),
+                  'state_name': STATE_NAMES[state] if 0 <= state < len(STATE_NAMES) else "UNKNOWN"})
+        lines.append(json.dumps(d, separators=(',', ':')))
+    return ("\n".join(lines) + "\n").encode() if lines else b""
+
+
+class _DataClient:
+    def __init__(self, writer: asyncio.StreamWriter, binary: bool):
+        self.writer = writer
+        self.binary = binary
+        self.queue: asyncio.Queue = asyncio.Queue(CLIENT_QUEUE_MAX)
+
+
+class MockBridge:
+    """
+    Server 8082/8083 di satu event loop asyncio. start()/stop() menjalankan
+    loop di thread sendiri (untuk benchmark dalam satu proses dengan GUI);
+    serve() bisa dipakai langsung dari asyncio.run().
+
+    Statistik: sent (sampel dibangkitkan), sampled (sampel sejak START
+    terakhir, per klien), delivered (sampel ditulis ke
+    socket, dijumlah semua klien), dropped (sampel untuk klien yang antriannya
+    penuh atau terputus), disconnects, commands.
+    """
+
+    def __init__(self, host: str = "127.0.0.1", cmd_port: int = CMD_PORT, data_port: int = DATA_PORT,
+                 rate_hz: float = 1000.0 / UPDATE_INTERVAL, jitter_ms: float = 0.0,
+                 disconnect_every_s: float = 0.0, records: Optional[np.ndarray] = None, seed: int = 0):
+        self.host = host
+        self.cmd_port = cmd_port
+        self.data_port = data_port
+        self.rate_hz = rate_hz
+        self.jitter_ms = jitter_ms
+        self.disconnect_every_s = disconnect_every_s
+        self.records = synthetic_recording(seed=seed) if records is None else records
+        self._rng = random.Random(seed)
+
+        self.serial_port: Optional[str] = None
+        self.sampling = False
+        self._cursor = 0
+        self._clients: Set[_DataClient] = set()
+        self._cmd_writers: Set[asyncio.StreamWriter] = set()
+        self._handlers: Set[asyncio.Task] = set()
+        self._servers: List[asyncio.AbstractServer] = []
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._stopped: Optional[asyncio.Event] = None
+        self.ready = threading.Event()
+        self.stats = {"sent": 0, "sampled": 0, "delivered": 0, "dropped": 0, "disconnects": 0, "commands": 0,
+                      "clients": 0}
+
+    # --- Port 8082: perintah ---
+    def execute(self, cmd: str) -> str:
+        """Satu perintah -> baris ack (tanpa newline), mengikuti backend Rust"""
+        self.stats["commands"] += 1
+        if cmd.startswith("CONNECT_SERIAL"):
+            parts = cmd.split()
+            if len(parts) < 2:
+                return f"ERR {cmd} Missing port name"
+            self.serial_port = parts[1]
+            return f"OK {cmd}"
+        if cmd == "DISCONNECT_SERIAL":
+            self.serial_port = None
+            self.sampling = False
+            return f"OK {cmd}"
+        if self.serial_port is None:
+            return f"ERR {cmd} Serial not connected"
+        if cmd == "START_SAMPLING":
+            self.sampling = True
+            self._cursor = 0
+            self.stats["sampled"] = 0
+        elif cmd == "STOP_SAMPLING":
+            self.sampling = False
+        return f"OK {cmd}"
+
+    async def _handle_cmd(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self._cmd_writers.add(writer)
+        self._handlers.add(asyncio.current_task())
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                cmd = line.decode('utf-8', errors='replace').strip()
+                if not cmd:
+                    continue
+                writer.write((self.execute(cmd) + "\n").encode())
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            self._cmd_writers.discard(writer)
+            self._handlers.discard(asyncio.current_task())
+            writer.close()
+
+    # --- Port 8083: data ---
+    async def _handle_data(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        binary = False
+        try:
+            line = await asyncio.wait_for(reader.readline(), MODE_NEGOTIATION_TIMEOUT_S)
+            if line.strip() == BINARY_MODE_REQUEST.strip():
+                writer.write(b"OK BINARY\n")
+                binary = True
+        except (asyncio.TimeoutError, ConnectionError):
+            pass
+        client = _DataClient(writer, binary)
+        self._handlers.add(asyncio.current_task())
+        self._clients.add(client)
+        self.stats["clients"] = len(self._clients)
+        try:
+            while True:
+                records = await client.queue.get()
+                if records is None:
+                    break
+                writer.write(encode_records(records) if binary else encode_json_lines(records))
+                await writer.drain()
+                self.stats["delivered"] += len(records)
+        except ConnectionError:
+            pass
+        finally:
+            self._drop_client(client)
+            self._handlers.discard(asyncio.current_task())
+            writer.close()
+
+    def _drop_client(self, client: _DataClient):
+        if client in self._clients:
+            self._clients.discard(client)
+            self.stats["clients"] = len(self._clients)
+            # Sampel yang masih antre untuk klien ini hilang
+            while not client.queue.empty():
+                item = client.queue.get_nowait()
+                if item is not None:
+                    self.stats["dropped"] += len(item)
+
+    def _next_records(self, n: int) -> np.ndarray:
+        """n sampel berikutnya: siklus FSM sintetis saat sampling, IDLE jika tidak"""
+        if self.sampling:
+            idx = (self._cursor + np.arange(n)) % len(self.records)
+            self._cursor += n
+            rec = self.records[idx].copy()
+        else:
+            rec = np.zeros(n, dtype=SAMPLE_DTYPE)
+            rec['sensors'] = self.records['sensors'][0]
+            rec['state'] = STATE_IDLE
+        # Timestamp = waktu kirim (ms epoch) untuk ukur latensi end-to-end
+        rec['timestamp'] = int(time.time() * 1000)
+        return rec
+
+    def _broadcast(self, records: np.ndarray):
+        for client in list(self._clients):
+            try:
+                client.queue.put_nowait(records)
+            except asyncio.QueueFull:
+                self.stats["dropped"] += len(records)
+                self._disconnect(client)
+
+    def _disconnect(self, client: _DataClient):
+        if client not in self._clients:
+            return
+        self.stats["disconnects"] += 1
+        self._drop_client(client)      # Antrian dikosongkan, jadi sentinel pasti muat
+        client.queue.put_nowait(None)
+        client.writer.close()
+
+    async def _produce(self):
+        """Bangkitkan sampel pada rate_hz; tick ~1 ms, jitter menunda tick secara acak"""
+        t0 = time.perf_counter()
+        produced = 0
+        rate = self.rate_hz
+        next_disconnect = t0 + self.disconnect_every_s if self.disconnect_every_s > 0 else None
+        while True:
+            tick = max(0.001, 1.0 / rate)
+            if self.jitter_ms > 0:
+                tick += self._rng.uniform(0, self.jitter_ms) / 1000.0
+            await asyncio.sleep(tick)
+            now = time.perf_counter()
+            # Jadwal dihitung ulang saat serial putus atau rate diubah dari luar
+            if self.serial_port is None or rate != self.rate_hz:
+                t0, produced, rate = now, 0, self.rate_hz
+                continue
+            due = int((now - t0) * rate) - produced
+            if due > 0:
+                records = self._next_records(due)
+                produced += due
+                self.stats["sent"] += due
+                if self.sampling:
+                    self.stats["sampled"] += due
+                self._broadcast(records)
+            if next_disconnect is not None and now >= next_disconnect:
+                next_disconnect = now + self.disconnect_every_s
+                for client in list(self._clients):
+                    self._disconnect(client)
+
+    async def serve(self):
+        self._stopped = asyncio.Event()
+        self._servers = [
+            await asyncio.start_server(self._handle_cmd, self.host, self.cmd_port),
+            await asyncio.start_server(self._handle_data, self.host, self.data_port),
+        ]
+        producer = asyncio.create_task(self._produce())
+        self.ready.set()
+        try:
+            await self._stopped.wait()
+        finally:
+            producer.cancel()
+            for client in list(self._clients):
+                self._disconnect(client)
+            for writer in list(self._cmd_writers):
+                writer.close()
+            # Socket sudah ditutup -> handler selesai sendiri (EOF) sebelum loop berhenti
+            handlers = [t for t in self._handlers if not t.done()]
+            if handlers:
+                await asyncio.wait(handlers, timeout=1.0)
+            for server in self._servers:
+                server.close()
+                await server.wait_closed()
+
+    # --- Thread helper (benchmark satu proses) ---
+    def start(self, timeout: float = 5.0):
+        def runner():
+            self._loop = asyncio.new_event_loop()
+            try:
+                self._loop.run_until_complete(self.serve())
+            finally:
+                self._loop.close()
+
+        self._thread = threading.Thread(target=runner, name="mock-bridge", daemon=True)
+        self._thread.start()
+        if not self.ready.wait(timeout):
+            raise RuntimeError("Mock bridge gagal start")
+
+    def stop(self):
+        if self._loop and self._stopped:
+            self._loop.call_soon_threadsafe(self._stopped.set)
+        if self._thread:
+            self._thread.join(5.0)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m utils.mock_bridge",
+                                     description="Bridge pengganti (8082 perintah, 8083 data) untuk uji tanpa hardware")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--cmd-port", type=int, default=CMD_PORT)
+    parser.add_argument("--data-port", type=int, default=DATA_PORT)
+    parser.add_argument("--rate", type=float, default=1000.0 / UPDATE_INTERVAL, help="sampel per detik")
+    parser.add_argument("--jitter-ms", type=float, default=0.0, help="jitter acak per tick pengiriman")
+    parser.add_argument("--disconnect-every", type=float, default=0.0,
+                        help="putus semua klien data setiap N detik (0 = tidak pernah)")
+    args = parser.parse_args(argv)
+
+    bridge = MockBridge(args.host, args.cmd_port, args.data_port, args.rate,
+                        args.jitter_ms, args.disconnect_every)
+    print(f"Mock bridge: perintah {args.host}:{args.cmd_port}, data {args.host}:{args.data_port}, "
+          f"{args.rate:g} sampel/s (Ctrl+C untuk berhenti)")
+    try:
+        asyncio.run(bridge.serve())
+    except KeyboardInterrupt:
+        pass
+    print(bridge.stats)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
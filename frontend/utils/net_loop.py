@@ -0,0 +1,68 @@
+"""
+Shared asyncio event loop for all bridge sockets (port 8082 + 8083, multi-device)
+
+Satu thread daemon "enose-net" menjalankan satu event loop; BridgeCommander,
+NetworkWorker dan DeviceManager menjadwalkan coroutine ke loop yang sama
+lewat NetworkLoop.instance().submit(). Modul ini bebas Qt.
+"""
+
+import asyncio
+import random
+import threading
+from concurrent.futures import Future
+from typing import Coroutine, Optional
+
+from config.constants import RECONNECT_JITTER
+
+
+class NetworkLoop:
+    """Event loop asyncio di thread sendiri (singleton per proses)"""
+
+    _instance: Optional["NetworkLoop"] = None
+    _lock = threading.Lock()
+
+    @classmethod
+    def instance(cls) -> "NetworkLoop":
+        with cls._lock:
+            if cls._instance is None or not cls._instance.thread.is_alive():
+                cls._instance = cls()
+            return cls._instance
+
+    def __init__(self):
+        self.loop = asyncio.new_event_loop()
+        self.thread = threading.Thread(target=self._run, name="enose-net", daemon=True)
+        self.thread.start()
+
+    def _run(self):
+        asyncio.set_event_loop(self.loop)
+        self.loop.run_forever()
+
+    def submit(self, coro: Coroutine) -> Future:
+        """Jalankan coroutine di loop; return concurrent.futures.Future (thread-safe)"""
+        return asyncio.run_coroutine_threadsafe(coro, self.loop)
+
+    def call(self, fn, *args):
+        """Panggil fungsi biasa di thread loop (mis. release semaphore dari GUI)"""
+        self.loop.call_soon_threadsafe(fn, *args)
+
+
+class Backoff:
+    """
+    Exponential backoff dengan jitter: min_s, 2x, 4x ... sampai max_s, lalu
+    setiap jeda dikalikan acak [1 - jitter, 1] agar banyak klien yang putus
+    bersamaan tidak reconnect serentak.
+    """
+
+    def __init__(self, min_s: float, max_s: float, jitter: float = RECONNECT_JITTER):
+        self.min_s = min_s
+        self.max_s = max_s
+        self.jitter = jitter
+        self.reset()
+
+    def reset(self):
+        self._base = self.min_s
+
+    def next(self) -> float:
+        delay = self._base * random.uniform(1.0 - self.jitter, 1.0)
+        self._base = min(self._base * 2, self.max_s)
+        return delay
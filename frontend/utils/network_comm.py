@@ -1,106 +1,319 @@
 """
 Network communication utilities - COMMAND SENDER & DATA RECEIVER
+
+Semua socket berjalan sebagai coroutine di satu event loop asyncio
+(utils.net_loop.NetworkLoop, thread "enose-net"); GUI thread tidak pernah
+memblok pada jaringan. Hasil dikirim ke GUI lewat signal Qt.
 """
+import asyncio
 import socket
-import json
+import threading
 import time
-from PySide6.QtCore import QThread, Signal
+from concurrent.futures import Future
+from typing import Tuple
+from PySide6.QtCore import QObject, Signal
+
+from config.constants import (
+    BATCH_MAX_SAMPLES, BATCH_WINDOW_MS, STREAM_BINARY, GUI_QUEUE_MAX_BATCHES, GUI_QUEUE_POLICY,
+    CMD_TIMEOUT_S, CMD_RECONNECT_MIN_S, CMD_RECONNECT_MAX_S,
+    DATA_RECONNECT_MIN_S, DATA_RECONNECT_MAX_S
+)
+from utils.gui_queue import GuiChannel
+from utils.net_loop import NetworkLoop, Backoff
+from utils.running_stats import RollingStats
+from utils.sample_batch import SampleBatcher
+from utils.stream_protocol import negotiate_binary, StreamDecoder
 
 # --- BAGIAN 1: PENGIRIM PERINTAH (PYTHON -> RUST) ---
-class BridgeCommander:
+class _BackoffPending(ConnectionError):
+    """Reconnect ditunda karena masih dalam jendela backoff"""
+
+class BridgeCommander(QObject):
     """
     Kelas khusus untuk mengirim perintah kontrol ke Backend Rust (Port 8082).
     Menggantikan fungsi serial langsung di Python.
+
+    Satu koneksi TCP persisten dipakai ulang untuk semua perintah. Perintah
+    dijalankan berurutan (asyncio.Lock) di loop jaringan bersama; setiap
+    perintah menunggu satu baris ack ("OK ..." / "ERR ...") dari Rust. Hasil
+    tersedia lewat Future yang dikembalikan dan signal command_finished.
     """
-    def __init__(self, host: str = "127.0.0.1", port: int = 8082):
-        self.host = host
+
+    # (command, ok, reply, round-trip ms) - dipancarkan dari thread loop
+    command_finished = Signal(str, bool, str, float)
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 8082, parent=None):
+        super().__init__(parent)
+        self._host = host
         self.port = port
+        self._net = NetworkLoop.instance()
+        self._reader = None
+        self._writer = None
+        self._lock = asyncio.Lock()
+
+        # Reconnect dengan exponential backoff (+ jitter)
+        self._backoff = Backoff(CMD_RECONNECT_MIN_S, CMD_RECONNECT_MAX_S)
+        self._next_attempt = 0.0
 
-    def _send(self, command_str: str) -> bool:
-        """Helper internal untuk kirim string via TCP"""
+        # Metrik round-trip per perintah (ms)
+        self.latency = {}
+
+    @property
+    def host(self) -> str:
+        return self._host
+
+    @host.setter
+    def host(self, value: str):
+        if value != self._host:
+            self._host = value
+            self._net.submit(self._close_when_idle())
+
+    # --- Koneksi (thread loop) ---
+    async def _connect(self):
+        now = time.monotonic()
+        if now < self._next_attempt:
+            raise _BackoffPending(f"Backoff reconnect ({self._next_attempt - now:.1f}s lagi)")
         try:
-            with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
-                s.settimeout(2.0) # Timeout 2 detik agar UI tidak hang
-                s.connect((self.host, self.port))
-                s.sendall(f"{command_str}\n".encode('utf-8'))
-                return True
-        except Exception as e:
-            print(f"❌ Bridge Error ({command_str}): {e}")
-            return False
-
-    def connect_serial(self, port_name: str) -> bool:
+            reader, writer = await asyncio.wait_for(
+                asyncio.open_connection(self._host, self.port), CMD_TIMEOUT_S)
+        except (OSError, asyncio.TimeoutError):
+            self._next_attempt = now + self._backoff.next()
+            raise
+        sock = writer.get_extra_info('socket')
+        if sock is not None:
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        self._reader, self._writer = reader, writer
+        self._backoff.reset()
+        self._next_attempt = 0.0
+
+    def _close_socket(self):
+        if self._writer:
+            self._writer.close()
+        self._reader = None
+        self._writer = None
+
+    async def _roundtrip(self, command_str: str) -> str:
+        if self._writer is None:
+            await self._connect()
+        self._writer.write(f"{command_str}\n".encode('utf-8'))
+        await self._writer.drain()
+        reply = await asyncio.wait_for(self._reader.readline(), CMD_TIMEOUT_S)
+        if not reply:
+            raise ConnectionError("Koneksi ditutup backend")
+        return reply.decode('utf-8', errors='replace').strip()
+
+    async def _send(self, command_str: str) -> Tuple[bool, str]:
+        """Kirim + tunggu ack (1x retry jika koneksi basi); perintah tidak saling menyalip"""
+        async with self._lock:
+            t0 = time.perf_counter()
+            ok, reply = False, ""
+            for attempt in range(2):
+                reused = self._writer is not None
+                try:
+                    reply = await self._roundtrip(command_str)
+                    ok = reply.startswith("OK")
+                    break
+                except asyncio.TimeoutError:
+                    # Ack tidak datang: stream bisa tidak sinkron lagi -> tutup
+                    self._close_socket()
+                    reply = "Timeout menunggu ack" if reused or attempt else "Timeout connect"
+                    break
+                except _BackoffPending as e:
+                    reply = str(e)
+                    break
+                except OSError as e:
+                    self._close_socket()
+                    reply = str(e)
+                    if not reused:
+                        break
+                    # Koneksi lama basi (backend restart dll) -> reconnect & coba sekali lagi
+
+            rtt_ms = (time.perf_counter() - t0) * 1000.0
+        name = command_str.split()[0]
+        self.latency.setdefault(name, RollingStats(1, window=50)).update([rtt_ms])
+        if not ok:
+            print(f"❌ Bridge Error ({command_str}): {reply}")
+        self.command_finished.emit(command_str, ok, reply, rtt_ms)
+        return ok, reply
+
+    # --- API publik (non-blocking, return Future[(ok, reply)]) ---
+    def send_command(self, command_str: str) -> Future:
+        return self._net.submit(self._send(command_str))
+
+    def connect_serial(self, port_name: str) -> Future:
         """Minta Rust untuk Connect ke Serial Port"""
-        return self._send(f"CONNECT_SERIAL {port_name}")
+        return self.send_command(f"CONNECT_SERIAL {port_name}")
 
-    def disconnect_serial(self) -> bool:
+    def disconnect_serial(self) -> Future:
         """Minta Rust untuk putus koneksi Serial"""
-        return self._send("DISCONNECT_SERIAL")
+        return self.send_command("DISCONNECT_SERIAL")
 
-    def start_sampling(self) -> bool:
+    def start_sampling(self) -> Future:
         """Minta Rust mulai Sampling (FSM Start)"""
-        return self._send("START_SAMPLING")
+        return self.send_command("START_SAMPLING")
 
-    def stop_sampling(self) -> bool:
+    def stop_sampling(self) -> Future:
         """Minta Rust stop Sampling"""
-        return self._send("STOP_SAMPLING")
+        return self.send_command("STOP_SAMPLING")
+
+    def latency_summary(self) -> dict:
+        """{perintah: (mean ms, max ms, jumlah sampel)}"""
+        return {k: (float(v.mean[0]), float(v.max[0]), v.count) for k, v in self.latency.items()}
+
+    async def _close_when_idle(self):
+        async with self._lock:
+            self._close_socket()
+
+    def close(self, timeout: float = 2 * CMD_TIMEOUT_S):
+        """Tutup koneksi setelah perintah yang antre selesai (maks. timeout detik)"""
+        try:
+            self._net.submit(self._close_when_idle()).result(timeout)
+        except Exception:
+            pass
 
 
 # --- BAGIAN 2: PENERIMA DATA (RUST -> PYTHON) ---
-class NetworkWorker(QThread):
+class LoopWorker(QObject):
     """
-    Worker thread background untuk mendengarkan Data Stream dari Rust (Port 8083).
+    Basis worker berbasis coroutine dengan API mirip QThread: start() menjadwalkan
+    run() di loop jaringan bersama, stop() membatalkannya di thread loop
+    (tanpa menutup socket dari thread lain), wait() menunggu sampai selesai.
     """
-    
-    data_received = Signal(dict)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.is_running = False
+        self._net = NetworkLoop.instance()
+        self._task = None
+        self._done = threading.Event()
+        self._done.set()
+
+    def start(self):
+        if self.isRunning():
+            return
+        self.is_running = True
+        self._done.clear()
+        self._net.submit(self._main())
+
+    def isRunning(self) -> bool:
+        return not self._done.is_set()
+
+    def stop(self):
+        self.is_running = False
+        self._net.call(self._cancel)
+
+    def wait(self, msecs: int = None) -> bool:
+        return self._done.wait(None if msecs is None else msecs / 1000.0)
+
+    def _cancel(self):
+        if self._task is not None:
+            self._task.cancel()
+
+    async def _main(self):
+        self._task = asyncio.current_task()
+        try:
+            if self.is_running:  # stop() sebelum coroutine sempat jalan
+                await self.run()
+        except asyncio.CancelledError:
+            pass
+        finally:
+            self._task = None
+            self._done.set()
+
+    async def run(self):
+        raise NotImplementedError
+
+
+class NetworkWorker(LoopWorker):
+    """
+    Penerima Data Stream dari Rust (Port 8083) sebagai coroutine di loop
+    jaringan bersama. Byte di-decode (StreamDecoder) ke batch record NumPy
+    (SAMPLE_DTYPE), lalu dikirim ke GUI per batch (batch_size sampel atau
+    batch_window_ms) lewat GuiChannel berbatas (utils.gui_queue; policy
+    block / drop_oldest / coalesce saat GUI tertinggal).
+    Jika binary=True, worker menegosiasikan framing biner (stream_protocol)
+    dan otomatis kembali ke JSON bila backend tidak mendukung.
+
+    Putus koneksi -> reconnect dengan backoff eksponensial + jitter.
+    connection_status hanya dipancarkan saat koneksi benar-benar terbentuk
+    (True) / terputus (False); stop() yang disengaja tidak memancarkan False.
+    """
+
+    batch_received = Signal(object, float)  # (record array, perf_counter sampel pertama)
     connection_status = Signal(bool)
-    
-    def __init__(self, host: str, port: int):
-        super().__init__()
+
+    def __init__(self, host: str, port: int, batch_size: int = BATCH_MAX_SAMPLES,
+                 batch_window_ms: float = BATCH_WINDOW_MS, binary: bool = STREAM_BINARY,
+                 queue_size: int = GUI_QUEUE_MAX_BATCHES, queue_policy: str = GUI_QUEUE_POLICY,
+                 parent=None):
+        super().__init__(parent)
         self.host = host
         self.port = port
-        self.is_running = False
-        self.sock = None
-    
-    def run(self):
-        self.is_running = True
+        self.binary = binary
+        self.binary_active = False  # hasil negosiasi koneksi terakhir
+        self.batcher = SampleBatcher(batch_size, batch_window_ms)
+        self.channel = GuiChannel(self._net, queue_size, queue_policy, parent=self)
+        self.channel.delivered.connect(self._on_delivered)
+
+    def _on_delivered(self, batch, first_arrival):
+        self.batch_received.emit(batch, first_arrival)
+
+    async def run(self):
+        backoff = Backoff(DATA_RECONNECT_MIN_S, DATA_RECONNECT_MAX_S)
         while self.is_running:
             try:
-                self.sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-                self.sock.settimeout(5.0) 
-                self.sock.connect((self.host, self.port))
-                
-                # Berhasil Konek
-                self.connection_status.emit(True)
-                self.sock.settimeout(None) # Blocking mode untuk read stream
-                
-                file_obj = self.sock.makefile('r', encoding='utf-8')
-                
-                while self.is_running:
-                    try:
-                        line = file_obj.readline()
-                        if not line: break # Server putus
-                        
-                        # Parse JSON dari Rust
-                        data = json.loads(line.strip())
-                        self.data_received.emit(data)
-                        
-                    except (json.JSONDecodeError, socket.error):
-                        break
-                        
-            except Exception:
-                self.connection_status.emit(False)
-                time.sleep(2) # Retry delay
-                
+                reader, writer = await asyncio.wait_for(
+                    asyncio.open_connection(self.host, self.port), CMD_TIMEOUT_S)
+            except (OSError, asyncio.TimeoutError):
+                await asyncio.sleep(backoff.next())
+                continue
+
+            # Berhasil Konek
+            backoff.reset()
+            self.connection_status.emit(True)
+            try:
+                await self.read_stream(reader, writer)
+            except (OSError, ConnectionError):
+                pass
             finally:
-                self.cleanup()
+                writer.close()
+            await self.flush_batch()
+            if self.is_running:
+                # Putus tiba-tiba (bukan stop()) -> lapor & reconnect
                 self.connection_status.emit(False)
-    
-    def cleanup(self):
-        if self.sock:
-            try: self.sock.close()
-            except: pass
-            self.sock = None
+                await asyncio.sleep(backoff.next())
 
-    def stop(self):
-        self.is_running = False
-        self.cleanup()
\ No newline at end of file
+    async def read_stream(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        """Baca stream sampai EOF; timeout read = sisa jendela batch agar flush berbasis waktu jalan"""
+        self.binary_active, leftover = False, b""
+        if self.binary:
+            self.binary_active, leftover = await negotiate_binary(reader, writer)
+        decoder = StreamDecoder(self.binary_active)
+        await self.add_records(decoder.feed(leftover))
+
+        while self.is_running:
+            left = self.batcher.time_left()
+            try:
+                if left is None:
+                    chunk = await reader.read(65536)
+                else:
+                    chunk = await asyncio.wait_for(reader.read(65536), max(left, 0.001))
+            except asyncio.TimeoutError:
+                await self.flush_batch()
+                continue
+            if not chunk: break # Server putus
+            await self.add_records(decoder.feed(chunk))
+            if self.batcher.is_due():
+                await self.flush_batch()
+
+    async def add_records(self, records):
+        while len(records):
+            taken = self.batcher.add_records(records)
+            records = records[taken:]
+            if self.batcher.is_full():
+                await self.flush_batch()
+
+    async def flush_batch(self):
+        if len(self.batcher):
+            first_arrival = self.batcher.first_arrival
+            await self.channel.put(self.batcher.take(), first_arrival)
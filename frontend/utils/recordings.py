@@ -0,0 +1,84 @@
+"""Session recordings as SAMPLE_DTYPE records: saved CSVs and a synthetic FSM generator"""
+
+import time
+from typing import Optional
+
+import numpy as np
+
+from config.constants import (
+    NUM_SENSORS, UPDATE_INTERVAL, STATE_HOLD, STATE_PURGE, STATE_RAMP_UP, FSM_NUM_LEVELS,
+    FSM_T_PRECOND_S, FSM_T_RAMP_S, FSM_T_HOLD_S, FSM_T_PURGE_S, FSM_T_RECOVERY_S
+)
+from utils.features import schedule_states
+from utils.sample_batch import SAMPLE_DTYPE
+from utils.session_reader import SessionReader
+
+
+def _records(times: np.ndarray, sensors: np.ndarray, states: np.ndarray,
+             levels: np.ndarray, t0_ms: Optional[int] = None) -> np.ndarray:
+    rec = np.zeros(len(times), dtype=SAMPLE_DTYPE)
+    t0_ms = int(time.time() * 1000) if t0_ms is None else t0_ms
+    rec['timestamp'] = t0_ms + np.round((times - (times[0] if len(times) else 0.0)) * 1000.0).astype(np.uint64)
+    rec['sensors'] = sensors[:NUM_SENSORS].T
+    rec['state'] = states
+    rec['level'] = levels
+    return rec
+
+
+def load_recording(path: str) -> np.ndarray:
+    """
+    CSV sesi -> record SAMPLE_DTYPE. File tanpa kolom State/Level diberi
+    state dari jadwal nominal FSM (utils.features.schedule_states).
+    """
+    times, sensors, states, levels = SessionReader(path).read_arrays()
+    if states is None:
+        states, levels = schedule_states(times)
+    return _records(times, sensors, states, levels)
+
+
+def synthetic_recording(levels: int = FSM_NUM_LEVELS, num_sensors: int = NUM_SENSORS,
+                        interval_ms: float = UPDATE_INTERVAL, noise: float = 0.5,
+                        spikes: int = 10, seed: int = 0) -> np.ndarray:
+    """
+    Sinyal sintetis multi-sensor mengikuti jadwal FSM: baseline + drift
+    lambat, respon naik eksponensial selama HOLD (amplitudo bertambah per
+    level, sensitivitas berbeda per sensor), peluruhan selama PURGE, lalu
+    noise Gaussian dan beberapa spike. Deterministik untuk seed yang sama.
+    """
+    rng = np.random.default_rng(seed)
+    dt = interval_ms / 1000.0
+    # Panjang = jadwal `levels` level; rekaman 5 level diakhiri satu sampel DONE
+    n_levels = max(1, min(levels, FSM_NUM_LEVELS))
+    cycle_s = FSM_T_RAMP_S + FSM_T_HOLD_S + FSM_T_PURGE_S + FSM_T_RECOVERY_S
+    n = int(round((FSM_T_PRECOND_S + n_levels * cycle_s) / dt)) + (n_levels == FSM_NUM_LEVELS)
+    times = np.arange(n) * dt
+    states, lv = schedule_states(times)
+
+    baseline = rng.uniform(80.0, 400.0, (num_sensors, 1))
+    gain = rng.uniform(0.05, 0.6, (num_sensors, 1))
+    tau_rise = rng.uniform(10.0, 40.0, (num_sensors, 1))
+    tau_decay = rng.uniform(20.0, 80.0, (num_sensors, 1))
+
+    # Waktu sejak awal state berjalan (vektor, tanpa loop per sampel)
+    change = np.r_[True, states[1:] != states[:-1]]
+    run_start = np.maximum.accumulate(np.where(change, np.arange(n), 0))
+    t_in = (np.arange(n) - run_start) * dt
+    amp = baseline * gain * (1.0 + lv)[None, :] * 0.5
+
+    response = np.zeros((num_sensors, n))
+    hold = states == STATE_HOLD
+    response[:, hold] = amp[:, hold] * (1.0 - np.exp(-t_in[hold] / tau_rise))
+    # PURGE meluruh dari nilai terakhir HOLD
+    purge = states == STATE_PURGE
+    if purge.any():
+        hold_end = np.maximum.accumulate(np.where(hold, np.arange(n), 0))
+        peak = response[:, hold_end]
+        response[:, purge] = peak[:, purge] * np.exp(-t_in[purge] / tau_decay)
+    response[:, (states == STATE_RAMP_UP)] = 0.0
+
+    drift = np.linspace(0.0, 1.0, n)[None, :] * rng.normal(0, 2.0, (num_sensors, 1))
+    sensors = baseline + drift + response + rng.normal(0, noise, (num_sensors, n))
+    if spikes:
+        cols = rng.integers(0, n, spikes)
+        sensors[rng.integers(0, num_sensors, spikes), cols] += baseline.mean() * 0.5
+    return _records(times, sensors, states, lv)
@@ -0,0 +1,137 @@
+"""
+Replay & simulation data sources (DataSource.FILE / DataSource.SIMULATION).
+
+ReplayWorker memancarkan signal yang sama dengan NetworkWorker
+(batch_received, connection_status) sehingga MainWindow, benchmark dan
+soak test bisa berjalan tanpa Arduino / backend Rust. Sumber sampel berupa
+array record SAMPLE_DTYPE dari utils.recordings: CSV tersimpan
+(load_recording) atau generator sinyal sintetis berbentuk siklus FSM
+(synthetic_recording).
+"""
+
+import threading
+import time
+
+import numpy as np
+from PySide6.QtCore import QThread, Signal
+
+from config.constants import UPDATE_INTERVAL, BATCH_MAX_SAMPLES, BATCH_WINDOW_MS, GUI_QUEUE_MAX_BATCHES
+from utils.gui_queue import GuiChannel, POLICY_BLOCK
+
+# Kecepatan replay: 1.0 = real-time, N = N x lebih cepat, 0 = secepatnya
+SPEED_MAX = 0.0
+
+
+class ReplayWorker(QThread):
+    """
+    Sumber data pengganti NetworkWorker: memutar array record pada
+    `speed` x real-time (SPEED_MAX = tanpa jeda). Sampel dilepas per batch
+    (batch_size sampel atau batch_window_ms), persis seperti worker jaringan.
+
+    Setelah start() worker "terhubung" tetapi diam; play() memutar dari
+    awal, pause() menghentikan sementara. loop=True mengulang rekaman
+    terus-menerus (soak test).
+
+    Batch lewat GuiChannel dengan policy block (default): sumber file bisa
+    menunggu, jadi speed Max dibatasi oleh kecepatan GUI, bukan antrian
+    event Qt yang tumbuh tanpa batas.
+    """
+
+    batch_received = Signal(object, float)  # (record array, perf_counter sampel pertama)
+    connection_status = Signal(bool)
+    finished_playback = Signal()
+
+    def __init__(self, records: np.ndarray, speed: float = 1.0, loop: bool = False,
+                 autoplay: bool = False, batch_size: int = BATCH_MAX_SAMPLES,
+                 batch_window_ms: float = BATCH_WINDOW_MS, interval_ms: float = UPDATE_INTERVAL,
+                 queue_size: int = GUI_QUEUE_MAX_BATCHES, queue_policy: str = POLICY_BLOCK):
+        super().__init__()
+        self.records = records
+        self.speed = speed
+        self.loop = loop
+        self.batch_size = max(1, int(batch_size))
+        self.batch_window_s = batch_window_ms / 1000.0
+        self.interval_s = interval_ms / 1000.0
+        self.is_running = False
+        self.emitted = 0
+        self._pos = 0
+        self._rewind = False
+        self._wake = threading.Event()
+        self._playing = threading.Event()
+        if autoplay:
+            self._playing.set()
+        self.channel = GuiChannel(maxsize=queue_size, policy=queue_policy, parent=self)
+        self.channel.delivered.connect(self._on_delivered)
+
+    def _on_delivered(self, batch, first_arrival):
+        self.batch_received.emit(batch, first_arrival)
+
+    # --- Kontrol (dari GUI thread) ---
+    def play(self, rewind: bool = True):
+        # Posisi hanya diubah oleh thread worker; di sini cukup minta rewind
+        self._rewind = rewind
+        self._playing.set()
+        self._wake.set()
+
+    def pause(self):
+        self._playing.clear()
+        self._wake.set()
+
+    def stop(self):
+        self.is_running = False
+        self._playing.set()
+        self._wake.set()
+
+    # --- Thread worker ---
+    def _sleep(self, seconds: float):
+        if seconds > 0:
+            self._wake.wait(seconds)
+            self._wake.clear()
+
+    def run(self):
+        self.is_running = True
+        self.connection_status.emit(True)
+        n = len(self.records)
+        while self.is_running:
+            self._playing.wait()
+            if not self.is_running:
+                break
+            if self._rewind:
+                self._rewind = False
+                self._pos = 0
+            # Jam replay: sampel ke-i jatuh tempo pada t_start + i * interval / speed
+            start_pos = self._pos
+            t_start = time.perf_counter()
+            while self.is_running and self._playing.is_set() and not self._rewind:
+                if self._pos >= n:
+                    if not self.loop:
+                        self._playing.clear()
+                        self.finished_playback.emit()
+                        break
+                    self._pos = start_pos = 0
+                    t_start = time.perf_counter()
+
+                now = time.perf_counter()
+                if self.speed <= SPEED_MAX:
+                    due = n
+                else:
+                    step = self.interval_s / self.speed
+                    due = min(n, start_pos + int((now - t_start) / step) + 1)
+                    # Batch dilepas jika penuh atau jendela batch habis
+                    if due - self._pos < self.batch_size:
+                        first_due = t_start + (self._pos - start_pos) * step
+                        wait = min(first_due + self.batch_window_s,
+                                   t_start + (self._pos - start_pos + self.batch_size) * step) - now
+                        if wait > 0:
+                            self._sleep(wait)
+                            continue
+                if due <= self._pos:
+                    continue
+                stop = min(due, self._pos + self.batch_size)
+                first = now if self.speed <= SPEED_MAX else t_start + (self._pos - start_pos) * step
+                batch = self.records[self._pos:stop].copy()
+                while self.is_running and not self.channel.put_sync(batch, first, timeout=0.1):
+                    pass  # GUI tertinggal (policy block): tunggu, tetap responsif ke stop()
+                self.emitted += stop - self._pos
+                self._pos = stop
+        self.connection_status.emit(False)
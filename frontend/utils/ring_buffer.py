@@ -0,0 +1,92 @@
+"""Fixed-capacity circular buffer backed by a single NumPy array"""
+
+import numpy as np
+from typing import Sequence
+
+
+class RingBuffer:
+    """
+    Buffer melingkar berkapasitas tetap untuk data multi-channel.
+
+    Semua channel (mis. waktu + 7 sensor) disimpan dalam SATU array kontigu
+    berukuran (num_channels, 2 * capacity). Setiap sampel ditulis dua kali
+    (posisi i dan i + capacity), sehingga jendela data terbaru selalu berupa
+    slice kontigu -> append O(1) dan view() tanpa copy untuk setData().
+    """
+
+    def __init__(self, num_channels: int, capacity: int, dtype=np.float64):
+        if num_channels < 1 or capacity < 1:
+            raise ValueError("num_channels dan capacity harus >= 1")
+        self.num_channels = num_channels
+        self.capacity = capacity
+        self._buf = np.zeros((num_channels, 2 * capacity), dtype=dtype)
+        self._start = 0
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    @property
+    def is_full(self) -> bool:
+        return self._size == self.capacity
+
+    def append(self, row: Sequence[float]):
+        """Tambah satu sampel (satu nilai per channel) dalam O(1)"""
+        cap = self.capacity
+        w = (self._start + self._size) % cap
+        self._buf[:, w] = row
+        self._buf[:, w + cap] = row
+        if self._size < cap:
+            self._size += 1
+        else:
+            self._start = (self._start + 1) % cap
+
+    def extend(self, block: np.ndarray):
+        """Tambah banyak sampel sekaligus, block berbentuk (num_channels, k)"""
+        block = np.asarray(block, dtype=self._buf.dtype)
+        if block.ndim != 2 or block.shape[0] != self.num_channels:
+            raise ValueError(f"block harus berbentuk ({self.num_channels}, k)")
+        cap = self.capacity
+        k = block.shape[1]
+        if k == 0:
+            return
+        if k > cap:
+            block = block[:, -cap:]
+            k = cap
+
+        w = (self._start + self._size) % cap
+        # Tulis dalam maksimal dua segmen (sebelum & sesudah wrap-around)
+        first = min(k, cap - w)
+        for offset in (0, cap):
+            self._buf[:, w + offset:w + offset + first] = block[:, :first]
+            if k > first:
+                self._buf[:, offset:offset + k - first] = block[:, first:]
+
+        total = self._size + k
+        if total <= cap:
+            self._size = total
+        else:
+            self._start = (self._start + total - cap) % cap
+            self._size = cap
+
+    def view(self) -> np.ndarray:
+        """View read-only (num_channels, len) berurutan dari yang terlama"""
+        v = self._buf[:, self._start:self._start + self._size]
+        v.flags.writeable = False
+        return v
+
+    def channel(self, index: int) -> np.ndarray:
+        """View read-only satu channel"""
+        return self.view()[index]
+
+    def latest(self) -> np.ndarray:
+        """Salinan sampel terakhir (num_channels,), atau None jika kosong"""
+        if self._size == 0:
+            return None
+        idx = (self._start + self._size - 1) % self.capacity
+        return self._buf[:, idx].copy()
+
+    def clear(self):
+        """Kosongkan buffer tanpa realokasi memori"""
+        self._start = 0
+        self._size = 0
@@ -0,0 +1,172 @@
+"""Incremental (Welford) statistics, vectorized over sensor channels"""
+
+import numpy as np
+from typing import Sequence
+
+from utils.ring_buffer import RingBuffer
+
+
+class RunningStats:
+    """
+    Akumulator statistik O(1) per sampel (algoritma Welford).
+    Menyimpan count, mean, M2, min, max untuk setiap channel sekaligus.
+    """
+
+    def __init__(self, num_channels: int = 1):
+        self.num_channels = num_channels
+        self.reset()
+
+    def reset(self):
+        self.count = 0
+        self.mean = np.zeros(self.num_channels)
+        self.m2 = np.zeros(self.num_channels)
+        self._min = np.full(self.num_channels, np.inf)
+        self._max = np.full(self.num_channels, -np.inf)
+
+    def update(self, values: Sequence[float]):
+        """Tambah satu sampel (satu nilai per channel)"""
+        x = np.asarray(values, dtype=np.float64)
+        self.count += 1
+        delta = x - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (x - self.mean)
+        np.minimum(self._min, x, out=self._min)
+        np.maximum(self._max, x, out=self._max)
+
+    def update_batch(self, block: np.ndarray):
+        """Tambah banyak sampel sekaligus, block berbentuk (num_channels, k)"""
+        block = np.asarray(block, dtype=np.float64).reshape(self.num_channels, -1)
+        if block.shape[1] == 0:
+            return
+        other = RunningStats(self.num_channels)
+        other.count = block.shape[1]
+        other.mean = block.mean(axis=1)
+        other.m2 = ((block - other.mean[:, None]) ** 2).sum(axis=1)
+        other._min = block.min(axis=1)
+        other._max = block.max(axis=1)
+        self.merge(other)
+
+    def merge(self, other: "RunningStats"):
+        """Gabungkan akumulator lain (Chan et al., untuk kombinasi paralel)"""
+        if other.count == 0:
+            return
+        if self.count == 0:
+            self.count = other.count
+            self.mean = other.mean.copy()
+            self.m2 = other.m2.copy()
+            self._min = other.min.copy()
+            self._max = other.max.copy()
+            return
+        n = self.count + other.count
+        delta = other.mean - self.mean
+        self.mean = self.mean + delta * (other.count / n)
+        self.m2 = self.m2 + other.m2 + delta ** 2 * (self.count * other.count / n)
+        self.count = n
+        np.minimum(self._min, other.min, out=self._min)
+        np.maximum(self._max, other.max, out=self._max)
+
+    @property
+    def min(self) -> np.ndarray:
+        return self._min
+
+    @property
+    def max(self) -> np.ndarray:
+        return self._max
+
+    @property
+    def variance(self) -> np.ndarray:
+        """Variansi populasi (ddof=0, sama dengan np.var)"""
+        if self.count == 0:
+            return np.zeros(self.num_channels)
+        return self.m2 / self.count
+
+    @property
+    def std(self) -> np.ndarray:
+        return np.sqrt(self.variance)
+
+    def as_dict(self, channel: int = 0) -> dict:
+        """Ringkasan satu channel dalam format DataProcessor.get_statistics"""
+        if self.count == 0:
+            return {}
+        return {
+            'min': float(self.min[channel]),
+            'max': float(self.max[channel]),
+            'mean': float(self.mean[channel]),
+            'std': float(self.std[channel]),
+            'variance': float(self.variance[channel]),
+        }
+
+
+class RollingStats(RunningStats):
+    """
+    Varian jendela bergulir (N sampel terakhir).
+    Mean/M2 diperbarui O(1) dengan menambah sampel baru dan mengeluarkan
+    sampel terlama; min/max dihitung dari isi jendela saat dibaca.
+    """
+
+    def __init__(self, num_channels: int = 1, window: int = 100):
+        self.window = window
+        self._buffer = RingBuffer(num_channels, window)
+        super().__init__(num_channels)
+
+    def reset(self):
+        super().reset()
+        self._buffer.clear()
+        self._evictions = 0
+
+    def update(self, values: Sequence[float]):
+        x = np.asarray(values, dtype=np.float64)
+        if not self._buffer.is_full:
+            self._buffer.append(x)
+            self.count += 1
+            delta = x - self.mean
+            self.mean += delta / self.count
+            self.m2 += delta * (x - self.mean)
+            return
+
+        old = self._buffer.view()[:, 0].copy()
+        self._buffer.append(x)
+        old_mean = self.mean.copy()
+        self.mean += (x - old) / self.count
+        self.m2 += (x - old) * (x - self.mean + old - old_mean)
+
+        # Resinkronisasi berkala untuk menahan akumulasi error floating point
+        self._evictions += 1
+        if self._evictions >= self.window:
+            self._resync()
+
+    def update_batch(self, block: np.ndarray):
+        block = np.asarray(block, dtype=np.float64).reshape(self.num_channels, -1)
+        self._buffer.extend(block)
+        self._resync()
+
+    def merge(self, other: "RunningStats"):
+        """Tambahkan isi jendela RollingStats lain sebagai sampel terbaru"""
+        if not isinstance(other, RollingStats):
+            # RunningStats biasa tidak menyimpan sampel, jendela tidak bisa dibentuk
+            raise TypeError("RollingStats hanya bisa merge dengan RollingStats")
+        self._buffer.extend(other._buffer.view())
+        self._resync()
+
+    def _resync(self):
+        data = self._buffer.view()
+        self.count = data.shape[1]
+        self._evictions = 0
+        if self.count == 0:
+            self.mean = np.zeros(self.num_channels)
+            self.m2 = np.zeros(self.num_channels)
+            return
+        self.mean = data.mean(axis=1)
+        self.m2 = ((data - self.mean[:, None]) ** 2).sum(axis=1)
+
+    @property
+    def min(self) -> np.ndarray:
+        if len(self._buffer) == 0:
+            return np.full(self.num_channels, np.inf)
+        return self._buffer.view().min(axis=1)
+
+    @property
+    def max(self) -> np.ndarray:
+        if len(self._buffer) == 0:
+            return np.full(self.num_channels, -np.inf)
+        return self._buffer.view().max(axis=1)
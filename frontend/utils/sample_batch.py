@@ -0,0 +1,80 @@
+"""Record layout & batching for the sensor data stream (Port 8083)"""
+
+import time
+import numpy as np
+
+from config.constants import NUM_SENSORS, BATCH_MAX_SAMPLES, BATCH_WINDOW_MS
+
+# Urutan key JSON dari Rust (SensorData di backend/src/main.rs)
+SENSOR_KEYS = ('no2', 'eth', 'voc', 'co', 'co_mics', 'eth_mics', 'voc_mics')
+
+# Satu sampel = satu record (packed, little-endian)
+SAMPLE_DTYPE = np.dtype([
+    ('timestamp', '<u8'),                  # ms sejak epoch (dari backend)
+    ('sensors', '<f4', (NUM_SENSORS,)),
+    ('state', 'i1'),
+    ('level', 'i1'),
+])
+
+
+class SampleBatcher:
+    """
+    Menampung sampel ke array record yang sudah dialokasikan, lalu
+    melepasnya sebagai satu batch saat penuh (max_samples) atau saat
+    jendela waktu (window_ms) sejak sampel pertama sudah lewat.
+    """
+
+    def __init__(self, max_samples: int = BATCH_MAX_SAMPLES, window_ms: float = BATCH_WINDOW_MS):
+        self.max_samples = max(1, int(max_samples))
+        self.window_s = window_ms / 1000.0
+        self._buf = np.zeros(self.max_samples, dtype=SAMPLE_DTYPE)
+        self._count = 0
+        self.first_arrival = 0.0  # perf_counter() sampel pertama di batch
+
+    def __len__(self) -> int:
+        return self._count
+
+    def add_json(self, data: dict):
+        """Masukkan satu objek JSON hasil decode"""
+        if self._count == 0:
+            self.first_arrival = time.perf_counter()
+        self._buf[self._count] = (
+            int(data.get('timestamp', 0)),
+            tuple(float(data.get(k, 0)) for k in SENSOR_KEYS),
+            int(data.get('state', 0)),
+            int(data.get('level', 0)),
+        )
+        self._count += 1
+
+    def add_records(self, records: np.ndarray) -> int:
+        """Salin record SAMPLE_DTYPE sebanyak muat; return jumlah yang diambil"""
+        if self._count == 0 and len(records):
+            self.first_arrival = time.perf_counter()
+        n = min(len(records), self.max_samples - self._count)
+        self._buf[self._count:self._count + n] = records[:n]
+        self._count += n
+        return n
+
+    def is_full(self) -> bool:
+        return self._count >= self.max_samples
+
+    def is_due(self, now: float = None) -> bool:
+        """True jika batch penuh atau jendela waktunya sudah habis"""
+        if self._count == 0:
+            return False
+        if self._count >= self.max_samples:
+            return True
+        now = time.perf_counter() if now is None else now
+        return (now - self.first_arrival) >= self.window_s
+
+    def time_left(self) -> float:
+        """Sisa detik sebelum batch jatuh tempo (None jika batch kosong)"""
+        if self._count == 0:
+            return None
+        return max(0.0, self.window_s - (time.perf_counter() - self.first_arrival))
+
+    def take(self) -> np.ndarray:
+        """Ambil salinan batch (aman dikirim lintas thread) dan reset"""
+        batch = self._buf[:self._count].copy()
+        self._count = 0
+        return batch
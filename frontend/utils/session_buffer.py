@@ -0,0 +1,122 @@
+"""Columnar, array-backed store for one sampling session"""
+
+import numpy as np
+from typing import Sequence, Tuple
+
+from config.constants import NUM_SENSORS
+
+
+class SessionBuffer:
+    """
+    Penyimpanan sesi sampling dalam kolom NumPy yang bisa tumbuh.
+
+    Kolom: waktu (float64), sensor (num_sensors x N, float32/float64),
+    state FSM (int8) dan level (int8). Kapasitas digandakan saat penuh
+    (amortized O(1) per append). Semua accessor mengembalikan view
+    read-only, jadi dashboard, statistik dan exporter membaca memori yang
+    sama tanpa salinan atau konversi list.
+    """
+
+    def __init__(self, num_sensors: int = NUM_SENSORS, initial_capacity: int = 1024,
+                 dtype=np.float64):
+        self.num_sensors = num_sensors
+        self.dtype = np.dtype(dtype)
+        self._initial_capacity = max(1, initial_capacity)
+        self._allocate(self._initial_capacity)
+        self._size = 0
+
+    def _allocate(self, capacity: int):
+        self._times = np.zeros(capacity, dtype=np.float64)
+        self._sensors = np.zeros((self.num_sensors, capacity), dtype=self.dtype)
+        self._state = np.zeros(capacity, dtype=np.int8)
+        self._level = np.zeros(capacity, dtype=np.int8)
+
+    @property
+    def capacity(self) -> int:
+        return self._times.shape[0]
+
+    def __len__(self) -> int:
+        return self._size
+
+    def _reserve(self, needed: int):
+        """Pastikan kapasitas >= needed (growth strategy: doubling)"""
+        if needed <= self.capacity:
+            return
+        new_cap = self.capacity
+        while new_cap < needed:
+            new_cap *= 2
+        n = self._size
+        old = (self._times, self._sensors, self._state, self._level)
+        self._allocate(new_cap)
+        self._times[:n] = old[0][:n]
+        self._sensors[:, :n] = old[1][:, :n]
+        self._state[:n] = old[2][:n]
+        self._level[:n] = old[3][:n]
+
+    def append(self, time_val: float, sensor_vals: Sequence[float], state: int = 0, level: int = 0):
+        """Tambah satu sampel"""
+        self._reserve(self._size + 1)
+        i = self._size
+        vals = sensor_vals[:self.num_sensors]
+        self._times[i] = time_val
+        self._sensors[:len(vals), i] = vals
+        self._sensors[len(vals):, i] = 0.0
+        self._state[i] = state
+        self._level[i] = level
+        self._size += 1
+
+    def extend(self, times: np.ndarray, sensors: np.ndarray, states=0, levels=0):
+        """Tambah banyak sampel; sensors berbentuk (num_sensors, k)"""
+        times = np.asarray(times, dtype=np.float64)
+        k = times.shape[0]
+        if k == 0:
+            return
+        self._reserve(self._size + k)
+        sl = slice(self._size, self._size + k)
+        self._times[sl] = times
+        self._sensors[:, sl] = sensors
+        self._state[sl] = states
+        self._level[sl] = levels
+        self._size += k
+
+    def clear(self):
+        """
+        Kosongkan sesi dengan array baru berkapasitas awal. Array lama tidak
+        pernah ditulis ulang, jadi view yang masih dipegang (mis. export di
+        background) tetap menjadi snapshot yang valid.
+        """
+        self._allocate(self._initial_capacity)
+        self._size = 0
+
+    @staticmethod
+    def _ro(arr: np.ndarray) -> np.ndarray:
+        arr.flags.writeable = False
+        return arr
+
+    # --- Read-only views ---
+    @property
+    def times(self) -> np.ndarray:
+        return self._ro(self._times[:self._size])
+
+    @property
+    def sensors(self) -> np.ndarray:
+        """View (num_sensors, N)"""
+        return self._ro(self._sensors[:, :self._size])
+
+    @property
+    def state(self) -> np.ndarray:
+        return self._ro(self._state[:self._size])
+
+    @property
+    def level(self) -> np.ndarray:
+        return self._ro(self._level[:self._size])
+
+    @property
+    def last_time(self) -> float:
+        return float(self._times[self._size - 1]) if self._size else 0.0
+
+    def tail(self, n: int) -> Tuple[np.ndarray, np.ndarray]:
+        """View (times, sensors) untuk n sampel terakhir"""
+        start = max(0, self._size - n)
+        return (self._ro(self._times[start:self._size]),
+                self._ro(self._sensors[:, start:self._size]))
@@ -0,0 +1,171 @@
+"""Fast reader for saved 'Electronic Nose Data Export' CSV sessions"""
+
+import mmap
+import os
+import numpy as np
+from typing import Dict, List, Optional, Sequence, Tuple, Union
+
+MAX_HEADER_LINES = 15
+# Kolom opsional di akhir (FSM state & level), tidak ada di file lama
+META_COLUMNS = ("State", "Level")
+
+ColumnSpec = Union[None, int, str, Sequence[Union[int, str]]]
+
+
+class SessionReader:
+    """
+    Membaca file CSV hasil FileHandler.save_as_csv.
+
+    Blok metadata dibaca sekali saat konstruksi (nama, tipe, jumlah titik,
+    offset byte awal data). Body numerik dimuat dalam satu pass vektor
+    (np.loadtxt, parser C) ke array kolom (kolom, baris). Untuk file besar,
+    read() mendukung pemilihan kolom dan rentang baris; rentang baris
+    memakai indeks offset baris dari mmap sehingga hanya bagian yang
+    diminta yang di-parse.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.metadata: Dict[str, str] = {}
+        self.columns: List[str] = []
+        self.data_offset = 0   # byte offset baris data pertama
+        self.header_lines = 0  # jumlah baris sebelum data (untuk skiprows)
+        self._line_offsets = None
+        self._parse_header()
+
+    # --- Metadata ---
+    def _parse_header(self):
+        with open(self.path, 'rb') as f:
+            offset = 0
+            for i in range(MAX_HEADER_LINES):
+                raw = f.readline()
+                if not raw:
+                    break
+                offset += len(raw)
+                fields = [x.strip() for x in raw.decode('utf-8', errors='replace').strip().split(',')]
+                if fields and fields[0].startswith("Time"):
+                    self.columns = fields
+                    self.data_offset = offset
+                    self.header_lines = i + 1
+                    return
+                if len(fields) >= 2 and fields[0]:
+                    self.metadata[fields[0]] = ",".join(fields[1:])
+        raise ValueError(f"Format CSV tidak dikenali: {self.path}")
+
+    @property
+    def sample_name(self) -> str:
+        return self.metadata.get("Sample Name", "Unknown")
+
+    @property
+    def sample_type(self) -> str:
+        return self.metadata.get("Sample Type", "Unknown")
+
+    @property
+    def sensor_columns(self) -> List[int]:
+        """Index kolom sensor (tanpa waktu & kolom State/Level)"""
+        return [i for i, c in enumerate(self.columns) if i > 0 and c not in META_COLUMNS]
+
+    @property
+    def sensor_names(self) -> List[str]:
+        return [self.columns[i] for i in self.sensor_columns]
+
+    @property
+    def has_state(self) -> bool:
+        return all(c in self.columns for c in META_COLUMNS)
+
+    @property
+    def num_points(self) -> int:
+        """Jumlah titik dari metadata (tanpa membaca body); fallback hitung baris"""
+        try:
+            return int(self.metadata["Number of Points"])
+        except (KeyError, ValueError):
+            return len(self._offsets()) - 1
+
+    # --- Body ---
+    def _resolve_columns(self, columns: ColumnSpec) -> Optional[List[int]]:
+        if columns is None:
+            return None
+        if isinstance(columns, (int, str)):
+            columns = [columns]
+        return [self.columns.index(c) if isinstance(c, str) else int(c) for c in columns]
+
+    def _offsets(self) -> np.ndarray:
+        """Offset byte awal setiap baris data (+ offset akhir), dihitung sekali via mmap"""
+        if self._line_offsets is None:
+            size = os.path.getsize(self.path)
+            if size <= self.data_offset:
+                self._line_offsets = np.array([self.data_offset], dtype=np.int64)
+                return self._line_offsets
+            with open(self.path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                body = np.frombuffer(mm, dtype=np.uint8, offset=self.data_offset)
+                newlines = np.flatnonzero(body == ord('\n')) + 1 + self.data_offset
+                del body  # lepas referensi sebelum mmap ditutup
+            ends = newlines if len(newlines) and newlines[-1] == size else np.append(newlines, size)
+            # Buang baris kosong di akhir file
+            starts = np.concatenate(([self.data_offset], ends[:-1]))
+            keep = (ends - starts) > 2
+            self._line_offsets = np.append(starts[keep], ends[keep][-1] if keep.any() else self.data_offset)
+        return self._line_offsets
+
+    def _parse(self, lines, usecols) -> np.ndarray:
+        """lines = None berarti seluruh body file"""
+        try:
+            if lines is None:
+                return np.loadtxt(self.path, delimiter=',', skiprows=self.header_lines,
+                                  usecols=usecols, ndmin=2, dtype=np.float64)
+            return np.loadtxt(lines, delimiter=',', usecols=usecols, ndmin=2, dtype=np.float64)
+        except ValueError:
+            # Baris rusak/terpotong: parse toleran lalu buang baris yang tidak lengkap
+            if lines is None:
+                with open(self.path, 'r') as f:
+                    lines = f.read().splitlines()[self.header_lines:]
+            arr = np.genfromtxt(lines, delimiter=',', usecols=usecols, invalid_raise=False, ndmin=2)
+            return arr[~np.isnan(arr).any(axis=1)]
+
+    def read(self, columns: ColumnSpec = None, rows: slice = None) -> np.ndarray:
+        """
+        Muat data numerik sebagai array kolom berbentuk (len(columns), N).
+        columns: index/nama kolom (None = semua, termasuk waktu di kolom 0).
+        rows: slice baris data (mis. slice(1000, 2000)); None = semua.
+        """
+        usecols = self._resolve_columns(columns)
+        n_cols = len(usecols) if usecols is not None else len(self.columns)
+        if rows is None:
+            arr = self._parse(None, usecols)
+        else:
+            offsets = self._offsets()
+            start, stop, step = rows.indices(len(offsets) - 1)
+            if stop <= start:
+                return np.empty((n_cols, 0))
+            with open(self.path, 'rb') as f:
+                f.seek(int(offsets[start]))
+                chunk = f.read(int(offsets[stop] - offsets[start]))
+            arr = self._parse(chunk.decode('utf-8', errors='replace').splitlines(), usecols)
+            if step != 1:
+                arr = arr[::step]
+        if arr.size == 0:
+            return np.empty((n_cols, 0))
+        return np.ascontiguousarray(arr.T)
+
+    def read_times(self, rows: slice = None) -> np.ndarray:
+        return self.read(0, rows)[0]
+
+    def read_sensors(self, rows: slice = None) -> np.ndarray:
+        """Array (num_sensors, N)"""
+        return self.read(self.sensor_columns, rows)
+
+    def read_arrays(self, rows: slice = None) -> Tuple[np.ndarray, np.ndarray,
+                                                       Optional[np.ndarray], Optional[np.ndarray]]:
+        """
+        Satu pass parse -> (times, sensors (S, N), state, level).
+        state/level (int8) bernilai None untuk file lama tanpa kolom tsb.
+        """
+        data = self.read(None, rows)
+        times = data[0]
+        sensors = data[self.sensor_columns]
+        if not self.has_state:
+            return times, sensors, None, None
+        state = data[self.columns.index("State")].astype(np.int8)
+        level = data[self.columns.index("Level")].astype(np.int8)
+        return times, sensors, state, level
+
@@ -0,0 +1,128 @@
+"""
+Framing untuk data stream port 8083.
+
+Default: JSON-lines (satu objek SensorData per baris).
+Opsional: mode biner yang dinegosiasikan. Klien mengirim "MODE BINARY\\n"
+segera setelah connect; backend yang mendukung membalas "OK BINARY\\n"
+lalu mengirim record little-endian berukuran tetap (SAMPLE_DTYPE):
+u64 timestamp, 7 x f32 sensor, i8 state, i8 level = 38 byte.
+Backend lama tidak membalas, jadi klien otomatis kembali ke JSON.
+"""
+
+import asyncio
+import json
+import socket
+import numpy as np
+from typing import Optional, Tuple
+
+from utils.sample_batch import SAMPLE_DTYPE, SENSOR_KEYS
+
+RECORD_SIZE = SAMPLE_DTYPE.itemsize
+BINARY_MODE_REQUEST = b"MODE BINARY\n"
+BINARY_MODE_ACK = b"OK BINARY"
+
+
+async def negotiate_binary(reader: asyncio.StreamReader, writer: asyncio.StreamWriter,
+                           timeout: float = 1.0) -> Tuple[bool, bytes]:
+    """
+    Minta mode biner. Return (ok, leftover): jika backend tidak mendukung,
+    leftover berisi baris JSON yang sudah terbaca (diproses sebagai fallback).
+    Data setelah baris ack tetap di buffer reader.
+    """
+    writer.write(BINARY_MODE_REQUEST)
+    await writer.drain()
+    try:
+        line = await asyncio.wait_for(reader.readline(), timeout)
+    except asyncio.TimeoutError:
+        return False, b""  # Byte parsial tetap di buffer StreamReader
+    if not line:
+        raise ConnectionError("Server menutup koneksi saat negosiasi")
+    if line.strip() == BINARY_MODE_ACK:
+        return True, b""
+    return False, line
+
+
+class StreamDecoder:
+    """
+    Decode potongan byte stream 8083 menjadi array record SAMPLE_DTYPE.
+    JSON-lines: baris tidak lengkap disimpan sampai potongan berikutnya,
+    baris rusak dilewati. Biner: record parsial disimpan dengan cara sama.
+    """
+
+    def __init__(self, binary: bool = False):
+        self.binary = binary
+        self._pending = bytearray()
+
+    def feed(self, chunk: bytes) -> np.ndarray:
+        self._pending += chunk
+        if self.binary:
+            count = len(self._pending) // RECORD_SIZE
+            records = np.frombuffer(bytes(self._pending[:count * RECORD_SIZE]), dtype=SAMPLE_DTYPE)
+            del self._pending[:count * RECORD_SIZE]
+            return records
+
+        end = self._pending.rfind(b"\n")
+        if end < 0:
+            return np.empty(0, dtype=SAMPLE_DTYPE)
+        lines = bytes(self._pending[:end]).split(b"\n")
+        del self._pending[:end + 1]
+        rows = []
+        for line in lines:
+            if not line.strip():
+                continue
+            try:
+                d = json.loads(line)
+                rows.append((int(d.get('timestamp', 0)),
+                             tuple(float(d.get(k, 0)) for k in SENSOR_KEYS),
+                             int(d.get('state', 0)), int(d.get('level', 0))))
+            except (json.JSONDecodeError, ValueError, TypeError, AttributeError):
+                continue
+        return np.array(rows, dtype=SAMPLE_DTYPE)
+
+
+class BinaryRecordReader:
+    """
+    Membaca record biner langsung ke buffer yang sudah dialokasikan
+    (recv_into + memoryview) dan mengembalikannya sebagai view np.frombuffer,
+    tanpa membuat objek Python per record.
+    """
+
+    def __init__(self, sock: socket.socket, max_records: int = 1024, initial: bytes = b""):
+        self.sock = sock
+        size = RECORD_SIZE * max(max_records, 1 + len(initial) // RECORD_SIZE)
+        self._buf = bytearray(size)
+        self._view = memoryview(self._buf)
+        self._view[:len(initial)] = initial
+        self._fill = len(initial)
+        self._consumed = 0
+
+    def _compact(self):
+        """Geser sisa record parsial ke awal buffer"""
+        if self._consumed:
+            rem = self._fill - self._consumed
+            self._view[:rem] = self._view[self._consumed:self._fill]
+            self._fill = rem
+            self._consumed = 0
+
+    def read(self) -> Optional[np.ndarray]:
+        """
+        Blok sampai ada data (mengikuti timeout socket). Return view record
+        lengkap (valid sampai read() berikutnya), atau None jika EOF.
+        """
+        self._compact()
+        if self._fill < RECORD_SIZE:
+            n = self.sock.recv_into(self._view[self._fill:])
+            if n == 0:
+                return None
+            self._fill += n
+        return self._take()
+
+    def _take(self) -> np.ndarray:
+        count = self._fill // RECORD_SIZE
+        self._consumed = count * RECORD_SIZE
+        return np.frombuffer(self._buf, dtype=SAMPLE_DTYPE, count=count)
+
+
+def encode_records(records: np.ndarray) -> bytes:
+    """Serialisasi record SAMPLE_DTYPE ke format wire (untuk test/benchmark/simulator)"""
+    return np.ascontiguousarray(records, dtype=SAMPLE_DTYPE).tobytes()
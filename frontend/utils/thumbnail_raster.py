@@ -0,0 +1,80 @@
+"""NumPy rasterizer for small session previews (no Qt / gnuplot needed)"""
+
+import numpy as np
+from typing import Sequence
+
+from config.constants import PLOT_COLORS, THUMB_WIDTH, THUMB_HEIGHT
+
+BACKGROUND = (255, 255, 255)
+GRID = (235, 235, 235)
+
+
+def hex_to_rgb(color: str) -> tuple:
+    color = color.lstrip('#')
+    return tuple(int(color[i:i + 2], 16) for i in (0, 2, 4))
+
+
+def column_envelope(x: np.ndarray, y: np.ndarray, width: int):
+    """
+    Bagi sampel ke `width` kolom piksel (x sudah terurut) dan hitung
+    (lo, hi) per kolom. Rentang tiap kolom diperluas ke nilai terakhir
+    kolom sebelumnya agar garis tetap tersambung.
+    Kolom tanpa sampel berisi NaN.
+    """
+    lo = np.full(width, np.nan)
+    hi = np.full(width, np.nan)
+    if len(x) == 0:
+        return lo, hi
+    span = x[-1] - x[0]
+    cols = np.zeros(len(x), dtype=np.int64) if span <= 0 else \
+        np.minimum(((x - x[0]) / span * (width - 1)).astype(np.int64), width - 1)
+
+    starts = np.flatnonzero(np.r_[True, cols[1:] != cols[:-1]])
+    used = cols[starts]
+    lo[used] = np.minimum.reduceat(y, starts)
+    hi[used] = np.maximum.reduceat(y, starts)
+
+    # Sambungkan ke titik terakhir kolom sebelumnya
+    last = y[np.r_[starts[1:], len(y)] - 1]
+    lo[used[1:]] = np.minimum(lo[used[1:]], last[:-1])
+    hi[used[1:]] = np.maximum(hi[used[1:]], last[:-1])
+    return lo, hi
+
+
+def render_thumbnail(times: np.ndarray, sensors: np.ndarray,
+                     width: int = THUMB_WIDTH, height: int = THUMB_HEIGHT,
+                     colors: Sequence[str] = PLOT_COLORS, margin: int = 3) -> np.ndarray:
+    """
+    Gambar semua sensor (skala Y bersama, seperti grafik dashboard) ke
+    array RGB (height, width, 3) uint8. sensors berbentuk (S, N).
+    """
+    img = np.empty((height, width, 3), dtype=np.uint8)
+    img[:] = BACKGROUND
+    img[::max(1, height // 4), :] = GRID
+    img[:, ::max(1, width // 8)] = GRID
+
+    sensors = np.asarray(sensors, dtype=np.float64)
+    if sensors.size == 0 or len(times) == 0:
+        return img
+
+    finite = sensors[np.isfinite(sensors)]
+    if finite.size == 0:
+        return img
+    y_min, y_max = finite.min(), finite.max()
+    y_span = (y_max - y_min) or 1.0
+    plot_w = width - 2 * margin
+    plot_h = height - 2 * margin
+    rows = np.arange(height)[:, None]
+
+    for s_idx, series in enumerate(sensors):
+        lo, hi = column_envelope(np.asarray(times, dtype=np.float64), series, plot_w)
+        valid = ~np.isnan(lo)
+        # Nilai besar di atas: baris piksel = margin + (1 - norm) * plot_h
+        top = np.full(width, height, dtype=np.int64)
+        bottom = np.full(width, -1, dtype=np.int64)
+        top[margin:margin + plot_w][valid] = margin + np.round((1 - (hi[valid] - y_min) / y_span) * (plot_h - 1)).astype(np.int64)
+        bottom[margin:margin + plot_w][valid] = margin + np.round((1 - (lo[valid] - y_min) / y_span) * (plot_h - 1)).astype(np.int64)
+        # Garis tebal 2 px
+        mask = (rows >= top - 1) & (rows <= bottom)
+        img[mask] = hex_to_rgb(colors[s_idx % len(colors)])
+    return img
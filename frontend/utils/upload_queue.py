@@ -0,0 +1,186 @@
+"""Antrian upload banyak file CSV ke Edge Impulse (background, paralel)"""
+
+import os
+import random
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, List, Tuple
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3 import encode_multipart_formdata
+from PySide6.QtCore import QObject, Signal
+
+from config.constants import (
+    EI_INGESTION_URL, EI_UPLOAD_WORKERS, EI_UPLOAD_TIMEOUT_S,
+    EI_UPLOAD_RETRIES, EI_RETRY_BACKOFF_S
+)
+from utils.file_handler import FileHandler
+
+RETRY_STATUS = {429, 500, 502, 503, 504}
+UPLOAD_BLOCK_SIZE = 64 * 1024
+
+
+class _ProgressBody:
+    """Body request (bytes) yang melaporkan jumlah byte terkirim saat dibaca"""
+
+    def __init__(self, data: bytes, callback: Callable[[int, int], None]):
+        self._data = data
+        self._pos = 0
+        self._callback = callback
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def read(self, size: int = -1) -> bytes:
+        if size is None or size < 0:
+            size = len(self._data) - self._pos
+        size = min(size, UPLOAD_BLOCK_SIZE)
+        chunk = self._data[self._pos:self._pos + size]
+        self._pos += len(chunk)
+        if chunk:
+            self._callback(self._pos, len(self._data))
+        return chunk
+
+
+class UploadQueue(QObject):
+    """
+    Upload banyak file ke Edge Impulse Ingestion API.
+
+    Satu requests.Session (pool koneksi keep-alive, TLS tidak diulang per
+    file) dipakai oleh thread pool berukuran tetap. CSV dikonversi ke JSON
+    di memori tepat sebelum dikirim. Timeout, error koneksi, HTTP 5xx dan
+    429 di-retry dengan exponential backoff; error 4xx lain langsung gagal.
+    Signal dipancarkan dari thread worker (Qt meneruskannya ke GUI thread).
+    """
+
+    file_started = Signal(str)                 # path CSV
+    file_progress = Signal(str, int)           # (path, 0..100 %)
+    file_finished = Signal(str, bool, str)     # (path, berhasil, pesan)
+    all_finished = Signal(int, int)            # (berhasil, gagal)
+
+    def __init__(self, api_key: str, url: str = EI_INGESTION_URL,
+                 max_workers: int = EI_UPLOAD_WORKERS, retries: int = EI_UPLOAD_RETRIES,
+                 timeout: float = EI_UPLOAD_TIMEOUT_S, backoff: float = EI_RETRY_BACKOFF_S,
+                 parent=None):
+        super().__init__(parent)
+        self.api_key = api_key
+        self.url = url
+        self.retries = retries
+        self.timeout = timeout
+        self.backoff = backoff
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=max_workers)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="ei-upload")
+
+        self._lock = threading.Lock()
+        self._cancel = threading.Event()
+        self._pending = 0
+        self._ok = 0
+        self._failed = 0
+
+    # --- API publik ---
+    def submit(self, csv_path: str, label: str = None) -> Future:
+        """Masukkan satu file ke antrian; Future berisi (ok, pesan)"""
+        return self.submit_all([csv_path], [label])[0]
+
+    def submit_all(self, csv_paths: List[str], labels: List[str] = None) -> List[Future]:
+        """
+        Masukkan banyak file sekaligus. Label default diambil dari nama file.
+        all_finished dipancarkan sekali setelah semua file di antrian selesai.
+        """
+        labels = labels or [None] * len(csv_paths)
+        with self._lock:
+            self._pending += len(csv_paths)
+        return [self._executor.submit(self._run, path,
+                                      label if label is not None else FileHandler.label_from_filename(path))
+                for path, label in zip(csv_paths, labels)]
+
+    def cancel(self):
+        """Batalkan file yang belum mulai (upload yang sedang jalan dibiarkan selesai)"""
+        self._cancel.set()
+
+    def is_busy(self) -> bool:
+        with self._lock:
+            return self._pending > 0
+
+    def close(self):
+        """
+        Tutup antrian tanpa memblok GUI: file yang belum mulai dibatalkan,
+        upload yang sedang jalan selesai di background lalu Session ditutup.
+        """
+        self.cancel()
+        self._executor.shutdown(wait=False, cancel_futures=True)
+        threading.Thread(target=self._close_when_idle, name="ei-upload-close", daemon=True).start()
+
+    def _close_when_idle(self):
+        self._executor.shutdown(wait=True)
+        self.session.close()
+
+    # --- Thread worker ---
+    def _run(self, csv_path: str, label: str) -> Tuple[bool, str]:
+        if self._cancel.is_set():
+            ok, msg = False, "Dibatalkan"
+        else:
+            self.file_started.emit(csv_path)
+            try:
+                ok, msg = self._upload(csv_path, label)
+            except Exception as e:
+                ok, msg = False, str(e)
+        self.file_finished.emit(csv_path, ok, msg)
+        self._mark_done(ok)
+        return ok, msg
+
+    def _mark_done(self, ok: bool):
+        with self._lock:
+            self._pending -= 1
+            if ok:
+                self._ok += 1
+            else:
+                self._failed += 1
+            done = self._pending == 0
+            counts = (self._ok, self._failed)
+            if done:
+                self._ok = self._failed = 0
+                self._cancel.clear()
+        if done:
+            self.all_finished.emit(*counts)
+
+    def _upload(self, csv_path: str, label: str) -> Tuple[bool, str]:
+        json_name = os.path.basename(csv_path).replace(".csv", ".json")
+        body, content_type = encode_multipart_formdata(
+            {'data': (json_name, FileHandler.edge_impulse_json_bytes(csv_path), 'application/json')}
+        )
+        headers = {
+            "x-api-key": self.api_key,
+            "x-disallow-duplicates": "1",
+            "Content-Type": content_type,
+        }
+        if label: headers["x-label"] = label
+
+        def report(sent, total):
+            self.file_progress.emit(csv_path, int(sent * 100 / total))
+
+        delay = self.backoff
+        for attempt in range(self.retries + 1):
+            try:
+                response = self.session.post(self.url, headers=headers, timeout=self.timeout,
+                                             data=_ProgressBody(body, report))
+                if response.status_code == 200:
+                    return True, f"Success: {response.text}"
+                msg = f"Failed ({response.status_code}): {response.text}"
+                if response.status_code not in RETRY_STATUS:
+                    return False, msg
+            except (requests.Timeout, requests.ConnectionError) as e:
+                msg = f"Connection Error: {str(e)}"
+
+            if attempt == self.retries or self._cancel.is_set():
+                break
+            # Backoff + jitter agar worker paralel tidak retry bersamaan
+            time.sleep(delay * (1 + random.random() * 0.25))
+            delay *= 2
+        return False, msg